@@ -1,47 +1,585 @@
-from flask import Flask, render_template, request, jsonify, send_file
+from flask import Blueprint, Flask, Request, Response, current_app, render_template, request, jsonify, send_file
+import hashlib
 import os
-from utils.llm_parser import MeetingParser
-from utils.word_generator import WordGenerator
+import re
+import json
+import queue
+import tempfile
+import time
+from urllib.parse import quote
+from werkzeug.exceptions import HTTPException
+from config import Config, DevelopmentConfig
+from utils.job_manager import JobManager, JobQueueFullError
+from utils.metrics import render_metrics
+from utils.upload_reader import UploadError, UploadTooLargeError, read_upload
+from utils.zip_stream import ZipStream
 import io
+import logging
+import threading
 
-app = Flask(__name__)
+# 日志级别：默认INFO，设为DEBUG时输出大模型的完整请求和响应
+logging.basicConfig(
+    level=os.environ.get('LOG_LEVEL', 'INFO').upper(),
+    format='%(asctime)s %(levelname)s %(name)s %(message)s'
+)
+logger = logging.getLogger(__name__)
 
+bp = Blueprint('meeting', __name__)
 
-@app.route('/')
+DOCX_MIMETYPE = 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+# 响应中标记文档为临时结果的头
+PROVISIONAL_HEADER = 'X-Meeting-Provisional'
+
+
+class UploadRequest(Request):
+    """上传的文件超过UPLOAD_SPOOL_BYTES后写入临时文件，不占用内存"""
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        return tempfile.SpooledTemporaryFile(max_size=current_app.config['UPLOAD_SPOOL_BYTES'], mode='rb+')
+
+
+def create_app(config=None):
+    """WSGI应用工厂，config为Config实例，未指定时按环境变量创建"""
+    app = Flask(__name__)
+    app.request_class = UploadRequest
+    app.config.from_object(config or Config())
+    app.extensions['meeting_jobs'] = JobManager(
+        max_workers=app.config['JOB_WORKERS'],
+        max_pending=app.config['JOB_MAX_PENDING'],
+        retention=app.config['JOB_RETENTION'],
+        max_retained=app.config['JOB_MAX_RETAINED'],
+        max_retained_bytes=app.config['JOB_MAX_RETAINED_BYTES']
+    )
+    app.register_blueprint(bp)
+
+    if app.config['WARMUP'] == 'sync':
+        warmup(app)
+    elif app.config['WARMUP'] == 'async':
+        threading.Thread(target=warmup, args=(app,), name='app-warmup', daemon=True).start()
+    return app
+
+
+def warmup(app):
+    """一次性预热：编译页面模板、加载docx模板骨架、建立花名册索引、调用Ollama加载模型，返回各步骤耗时（毫秒）
+
+    同步预热时在fork工作进程之前完成，工作进程共享已导入的模块和已构建的骨架。
+    """
+    timings = {}
+    start = time.perf_counter()
+    app.jinja_env.get_template('index.html')
+    timings['templates'] = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    from utils.docx_stream import StreamingDocxWriter
+    # 渲染一份空白会议记录：构建文档骨架并缓存docx中与内容无关的部分
+    StreamingDocxWriter().render({})
+    timings['docx'] = (time.perf_counter() - start) * 1000
+
+    if os.environ.get('ROSTER_PATH'):
+        from utils.roster import get_roster
+        # 花名册在fork之前建好索引，工作进程共享
+        start = time.perf_counter()
+        get_roster()
+        timings['roster'] = (time.perf_counter() - start) * 1000
+
+    if app.config['OLLAMA_WARMUP']:
+        from utils.llm_parser import MeetingParser
+        start = time.perf_counter()
+        MeetingParser().warmup()
+        timings['ollama'] = (time.perf_counter() - start) * 1000
+        if app.config['WARMUP'] == 'sync':
+            # 预热时打开的Ollama长连接和缓存数据库连接不能被fork出的多个工作进程共用，在fork之前关闭
+            reset_after_fork()
+
+    logger.info("预热完成: %s", ", ".join(f"{name}={ms:.0f}ms" for name, ms in timings.items()))
+    return timings
+
+
+def reset_after_fork():
+    """关闭并丢弃进程内共享的连接和缓存：Ollama客户端、解析结果缓存、文档缓存和会议归档
+
+    gunicorn在fork出工作进程后调用，各进程使用时按配置重新创建，不共用主进程中打开的连接。
+    花名册建好后只读、不持有文件或连接，保留主进程中建好的索引供各进程共享。
+    """
+    from utils.llm_cache import reset_response_cache
+    from utils.meeting_archive import reset_meeting_archive
+    from utils.ollama_client import reset_ollama_client
+    from utils.render_cache import reset_render_cache
+    reset_ollama_client()
+    reset_response_cache()
+    reset_render_cache()
+    reset_meeting_archive()
+
+
+def _jobs():
+    return current_app.extensions['meeting_jobs']
+
+
+def build_meeting_document(text_input, info=None):
+    """解析会议内容并渲染Word文档，返回文档字节
+
+    info不为None时记录本次解析是否退回了模拟数据、是否为超过截止时间（LLM_DEADLINE）的临时结果
+    """
+    # 解析和渲染模块依赖requests和python-docx，第一次用到（或预热）时才导入
+    from utils.llm_parser import MeetingParser
+
+    # 使用大模型解析会议内容
+    parser = MeetingParser()
+    record = parser.parse_record(text_input)
+    if info is not None:
+        info['used_fallback'] = parser.used_fallback
+        info['provisional'] = parser.provisional
+
+    # 生成Word文档
+    data = render_meeting_document(record)
+    archive_meeting_document(text_input, record, data, parser.used_fallback, parser.provisional)
+    return data
+
+
+def upgrade_meeting_document(text_input):
+    """临时结果的大模型解析已在后台完成时返回完整的文档，否则返回None"""
+    from utils.llm_parser import MeetingParser
+
+    record = MeetingParser().cached_record(text_input)
+    if record is None:
+        return None
+    data = render_meeting_document(record)
+    archive_meeting_document(text_input, record, data)
+    return data
+
+
+def archive_meeting_document(text_input, record, data, used_fallback=False, provisional=False):
+    """设置了ARCHIVE_PATH时保存到会议归档；归档失败只记录日志，不影响返回文档"""
+    import sqlite3
+    from utils.meeting_archive import get_meeting_archive
+
+    archive = get_meeting_archive()
+    if archive is None:
+        return
+    try:
+        archive.save(text_input, record, data, used_fallback, provisional)
+    except sqlite3.Error as e:
+        logger.warning("会议归档失败: %s", e)
+
+
+def render_meeting_document(meeting):
+    """渲染Word文档（MeetingRecord或会议信息字典），相同的会议信息直接返回缓存的字节"""
+    from utils.meeting_model import as_record
+    from utils.render_cache import get_render_cache, make_render_key
+    from utils.word_generator import TEMPLATE_VERSION, WordGenerator
+
+    record = as_record(meeting)
+    cache = get_render_cache()
+    key = make_render_key(record.to_dict(), TEMPLATE_VERSION)
+    data = cache.get(key)
+    if data is None:
+        data = WordGenerator().generate_document(record).getvalue()
+        cache.set(key, data)
+    return data
+
+
+def document_etag(text_input):
+    """/generate返回的ETag：由解析结果缓存键和版式版本号决定，不需要解析就能算出"""
+    from utils.llm_parser import MeetingParser
+    from utils.word_generator import TEMPLATE_VERSION
+
+    key = MeetingParser().result_key(text_input)
+    return hashlib.sha256(f"{key}\0{TEMPLATE_VERSION}".encode('utf-8')).hexdigest()[:32]
+
+
+def _document_disposition():
+    filename = quote('会议记录.docx')
+    return f"attachment; filename=meeting_minutes.docx; filename*=UTF-8''{filename}"
+
+
+def _get_text_input():
+    """从请求中读取会议内容：JSON的text字段，或multipart上传的.txt/.docx文件（file字段）"""
+    upload = request.files.get('file')
+    if upload is not None:
+        # 文件从请求体中分块读出，大文件已经写在临时文件里，读完立即关闭
+        with upload.stream:
+            return read_upload(upload.stream, upload.filename, current_app.config['UPLOAD_MAX_CHARS'],
+                               current_app.config['UPLOAD_MAX_XML_BYTES'])
+    payload = request.get_json(silent=True)
+    # 请求体不是对象或text不是字符串时按没有会议内容处理，由调用方返回400
+    if not isinstance(payload, dict) or not isinstance(payload.get('text'), str):
+        return ''
+    return payload['text']
+
+
+@bp.errorhandler(UploadError)
+def upload_error(e):
+    return jsonify({'error': str(e)}), 400
+
+
+@bp.errorhandler(UploadTooLargeError)
+def upload_too_large(e):
+    # 压缩的docx解压后可能远大于请求体
+    return jsonify({'error': str(e)}), 413
+
+
+@bp.app_errorhandler(413)
+def request_too_large(e):
+    limit = current_app.config['MAX_CONTENT_LENGTH']
+    return jsonify({'error': f'提交的内容超过{limit / 1048576:g}MB的上限'}), 413
+
+
+def _send_document(data, provisional=False):
+    response = send_file(
+        io.BytesIO(data),
+        as_attachment=True,
+        download_name='会议记录.docx',
+        mimetype=DOCX_MIMETYPE
+    )
+    if provisional:
+        # 大模型未在截止时间内完成，文档内容来自启发式提取，稍后重新下载可得到完整的文档
+        response.headers[PROVISIONAL_HEADER] = '1'
+    return response
+
+
+@bp.route('/')
 def index():
     return render_template('index.html')
 
 
-@app.route('/generate', methods=['POST'])
+@bp.route('/metrics')
+def metrics():
+    """Prometheus格式的各阶段耗时和退回模拟数据次数"""
+    return Response(render_metrics(), mimetype='text/plain; version=0.0.4')
+
+
+@bp.route('/generate', methods=['POST'])
 def generate_meeting_minutes():
+    """同步生成接口：提交任务后等待结果，保持与前端页面的兼容"""
     try:
-        text_input = request.json.get('text', '')
-
+        text_input = _get_text_input()
         if not text_input:
             return jsonify({'error': '请输入会议内容'}), 400
 
-        # 使用大模型解析会议内容
-        parser = MeetingParser()
-        meeting_data = parser.parse_meeting_text(text_input)
+        # 同一页面再次下载同样的内容时，浏览器带上次的ETag，不必重新解析和渲染
+        etag = document_etag(text_input)
+        if request.if_none_match.contains_weak(etag):
+            response = Response(status=304)
+            response.set_etag(etag, weak=True)
+            return response
 
-        # 生成Word文档
-        generator = WordGenerator()
-        doc_buffer = generator.generate_document(meeting_data)
+        jobs = _jobs()
+        info = {}
+        job = jobs.submit(build_meeting_document, text_input, info)
+        if not job.wait(current_app.config['JOB_SYNC_TIMEOUT']):
+            return jsonify({'error': '生成超时，请稍后通过任务接口查询', 'job_id': job.job_id}), 504
 
-        # 返回文件下载
-        doc_buffer.seek(0)
-        return send_file(
-            doc_buffer,
-            as_attachment=True,
-            download_name='会议记录.docx',
-            mimetype='application/vnd.openxmlformats-officedocument.wordprocessingml.document'
-        )
+        # 同步调用方已经拿到结果，不再保留
+        jobs.discard(job.job_id)
+        if job.status == 'failed':
+            return jsonify({'error': f'生成失败: {job.error}'}), 500
 
+        # 返回文件下载；退回模拟数据（包括临时结果）的文档下次应重新尝试大模型，不带ETag
+        response = _send_document(job.result, info.get('provisional', False))
+        if not info.get('used_fallback', True):
+            response.set_etag(etag, weak=True)
+        return response
+
+    except JobQueueFullError:
+        return jsonify({'error': '服务繁忙，请稍后再试'}), 503
+    except (UploadError, HTTPException):
+        # 上传文件无法读取或超过大小上限时由错误处理返回400/413
+        raise
     except Exception as e:
-        import traceback
-        traceback.print_exc()
+        logger.exception("生成失败")
         return jsonify({'error': f'生成失败: {str(e)}'}), 500
 
 
+@bp.route('/generate/stream', methods=['POST'])
+def generate_stream():
+    """流式生成接口：解析完成后边渲染边以分块响应输出文档，适合议题很多的长会议"""
+    text_input = _get_text_input()
+    if not text_input:
+        return jsonify({'error': '请输入会议内容'}), 400
+
+    from utils.docx_stream import StreamingDocxWriter
+    from utils.llm_parser import MeetingParser
+
+    parser = MeetingParser()
+    record = parser.parse_record(text_input)
+    headers = {'Content-Disposition': _document_disposition()}
+    if parser.provisional:
+        # 与/generate相同，临时文档带上标记，大模型完成后重新提交可得到完整的文档
+        headers[PROVISIONAL_HEADER] = '1'
+    return Response(
+        StreamingDocxWriter().iter_document(record),
+        mimetype=DOCX_MIMETYPE,
+        headers=headers
+    )
+
+
+def _render_preview(record):
+    """与Word文档相同版式的HTML预览"""
+    from utils.word_generator import iter_content_paragraphs
+
+    return render_template('preview.html', meeting=record, paragraphs=list(iter_content_paragraphs(record)))
+
+
+@bp.route('/parse', methods=['POST'])
+def parse_meeting():
+    """只解析不渲染：返回会议信息JSON，format=html时返回HTML预览"""
+    from utils.llm_parser import MeetingParser
+
+    text_input = _get_text_input()
+    if not text_input:
+        return jsonify({'error': '请输入会议内容'}), 400
+
+    parser = MeetingParser()
+    record = parser.parse_record(text_input)
+    if request.args.get('format') == 'html':
+        return _render_preview(record)
+    return jsonify({'meeting': record.to_dict(), 'used_fallback': parser.used_fallback,
+                    'provisional': parser.provisional})
+
+
+@bp.route('/render', methods=['POST'])
+def render_document():
+    """只渲染不解析：把会议信息JSON（/parse返回的meeting）渲染为docx，format=html时返回HTML预览"""
+    from utils.meeting_model import MeetingRecord
+    from utils.render_cache import make_render_key
+    from utils.word_generator import TEMPLATE_VERSION
+
+    payload = request.get_json(silent=True)
+    meeting_data = payload.get('meeting', payload) if isinstance(payload, dict) else payload
+    try:
+        record = MeetingRecord.from_dict(meeting_data, strict=True)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    if request.args.get('format') == 'html':
+        return _render_preview(record)
+
+    etag = make_render_key(record.to_dict(), TEMPLATE_VERSION)[:32]
+    if request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+    else:
+        response = _send_document(render_meeting_document(record))
+    response.set_etag(etag, weak=True)
+    return response
+
+
+@bp.route('/jobs', methods=['POST'])
+def submit_job():
+    """提交生成任务，立即返回任务ID"""
+    text_input = _get_text_input()
+    if not text_input:
+        return jsonify({'error': '请输入会议内容'}), 400
+
+    # 会议内容留在info中，临时结果下载时用来查找后台完成的解析
+    info = {'text': text_input}
+    try:
+        job = _jobs().submit(build_meeting_document, text_input, info)
+    except JobQueueFullError:
+        return jsonify({'error': '服务繁忙，请稍后再试'}), 503
+    job.info = info
+    return jsonify(job.to_dict()), 202
+
+
+@bp.route('/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """查询任务状态"""
+    job = _jobs().get(job_id)
+    if job is None:
+        return jsonify({'error': '任务不存在或已过期'}), 404
+    return jsonify(job.to_dict())
+
+
+@bp.route('/jobs/<job_id>/download', methods=['GET'])
+def download_job(job_id):
+    """下载已完成任务生成的文档"""
+    job = _jobs().get(job_id)
+    if job is None:
+        return jsonify({'error': '任务不存在或已过期'}), 404
+    if job.status == 'failed':
+        return jsonify({'error': f'生成失败: {job.error}'}), 500
+    if job.status != 'done':
+        return jsonify(job.to_dict()), 409
+    if job.info.get('provisional'):
+        # 大模型在截止时间之后完成了解析，换成完整的文档
+        data = upgrade_meeting_document(job.info['text'])
+        if data is not None:
+            job.result = data
+            job.info['provisional'] = False
+    return _send_document(job.result, job.info.get('provisional', False))
+
+
+def _archive():
+    from utils.meeting_archive import get_meeting_archive
+
+    return get_meeting_archive()
+
+
+@bp.route('/archive', methods=['GET'])
+def search_archive():
+    """检索归档的会议：q为空格分隔的查询词，按page/per_page分页，order为recent或relevance"""
+    archive = _archive()
+    if archive is None:
+        return jsonify({'error': '未启用会议归档'}), 404
+    order = request.args.get('order', 'recent')
+    if order not in ('recent', 'relevance'):
+        return jsonify({'error': 'order应为recent或relevance'}), 400
+    page = request.args.get('page', 1, type=int)
+    per_page = min(request.args.get('per_page', 20, type=int), 100)
+    return jsonify(archive.search(request.args.get('q', ''), page, per_page, order))
+
+
+@bp.route('/archive/<int:meeting_id>', methods=['GET'])
+def get_archived_meeting(meeting_id):
+    """查看归档的会议信息，加?transcript=1同时返回会议记录原文"""
+    archive = _archive()
+    if archive is None:
+        return jsonify({'error': '未启用会议归档'}), 404
+    data = archive.get(meeting_id, with_transcript=request.args.get('transcript') == '1')
+    if data is None:
+        return jsonify({'error': '会议不存在'}), 404
+    return jsonify(data)
+
+
+@bp.route('/archive/<int:meeting_id>/download', methods=['GET'])
+def download_archived_meeting(meeting_id):
+    """下载归档的docx"""
+    archive = _archive()
+    if archive is None:
+        return jsonify({'error': '未启用会议归档'}), 404
+    data = archive.get_document(meeting_id)
+    if data is None:
+        return jsonify({'error': '会议不存在'}), 404
+    return _send_document(data)
+
+
+def _batch_entry_name(index, name):
+    """生成ZIP条目文件名，去掉文件名中不允许的字符"""
+    name = re.sub(r'[\\/:*?"<>|\s]+', '_', str(name or '会议记录')).strip('_') or '会议记录'
+    return f'{index:03d}_{name}.docx'
+
+
+def _iter_batch_zip(items, concurrency, jobs, busy_timeout):
+    """按完成顺序逐条生成文档并写入ZIP流，最后附上manifest.json
+
+    每条通过任务池生成，与其他请求共用JOB_WORKERS个工作线程，本批同时最多concurrency条在途。
+    任务池排队已满时先等本批在途的条目完成再提交；本批没有在途的条目时最多等待busy_timeout秒，
+    仍然无法提交的条目记为失败。
+    """
+    stream = ZipStream()
+    manifest = [None] * len(items)
+    pending = iter(enumerate(items, 1))
+    finished = queue.Queue()
+    submitted = {}
+    held = None
+    blocked_since = None
+
+    def next_item():
+        for index, item in pending:
+            text = item.get('text', '') if isinstance(item, dict) else item
+            name = item.get('name') if isinstance(item, dict) else None
+            entry = {'index': index, 'name': name or f'会议记录{index}'}
+            if not isinstance(text, str) or not text.strip():
+                manifest[index - 1] = dict(entry, status='failed', error='请输入会议内容')
+                continue
+            return entry, text
+        return None
+
+    def make_task(entry, text):
+        def task():
+            try:
+                return build_meeting_document(text, entry['info'])
+            finally:
+                finished.put(entry)
+        return task
+
+    try:
+        while True:
+            # 同一时间只保留concurrency条在途，避免已完成的文档在内存中堆积
+            while len(submitted) < concurrency:
+                item, held = held or next_item(), None
+                if item is None:
+                    break
+                entry, text = item
+                entry['info'] = {}
+                try:
+                    job = jobs.submit(make_task(entry, text))
+                except JobQueueFullError:
+                    if submitted:
+                        held = item
+                        break
+                    blocked_since = blocked_since or time.monotonic()
+                    if time.monotonic() - blocked_since >= busy_timeout:
+                        manifest[entry['index'] - 1] = dict(entry, status='failed', error='服务繁忙，请稍后再试')
+                        blocked_since = None
+                    else:
+                        held = item
+                        time.sleep(0.1)
+                    continue
+                blocked_since = None
+                submitted[job.job_id] = job
+                entry['job'] = job
+            if not submitted:
+                break
+
+            entry = finished.get()
+            job = entry.pop('job')
+            info = entry.pop('info')
+            job.wait()
+            submitted.pop(job.job_id)
+            jobs.discard(job.job_id)
+            if job.status == 'done':
+                filename = _batch_entry_name(entry['index'], entry['name'])
+                yield stream.add(filename, job.result)
+                # provisional为真时文档来自启发式提取，大模型完成后重新提交该条可得到完整的文档
+                manifest[entry['index'] - 1] = dict(entry, status='ok', file=filename,
+                                                    provisional=bool(info.get('provisional')))
+            else:
+                manifest[entry['index'] - 1] = dict(entry, status='failed', error=job.error)
+    finally:
+        # 客户端中途断开时丢弃还在进行的条目，结果不再保留
+        for job_id in submitted:
+            jobs.discard(job_id)
+
+    manifest_bytes = json.dumps({'items': manifest}, ensure_ascii=False, indent=2).encode('utf-8')
+    yield stream.add('manifest.json', manifest_bytes)
+    yield stream.close()
+
+
+@bp.route('/generate/batch', methods=['POST'])
+def generate_batch():
+    """批量生成：提交多份会议内容，以流式ZIP返回所有会议记录"""
+    payload = request.get_json(silent=True) or {}
+    items = payload.get('items')
+    if not isinstance(items, list) or not items:
+        return jsonify({'error': '请提交会议内容列表'}), 400
+    max_items = current_app.config['BATCH_MAX_ITEMS']
+    if len(items) > max_items:
+        return jsonify({'error': f'单批最多{max_items}份会议内容'}), 400
+
+    filename = quote('会议记录.zip')
+    return Response(
+        # 生成器在请求上下文之外执行，配置在这里先取出
+        _iter_batch_zip(items, current_app.config['BATCH_CONCURRENCY'], _jobs(),
+                        current_app.config['JOB_SYNC_TIMEOUT']),
+        mimetype='application/zip',
+        headers={'Content-Disposition': f"attachment; filename=meeting_minutes.zip; filename*=UTF-8''{filename}"}
+    )
+
+
+_app = None
+_app_lock = threading.Lock()
+
+
+def __getattr__(name):
+    """兼容`from app import app`：首次访问时按环境变量创建应用，只导入工厂时不会创建"""
+    global _app
+    if name != 'app':
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    if _app is None:
+        with _app_lock:
+            if _app is None:
+                _app = create_app()
+    return _app
+
+
 if __name__ == '__main__':
-    app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
+    create_app(DevelopmentConfig()).run(host='0.0.0.0', port=5000)
@@ -0,0 +1,90 @@
+"""
+会议归档基准测试：N份会议归档后检索、查看和下载的耗时
+
+- 写入：逐条save（每条一个事务，与生成接口一样），docx用固定大小的字节代替
+- 检索：FTS5按归档时间倒序取一页、按相关度取一页，对比对原文LIKE '%词%'的全表扫描
+- 查看/下载：按ID读取会议信息和docx
+
+用法（在ZNHY_developer目录下运行）：
+    python -m benchmarks.bench_archive --meetings 20000 100000 --path /tmp/archive_bench.db
+"""
+
+import argparse
+import os
+import statistics
+import time
+
+from benchmarks.transcripts import make_meeting, make_transcript
+from utils.meeting_archive import MeetingArchive
+from utils.meeting_model import MeetingRecord
+
+QUERIES = ["张伟", "张", "预算", "推广 张伟", "会议室12", "供应链优化"]
+
+
+def timed(fn, repeat):
+    fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def fill(archive, start, stop, docx_size):
+    docx = b"x" * docx_size
+    for seed in range(start, stop):
+        archive.save(make_transcript(seed), MeetingRecord.from_dict(make_meeting(seed)), docx)
+
+
+def like_scan(archive, query):
+    """没有全文索引时的做法：对原文逐条LIKE匹配"""
+    terms = query.split()
+    where = " AND ".join("transcript LIKE ?" for _ in terms)
+    return archive._db.execute(
+        f"SELECT id FROM meetings WHERE {where} ORDER BY id DESC LIMIT 20", [f"%{term}%" for term in terms]
+    ).fetchall()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="会议归档基准测试")
+    parser.add_argument("--meetings", type=int, nargs="+", default=[20000], help="归档的会议份数（递增）")
+    parser.add_argument("--path", default="archive_bench.db", help="基准测试使用的数据库文件，结束后删除")
+    parser.add_argument("--docx-size", type=int, default=20000, help="每份docx的字节数")
+    parser.add_argument("--repeat", type=int, default=20, help="每项测量次数")
+    args = parser.parse_args()
+
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(args.path + suffix):
+            os.remove(args.path + suffix)
+    archive = MeetingArchive(args.path)
+    count = 0
+    try:
+        for target in sorted(args.meetings):
+            start = time.perf_counter()
+            fill(archive, count, target, args.docx_size)
+            elapsed = time.perf_counter() - start
+            print(f"\n{target}份会议（写入{target - count}份 {elapsed:.1f}s，{(target - count) / elapsed:.0f}份/秒，"
+                  f"文件{os.path.getsize(args.path) / 1048576:.0f}MB）")
+            count = target
+
+            print(f"  {'查询':<10} {'命中':>6} {'按时间(ms)':>10} {'按相关度(ms)':>12} {'LIKE扫描(ms)':>12}")
+            for query in QUERIES:
+                total = archive.search(query)["total"]
+                recent = timed(lambda: archive.search(query, page=3), args.repeat)
+                relevance = timed(lambda: archive.search(query, page=3, order="relevance"), max(3, args.repeat // 4))
+                scan = timed(lambda: like_scan(archive, query), max(3, args.repeat // 4))
+                print(f"  {query:<10} {total:>6} {recent:10.2f} {relevance:12.2f} {scan:12.2f}")
+
+            meeting_id = count // 2
+            print(f"  查看 {timed(lambda: archive.get(meeting_id), args.repeat * 5):.3f}ms  "
+                  f"下载 {timed(lambda: archive.get_document(meeting_id), args.repeat * 5):.3f}ms")
+    finally:
+        archive.close()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(args.path + suffix):
+                os.remove(args.path + suffix)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+长会议记录分片解析基准测试：整体一次调用对比分片并发调用
+
+桩服务的延迟随提示词长度线性增长，近似小模型处理长输入的耗时。
+
+用法（在ZNHY_developer目录下运行）：
+    python -m benchmarks.bench_chunked_parse --chunk-chars 1500
+"""
+
+import argparse
+import time
+
+from benchmarks.stub_ollama import StubOllamaServer
+from benchmarks.transcripts import make_transcript
+from utils.llm_cache import LLMResponseCache
+from utils.llm_parser import MeetingParser
+from utils.ollama_client import OllamaClient
+
+
+def timed_parse(url, text, chunk_chars):
+    parser = MeetingParser(client=OllamaClient(), cache=LLMResponseCache(max_entries=0), chunk_chars=chunk_chars)
+    parser.ollama_url = url
+    start = time.perf_counter()
+    result = parser.parse_meeting_text(text)
+    return (time.perf_counter() - start) * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="分片解析基准测试")
+    parser.add_argument("--chunk-chars", type=int, default=1500, help="分片长度（字）")
+    parser.add_argument("--latency-per-kchar", type=float, default=200, help="桩服务每1000字提示词的延迟（毫秒）")
+    args = parser.parse_args()
+
+    with StubOllamaServer(templated=True, latency="fixed:50", latency_per_kchar=args.latency_per_kchar) as server:
+        print(f"{'发言条数':>8} {'字数':>8} {'片段数':>6} {'整体(ms)':>10} {'分片(ms)':>10} {'加速比':>8}")
+        for remarks in (20, 100, 400, 1600):
+            text = make_transcript(0, 8, 5, remarks)
+            before = server.request_count
+            single, _ = timed_parse(server.url, text, 0)
+            chunked, result = timed_parse(server.url, text, args.chunk_chars)
+            chunks = server.request_count - before - 1
+            print(f"{remarks:>8} {len(text):>8} {chunks:>6} {single:10.0f} {chunked:10.0f} {single / chunked:7.1f}x")
+    print("注：分片并发数由LLM_CHUNK_CONCURRENCY控制（默认4），片段数超过并发数时按批次执行")
+
+
+if __name__ == "__main__":
+    main()
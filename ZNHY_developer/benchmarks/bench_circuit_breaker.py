@@ -0,0 +1,78 @@
+"""
+断路器基准测试：Ollama过载（请求挂起直到超时）期间，有无断路器时每个请求的耗时
+
+依次模拟：正常 -> 故障 -> 恢复，报告各阶段的请求延迟，以及恢复后断路器重新关闭所需的时间。
+
+用法（在ZNHY_developer目录下运行）：
+    python -m benchmarks.bench_circuit_breaker --read-timeout 2 --requests 20
+"""
+
+import argparse
+import logging
+import time
+
+from benchmarks.bench_ollama_client import percentile
+from benchmarks.stub_ollama import StubOllamaServer
+from benchmarks.transcripts import make_transcript
+from utils.circuit_breaker import CircuitBreaker
+from utils.llm_cache import LLMResponseCache
+from utils.llm_parser import MeetingParser
+from utils.ollama_client import OllamaClient
+
+
+def run_phase(parser, count, offset, interval):
+    """每隔interval秒解析一份不同的会议记录，共count份，返回(每次耗时毫秒列表, 退回模拟数据的次数, 第一次大模型成功距开始的秒数)"""
+    samples = []
+    fallbacks = 0
+    first_success = None
+    phase_start = time.perf_counter()
+    for i in range(count):
+        start = time.perf_counter()
+        parser.parse_meeting_text(make_transcript(offset + i, 4, 2, 10))
+        samples.append((time.perf_counter() - start) * 1000)
+        time.sleep(interval)
+        fallbacks += parser.used_fallback
+        if not parser.used_fallback and first_success is None:
+            first_success = time.perf_counter() - phase_start
+    return samples, fallbacks, first_success
+
+
+def run_scenario(label, threshold, args):
+    with StubOllamaServer(templated=True, latency="fixed:20") as server:
+        client = OllamaClient(read_timeout=args.read_timeout)
+        version_url = server.url.replace("/api/generate", "/api/version")
+        breaker = CircuitBreaker(failure_threshold=threshold, probe_interval=args.probe_interval,
+                                 probe=lambda: client.get(version_url).ok)
+        parser = MeetingParser(client=client, cache=LLMResponseCache(max_entries=0), breaker=breaker)
+        parser.ollama_url = server.url
+
+        print(f"\n[{label}]")
+        print(f"{'阶段':<6} {'请求数':>6} {'退回':>6} {'p50(ms)':>10} {'max(ms)':>10} {'请求耗时合计(s)':>12}")
+        offset = 0
+        for phase, outage in (("正常", None), ("故障", "hang"), ("恢复", None)):
+            server.set_outage(outage)
+            samples, fallbacks, first_success = run_phase(parser, args.requests, offset, args.interval)
+            offset += args.requests
+            print(f"{phase:<6} {len(samples):>6} {fallbacks:>6} {percentile(samples, 50):10.1f} "
+                  f"{max(samples):10.1f} {sum(samples) / 1000:12.2f}")
+        if first_success is not None:
+            print(f"恢复后{first_success:.2f}s重新使用大模型，断路器状态: {breaker.state}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="断路器基准测试")
+    parser.add_argument("--requests", type=int, default=40, help="每个阶段的请求数")
+    parser.add_argument("--interval", type=float, default=0.05, help="相邻请求的间隔（秒）")
+    parser.add_argument("--read-timeout", type=float, default=2.0, help="Ollama读取超时（秒），生产默认30")
+    parser.add_argument("--threshold", type=int, default=3, help="断路器打开前允许的连续失败次数")
+    parser.add_argument("--probe-interval", type=float, default=0.5, help="断路器打开后探测后端的间隔（秒）")
+    args = parser.parse_args()
+
+    # 故障期间每个请求都会输出警告，压测时只看汇总结果
+    logging.getLogger("utils").setLevel(logging.ERROR)
+    run_scenario("无断路器", 0, args)
+    run_scenario(f"断路器 threshold={args.threshold}", args.threshold, args)
+
+
+if __name__ == "__main__":
+    main()
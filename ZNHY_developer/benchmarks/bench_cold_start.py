@@ -0,0 +1,160 @@
+"""
+冷启动基准测试：导入耗时、首个请求延迟和预fork工作进程的内存占用
+
+每项测量都在新的Python进程中进行：
+- 导入：延迟导入的app与修改前一次性导入解析、渲染模块的耗时和RSS
+- 首个请求：不预热与同步预热时，启动耗时和第一个/generate的延迟（桩服务模拟模型加载时间）
+- 工作进程内存：模拟gunicorn预fork，比较preload（主进程预热后fork）与各工作进程自行加载时每个进程的RSS和PSS
+
+用法（在ZNHY_developer目录下运行，工作进程内存一项只支持Linux）：
+    python -m benchmarks.bench_cold_start --workers 4
+"""
+
+import argparse
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+
+from benchmarks.stub_ollama import StubOllamaServer
+
+SAMPLE_TEXT = "会议主题：周会\n主持人：张三\n参会人员：李四、王五\n议题：项目进度"
+
+
+def memory_kb(pid="self"):
+    """进程的(RSS, PSS)，单位KB；PSS把共享页按共享进程数分摊，不支持时为None"""
+    rss = pss = None
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                rss = int(line.split()[1])
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                if line.startswith("Pss:"):
+                    pss = int(line.split()[1])
+    except OSError:
+        pass
+    return rss, pss
+
+
+def probe_import(mode):
+    start = time.perf_counter()
+    import app  # noqa: F401
+    if mode == "eager":
+        # 修改前app.py在模块加载时就导入这些模块
+        import utils.docx_stream  # noqa: F401
+        import utils.llm_parser  # noqa: F401
+        import utils.word_generator  # noqa: F401
+    return {"import_ms": (time.perf_counter() - start) * 1000, "rss_kb": memory_kb()[0]}
+
+
+def probe_first_request(warmup):
+    from app import create_app
+    from config import Config
+
+    start = time.perf_counter()
+    app = create_app(Config(WARMUP=warmup))
+    startup_ms = (time.perf_counter() - start) * 1000
+    client = app.test_client()
+    start = time.perf_counter()
+    response = client.post("/generate", json={"text": SAMPLE_TEXT})
+    assert response.status_code == 200, response.status_code
+    return {"startup_ms": startup_ms, "first_request_ms": (time.perf_counter() - start) * 1000}
+
+
+def probe_prefork(preload, workers):
+    """按gunicorn的方式fork工作进程，每个进程处理一个请求后报告内存"""
+    from app import create_app
+    from config import Config
+
+    config = Config(WARMUP="sync", OLLAMA_WARMUP=False)
+    app = create_app(config) if preload else None
+    read_fd, write_fd = os.pipe()
+    pids = []
+    for _ in range(workers):
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            worker_app = app or create_app(config)
+            response = worker_app.test_client().post("/generate", json={"text": SAMPLE_TEXT})
+            os.write(write_fd, b"1" if response.status_code == 200 else b"0")
+            # 等待主进程统计完内存后结束
+            signal.pause()
+            os._exit(0)
+        pids.append(pid)
+    os.close(write_fd)
+    statuses = b""
+    while len(statuses) < workers:
+        statuses += os.read(read_fd, workers)
+    memory = [memory_kb(pid) for pid in pids]
+    for pid in pids:
+        os.kill(pid, signal.SIGTERM)
+        os.waitpid(pid, 0)
+    return {"ok": statuses.count(b"1"), "rss_kb": [m[0] for m in memory], "pss_kb": [m[1] for m in memory]}
+
+
+def run_probe(args, env=None):
+    """在新进程中运行一项测量，返回其输出的JSON"""
+    command = [sys.executable, "-m", "benchmarks.bench_cold_start"] + args
+    output = subprocess.run(command, check=True, capture_output=True, text=True,
+                            env=dict(os.environ, **(env or {}))).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="冷启动基准测试")
+    parser.add_argument("--workers", type=int, default=4, help="模拟的工作进程数")
+    parser.add_argument("--load-ms", type=float, default=1500, help="桩服务模拟的模型加载时间（毫秒）")
+    parser.add_argument("--repeat", type=int, default=5, help="导入耗时的测量次数")
+    parser.add_argument("--probe", help=argparse.SUPPRESS)
+    parser.add_argument("--arg", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.probe == "import":
+        print(json.dumps(probe_import(args.arg)))
+        return 0
+    if args.probe == "first_request":
+        print(json.dumps(probe_first_request(args.arg)))
+        return 0
+    if args.probe == "prefork":
+        print(json.dumps(probe_prefork(args.arg == "preload", args.workers)))
+        return 0
+
+    # 子进程不需要后台预热Ollama
+    quiet = {"OLLAMA_WARMUP": "0", "APP_WARMUP": "off", "LOG_LEVEL": "WARNING"}
+    print(f"{'导入方式':<10} {'import(ms)':>12} {'RSS(MB)':>10}")
+    for mode in ("eager", "lazy"):
+        samples = [run_probe(["--probe", "import", "--arg", mode], quiet) for _ in range(args.repeat)]
+        import_ms = sorted(sample["import_ms"] for sample in samples)[len(samples) // 2]
+        print(f"{mode:<10} {import_ms:12.1f} {samples[0]['rss_kb'] / 1024:10.1f}")
+
+    print(f"\n{'预热':<10} {'启动(ms)':>10} {'首个请求(ms)':>14} {'合计(ms)':>10}")
+    for warmup in ("off", "sync"):
+        # 每次使用新的桩服务，模型都从未加载状态开始
+        with StubOllamaServer(templated=True, load_ms=args.load_ms) as server:
+            result = run_probe(["--probe", "first_request", "--arg", warmup],
+                               dict(quiet, OLLAMA_WARMUP="1", OLLAMA_URL=server.url))
+        print(f"{warmup:<10} {result['startup_ms']:10.1f} {result['first_request_ms']:14.1f} "
+              f"{result['startup_ms'] + result['first_request_ms']:10.1f}")
+
+    if not os.path.exists("/proc/self/status"):
+        print("\n工作进程内存一项只支持Linux")
+        return 0
+    print(f"\n{'工作进程':<12} {'进程数':>6} {'RSS均值(MB)':>12} {'PSS均值(MB)':>12} {'PSS合计(MB)':>12}")
+    with StubOllamaServer(templated=True) as server:
+        for mode in ("no-preload", "preload"):
+            result = run_probe(["--probe", "prefork", "--arg", mode, "--workers", str(args.workers)],
+                               dict(quiet, OLLAMA_URL=server.url))
+            rss = sum(result["rss_kb"]) / len(result["rss_kb"]) / 1024
+            pss = [value for value in result["pss_kb"] if value is not None]
+            pss_text = (f"{sum(pss) / len(pss) / 1024:12.1f} {sum(pss) / 1024:12.1f}" if pss
+                        else f"{'-':>12} {'-':>12}")
+            print(f"{mode:<12} {result['ok']:>6} {rss:12.1f} {pss_text}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
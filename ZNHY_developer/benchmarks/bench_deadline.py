@@ -0,0 +1,76 @@
+"""
+截止时间解析的基准测试：大模型延迟有长尾时，设置LLM_DEADLINE前后的请求耗时分布
+
+桩服务按给定分布产生延迟，每个请求解析不同的会议记录（不命中缓存），
+统计p50/p99/最大耗时和返回临时结果的比例；最后等待后台解析完成，
+确认超时请求的大模型结果都已写入缓存，再次获取可以得到完整结果。
+
+用法（在ZNHY_developer目录下运行）：
+    python -m benchmarks.bench_deadline --requests 60 --deadline 0 1.0 --latency lognormal:600,0.8
+"""
+
+import argparse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.bench_ollama_client import percentile
+from benchmarks.stub_ollama import StubOllamaServer
+from benchmarks.transcripts import make_transcript
+from utils.llm_cache import LLMResponseCache
+from utils.llm_parser import MeetingParser
+from utils.ollama_client import OllamaClient
+
+
+def run(url, client, cache, texts, deadline, concurrency):
+    """并发解析texts，返回(每个请求的耗时毫秒, 临时结果的会议内容)"""
+    latencies = []
+    provisional = []
+    lock = threading.Lock()
+
+    def parse(text):
+        parser = MeetingParser(client=client, cache=cache, single_flight=None)
+        parser.ollama_url = url
+        start = time.perf_counter()
+        parser.parse_record(text, deadline=deadline)
+        elapsed = (time.perf_counter() - start) * 1000
+        with lock:
+            latencies.append(elapsed)
+            if parser.provisional:
+                provisional.append(text)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(parse, texts))
+    return latencies, provisional
+
+
+def main():
+    parser = argparse.ArgumentParser(description="截止时间解析的基准测试")
+    parser.add_argument("--requests", type=int, default=60, help="每种设置的请求数")
+    parser.add_argument("--concurrency", type=int, default=4, help="同时进行的请求数")
+    parser.add_argument("--deadline", type=float, nargs="+", default=[0, 1.0], help="截止时间（秒），0表示一直等待")
+    parser.add_argument("--latency", default="lognormal:600,0.8", help="桩服务的延迟分布")
+    args = parser.parse_args()
+
+    print(f"{'截止时间':<8} {'请求数':>6} {'p50(ms)':>10} {'p99(ms)':>10} {'max(ms)':>10} {'临时结果':>8} {'后台补全':>8}")
+    for deadline in args.deadline:
+        with StubOllamaServer(templated=True, latency=args.latency, seed=0) as server:
+            client = OllamaClient()
+            cache = LLMResponseCache()
+            # 每种设置使用新的缓存和相同的延迟序列
+            texts = [make_transcript(i) for i in range(args.requests)]
+            latencies, provisional = run(server.url, client, cache, texts, deadline, args.concurrency)
+
+            # 等待后台解析完成，统计超时请求中已经可以取到完整结果的数量
+            checker = MeetingParser(client=client, cache=cache)
+            end = time.monotonic() + 30
+            while time.monotonic() < end and any(checker.cached_record(text) is None for text in provisional):
+                time.sleep(0.05)
+            upgraded = sum(checker.cached_record(text) is not None for text in provisional)
+            label = f"{deadline:g}s" if deadline else "不限"
+            print(f"{label:<8} {len(latencies):>6} {percentile(latencies, 50):10.0f} {percentile(latencies, 99):10.0f} "
+                  f"{max(latencies):10.0f} {len(provisional):>8} {upgraded:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+流式文档写入基准测试：议题数量很多时对比WordGenerator
+
+用法（在ZNHY_developer目录下运行）：
+    python -m benchmarks.bench_docx_stream
+"""
+
+import argparse
+import time
+import tracemalloc
+
+from utils.docx_stream import StreamingDocxWriter
+from utils.word_generator import WordGenerator
+
+
+def make_meeting(topic_count):
+    """构造一个有topic_count个议题的全天会议"""
+    return {
+        "meeting_topic": "年度规划研讨会",
+        "host": "张三",
+        "participants": ["张三", "李四", "王五"],
+        "meeting_duration": "全天",
+        "topics": [{
+            "title": f"第{i}项：部门年度目标与预算复盘",
+            "leader": "李四",
+            "preparation": "准备上一季度的执行数据和下一季度的预算草案"
+        } for i in range(1, topic_count + 1)],
+        "pre_meeting_preparations": "提前阅读会议材料"
+    }
+
+
+def render_word_generator(meeting_data):
+    return len(WordGenerator().generate_document(meeting_data).getvalue())
+
+
+def render_stream(meeting_data):
+    # 逐块消费，模拟分块响应，不在内存中拼接整个文件
+    return sum(len(chunk) for chunk in StreamingDocxWriter().iter_document(meeting_data))
+
+
+def measure(fn, meeting_data):
+    """返回(耗时毫秒, Python对象分配峰值KB, 输出字节数)"""
+    start = time.perf_counter()
+    size = fn(meeting_data)
+    elapsed = (time.perf_counter() - start) * 1000
+
+    tracemalloc.start()
+    fn(meeting_data)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1024, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description="流式文档写入基准测试")
+    parser.add_argument("--topics", type=int, nargs="+", default=[10, 100, 1000, 5000], help="议题数量")
+    args = parser.parse_args()
+
+    # 预先构建骨架，不计入单次渲染
+    render_stream(make_meeting(1))
+
+    print(f"{'议题数':>6} {'方式':<14} {'耗时(ms)':>10} {'分配峰值(KB)':>14} {'文件大小(KB)':>14}")
+    for count in args.topics:
+        meeting_data = make_meeting(count)
+        for name, fn in (("WordGenerator", render_word_generator), ("流式写入", render_stream)):
+            elapsed, peak, size = measure(fn, meeting_data)
+            print(f"{count:>6} {name:<14} {elapsed:10.1f} {peak:14.0f} {size / 1024:14.0f}")
+    print("注：tracemalloc只统计Python分配，python-docx对象树背后lxml节点占用的内存未计入")
+
+
+if __name__ == "__main__":
+    main()
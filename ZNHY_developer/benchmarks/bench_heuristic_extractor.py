@@ -0,0 +1,213 @@
+"""
+启发式提取基准测试：预编译的新实现对比原MeetingParser._get_mock_data
+
+用法（在ZNHY_developer目录下运行）：
+    python -m benchmarks.bench_heuristic_extractor
+"""
+
+import argparse
+import re
+import time
+from typing import Any, Dict
+
+from utils.heuristic_extractor import extract_meeting_fields
+
+SAMPLE = """会议主题：下季度产品推广方案
+会议时间：2023年10月15日 14:00-16:00
+会议地点：公司三楼大会议室
+主持人：张三
+参会人员：李四、王五、赵六
+会议时长：约2小时
+
+会议议程：
+1. 讨论线上广告投放预算分配
+2. 讨论新版APP研发进度
+3. 讨论下月底团建活动安排
+"""
+
+FILLER = "李四汇报了本周的研发进展，王五补充了测试情况，赵六提出需要协调更多资源。\n"
+# 频繁出现"讨论""会议""时间"等关键字的口语化内容
+DENSE_FILLER = "我们讨论了会议的时间和地点以及相关事项，大家觉得这次会议很重要。\n"
+
+
+def legacy_get_mock_data(text: str) -> Dict[str, Any]:
+    """旧实现：逐条正则搜索（原MeetingParser._get_mock_data）"""
+    # 根据输入文本生成个性化的模拟数据
+
+    # 从输入文本中提取可能的会议主题
+    theme_match = re.search(r'主题[:：]?\s*([^\n]+)', text) or re.search(r'会议[:：]?\s*([^\n]+)', text)
+    meeting_theme = theme_match.group(1).strip() if theme_match else "会议讨论"
+
+    # 从输入文本中提取可能的时间
+    time_match = re.search(r'时间[:：]?\s*([^\n]+)', text) or re.search(r'(\d{4}-\d{2}-\d{2}.*?)|(\d{1,2}月\d{1,2}日.*?)|(下[周月]\w+.*?)', text)
+    if time_match:
+        # 如果有捕获组内容（比如"时间：今天下午3点"中的"今天下午3点"）
+        if time_match.group(1):
+            meeting_time = time_match.group(1).strip()
+        elif time_match.group(2):
+            meeting_time = time_match.group(2).strip()
+        elif time_match.group(3):
+            meeting_time = time_match.group(3).strip()
+        else:
+            # 否则直接使用匹配的整个内容
+            meeting_time = time_match.group(0).strip()
+    else:
+        meeting_time = "待定"
+
+    # 从输入文本中提取可能的地点
+    location_match = re.search(r'地点[:：]?\s*([^\n]+)', text) or re.search(r'(会议室\d+|办公室|线上会议)', text)
+    if location_match:
+        # 如果有捕获组内容（比如"地点：会议室A"中的"会议室A"）
+        if location_match.group(1):
+            meeting_location = location_match.group(1).strip()
+        else:
+            # 否则直接使用匹配的整个内容
+            meeting_location = location_match.group(0).strip()
+    else:
+        meeting_location = "公司会议室"
+
+    # 从输入文本中提取可能的参会人员
+    participants_match = re.search(r'参会人员[:：]?\s*([^\n]+)', text)
+    participants = []
+    if participants_match:
+        participants_str = participants_match.group(1).strip()
+        # 移除前缀常见词如"包括"、"有"、"为"、"以及"
+        participants_str = re.sub(r'^(包括|有|为|以及)\s*', '', participants_str)
+        # 支持顿号、逗号、中文逗号、"和"、"以及"分隔，并且去掉可能的空格
+        participants_str = participants_str.replace('，', '、').replace(',', '、').replace('和', '、').replace('以及', '、')
+        participants = [p.strip() for p in participants_str.split('、') if p.strip()]
+
+    # 如果没有提取到参会人员，尝试匹配所有可能的人名
+    if not participants:
+        # 改进的人名匹配正则表达式，支持更多分隔符
+        name_pattern = r'[\u4e00-\u9fa5]{2,4}(?:[、,，和以及][\u4e00-\u9fa5]{2,4})*'
+        name_matches = re.findall(name_pattern, text)
+        if name_matches:
+            # 合并所有匹配到的人名并处理多种分隔符
+            all_names = []
+            for match in name_matches:
+                # 处理多种分隔符
+                separated_names = re.split(r'[、,，和以及]', match)
+                all_names.extend([p.strip() for p in separated_names if p.strip()])
+            # 去重（保持出现顺序，与heuristic_extractor一致）
+            participants = list(dict.fromkeys(all_names))
+
+    # 如果还是没有提取到，使用默认值
+    if not participants:
+        participants = ["参会人员1", "参会人员2"]
+
+    # 从输入文本中提取可能的议程
+    agenda_items = []
+    agenda_matches = re.findall(r'议[题程][:：]?\s*([^\n]+)', text)
+    if agenda_matches:
+        for topic in agenda_matches:
+            agenda_items.append({
+                "topic": topic.strip(),
+                "responsible_person": participants[0] if participants else "负责人",
+                "preparation": "准备相关资料",
+                "notes": ""
+            })
+
+    # 如果没有提取到议程，使用默认值
+    if not agenda_items:
+        agenda_match = re.search(r'(讨论|议题|事项)[:：]?\s*([^\n]+)', text)
+        agenda_topic = agenda_match.group(0).strip() if agenda_match else "会议议程"
+        agenda_items.append({
+            "topic": agenda_topic,
+            "responsible_person": participants[0] if participants else "负责人",
+            "preparation": "准备相关资料",
+            "notes": ""
+        })
+
+    # 提取会议内容
+    content_pattern = r'会议内容[:：]?\s*([\s\S]*)'
+    content_match = re.search(content_pattern, text)
+    if content_match:
+        meeting_content = content_match.group(1).strip()
+    else:
+        # 如果没有明确的内容部分，使用整个文本
+        meeting_content = text.strip()
+
+    # 将 agenda_items 转换为符合模板要求的 topics 格式
+    topics = []
+    for item in agenda_items:
+        topic_dict = {
+            "title": item["topic"],
+            "leader": item["responsible_person"],
+            "preparation": item["preparation"]
+        }
+        topics.append(topic_dict)
+
+    # 尝试提取会前准备事项
+    pre_meeting_preparations = ""
+    pre_match = re.search(r'会前准备事项[:：]?\s*([^\n]+)', text)
+    if pre_match:
+        pre_meeting_preparations = pre_match.group(1).strip()
+    elif "提前准备" in text:
+        pre_meeting_preparations = "提前准备相关资料"
+
+    # 计算会议时长
+    duration = "约1小时"
+    duration_match = re.search(r'时长[:：]?\s*([^\n]+)', text) or re.search(r'约(\d+小时)', text)
+    if duration_match:
+        duration = duration_match.group(1).strip() if duration_match.group(1) else duration_match.group(0).strip()
+
+    mock_data = {
+        "meeting_topic": meeting_theme,
+        "meeting_time": meeting_time,
+        "meeting_location": meeting_location,
+        "host": participants[0] if participants else "主持人",
+        "participants": participants,
+        "participant_count": len(participants),
+        "meeting_duration": duration,
+        "topics": topics,
+        "pre_meeting_preparations": pre_meeting_preparations
+    }
+    return mock_data
+
+
+
+def make_transcript(size: int, filler: str = FILLER, header: str = SAMPLE) -> str:
+    """生成约size字节（UTF-8）的会议文本"""
+    filler_bytes = len(filler.encode("utf-8"))
+    repeat = max(0, (size - len(header.encode("utf-8"))) // filler_bytes)
+    return header + filler * repeat + "会前准备事项：提前把会议资料发到群里\n"
+
+
+# 场景 -> 文本生成方式
+SCENARIOS = {
+    "结构化": lambda size: make_transcript(size),
+    "无参会人员字段": lambda size: make_transcript(size).replace("参会人员", "参与者"),
+    "无时间字段": lambda size: make_transcript(size, header="参会人员：李四、王五\n"),
+    "关键字密集": lambda size: make_transcript(size, filler=DENSE_FILLER),
+}
+
+
+def best_of(fn, text, repeat):
+    """多次运行取最短耗时（毫秒）"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(text)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="启发式提取基准测试")
+    parser.add_argument("--repeat", type=int, default=5, help="每个规模重复次数")
+    args = parser.parse_args()
+
+    print(f"{'场景':<10} {'文本大小':>8} {'旧实现(ms)':>12} {'新实现(ms)':>12} {'加速比':>8}")
+    for name, make in SCENARIOS.items():
+        for size in (1 << 10, 10 << 10, 100 << 10, 1 << 20):
+            text = make(size)
+            assert extract_meeting_fields(text) == legacy_get_mock_data(text)
+            old = best_of(legacy_get_mock_data, text, args.repeat)
+            new = best_of(extract_meeting_fields, text, args.repeat)
+            print(f"{name:<10} {size >> 10:>6}KB {old:12.3f} {new:12.3f} {old / new:7.1f}x")
+    print("注：旧实现在一次_parse_response中最多被调用3次，新实现每个请求只计算一次")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+JSON提取基准测试：旧的提取逻辑与单遍修复解析器对比
+
+语料是小模型常见的不规范输出（代码块、说明文字、多余逗号、单引号、None、中文引号、
+字符串中的括号、输出截断、注释、未加引号的键等），统计各自丢弃（退回模拟数据）的比例和解析耗时。
+
+用法（在ZNHY_developer目录下运行）：
+    python -m benchmarks.bench_json_repair
+"""
+
+import argparse
+import json
+import sys
+import time
+
+from benchmarks.bench_ollama_client import percentile
+from benchmarks.transcripts import make_meeting
+from utils.json_repair import repair_json
+
+
+def legacy_extract_json(response):
+    """修改前MeetingParser._extract_json的逻辑，失败时返回None"""
+    if "```json" in response:
+        response = response.split("```json")[1]
+    if "```" in response:
+        response = response.split("```")[0]
+    response = response.strip().replace("None", "null")
+    try:
+        return json.loads(response)
+    except Exception:
+        pass
+    try:
+        start_idx = response.find('{')
+        if start_idx == -1:
+            return None
+        depth = 1
+        end_idx = start_idx + 1
+        for char in response[start_idx + 1:]:
+            if char == '{':
+                depth += 1
+            elif char == '}':
+                depth -= 1
+                if depth == 0:
+                    break
+            end_idx += 1
+        return json.loads(response[start_idx:end_idx + 1])
+    except Exception:
+        return None
+
+
+def new_extract_json(response):
+    """修改后的逻辑：先直接解析，失败时修复"""
+    try:
+        result = json.loads(response)
+        if isinstance(result, dict):
+            return result
+    except ValueError:
+        pass
+    try:
+        return repair_json(response)
+    except ValueError:
+        return None
+
+
+def _corruptions(meeting):
+    """返回(名称, 响应文本, 要核对的字段, 期望值)列表"""
+    text = json.dumps(meeting, ensure_ascii=False, indent=2)
+    topic = meeting["meeting_topic"]
+    first_key = text.index('"meeting_time"')
+    python_repr = repr(dict(meeting, host=None))
+    cases = [
+        ("clean", text),
+        ("fenced", f"```json\n{text}\n```"),
+        ("prose", f"好的，以下是提取结果：\n{text}\n以上信息仅供参考。"),
+        ("trailing_comma", text.replace("\n  ]", ",\n  ]").replace("\n}", ",\n}")),
+        ("single_quotes", text.replace('"', "'")),
+        ("python_repr", python_repr),
+        ("none_in_name", json.dumps(dict(meeting, host="Noneya Smith"), ensure_ascii=False), "host", "Noneya Smith"),
+        ("chinese_quotes", text.replace('"meeting_topic"', '“meeting_topic”')),
+        ("brace_in_string", "结果如下：" + json.dumps(dict(meeting, meeting_location="A栋}302会议室"),
+                                                  ensure_ascii=False), "meeting_location", "A栋}302会议室"),
+        ("truncated", text[:len(text) * 2 // 3]),
+        ("comments", text[:first_key] + "// 会议时间\n  " + text[first_key:]),
+        ("unquoted_keys", text.replace('"meeting_topic":', 'meeting_topic:')),
+        ("full_width_colon", text.replace('"meeting_topic":', '"meeting_topic"：')),
+        ("missing_comma", text.replace(f'"{topic}",', f'"{topic}"', 1)),
+    ]
+    # 未指定核对字段的用例核对会议主题
+    return [case if len(case) == 4 else case + ("meeting_topic", topic) for case in cases]
+
+
+def build_corpus(size):
+    corpus = []
+    for seed in range(size):
+        corpus += _corruptions(make_meeting(seed, 2 + seed % 8, 1 + seed % 5))
+    return corpus
+
+
+def evaluate(extract, corpus):
+    """返回({类别: 失败次数}, 每次解析耗时毫秒列表)；结果为None或核对的字段不对都算失败"""
+    failures = {}
+    samples = []
+    for name, response, field, expected in corpus:
+        start = time.perf_counter()
+        result = extract(response)
+        samples.append((time.perf_counter() - start) * 1000)
+        ok = isinstance(result, dict) and result.get(field) == expected
+        failures[name] = failures.get(name, 0) + (0 if ok else 1)
+    return failures, samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JSON提取基准测试")
+    parser.add_argument("--size", type=int, default=50, help="每种格式问题的样本数")
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.size)
+    legacy_failures, legacy_samples = evaluate(legacy_extract_json, corpus)
+    new_failures, new_samples = evaluate(new_extract_json, corpus)
+
+    print(f"{'类别':<24} {'旧逻辑失败':>10} {'新逻辑失败':>10}")
+    for name in legacy_failures:
+        print(f"{name:<24} {legacy_failures[name]:>10} {new_failures[name]:>10}")
+    total = len(corpus)
+    for label, failures, samples in (("旧逻辑", legacy_failures, legacy_samples),
+                                     ("新逻辑", new_failures, new_samples)):
+        failed = sum(failures.values())
+        print(f"{label}: 退回模拟数据 {failed}/{total} ({failed / total:.1%})  "
+              f"解析耗时 p50={percentile(samples, 50):.3f}ms p95={percentile(samples, 95):.3f}ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
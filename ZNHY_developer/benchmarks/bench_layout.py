@@ -0,0 +1,61 @@
+"""
+版式渲染基准测试：表格版式（WordGenerator）和标题版式（meeting_template）由同一套编译后的渲染计划输出
+
+每种版式分别测量：
+- 从空白模板构建：打开空白文档执行骨架步骤后再渲染（相当于原来手写渲染的每次开销）
+- 复制骨架：复制预先构建的骨架，填入会议信息，议题等逐段内容一次解析后追加
+- 流式写入：StreamingDocxWriter按同一份渲染计划逐段写入ZIP流
+
+用法（在ZNHY_developer目录下运行）：
+    python -m benchmarks.bench_layout --topics 5 50 500
+"""
+
+import argparse
+import io
+import statistics
+import time
+
+from docx import Document
+
+from benchmarks.transcripts import make_meeting
+from utils.docx_stream import StreamingDocxWriter
+from utils.layout import LAYOUTS, get_layout
+
+
+def timed(fn, repeat):
+    fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def save(document):
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="版式渲染基准测试")
+    parser.add_argument("--participants", type=int, default=20, help="参会人数")
+    parser.add_argument("--topics", type=int, nargs="+", default=[5, 50, 500], help="议题数")
+    parser.add_argument("--repeat", type=int, default=20, help="每项测量次数")
+    args = parser.parse_args()
+
+    print(f"{'版式':<10} {'议题数':>6} {'从空白模板构建(ms)':>18} {'复制骨架(ms)':>14} {'流式写入(ms)':>14}")
+    for layout in LAYOUTS:
+        plan = get_layout(layout)
+        writer = StreamingDocxWriter(layout=layout)
+        for topics in args.topics:
+            meeting = make_meeting(0, args.participants, topics)
+            scratch = timed(lambda: save(plan.render(plan.build(Document()), meeting)), args.repeat)
+            cloned = timed(lambda: save(plan.render(plan.new_document(), meeting)), args.repeat)
+            stream = timed(lambda: writer.render(meeting), args.repeat)
+            print(f"{layout:<10} {topics:>6} {scratch:18.2f} {cloned:14.2f} {stream:14.2f}")
+
+
+if __name__ == "__main__":
+    main()
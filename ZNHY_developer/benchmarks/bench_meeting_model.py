@@ -0,0 +1,124 @@
+"""
+会议信息模型基准测试：原来各处传递的字典对比MeetingRecord
+
+- 缓存命中：原来每个请求deepcopy缓存中的字典，渲染时再整理一遍参会人员和议题；
+  现在from_dict一次规范化后复制列表
+- 整理大模型输出：原来复制模拟数据字典再update、逐个整理参会人员（议题留给渲染时整理）；
+  现在from_dict一次完成参会人员和议题的规范化
+- 常驻内存：同时持有N份会议信息时字典和__slots__对象各占多少内存
+
+每项给出耗时和tracemalloc统计的单次分配量。
+
+用法（在ZNHY_developer目录下运行）：
+    python -m benchmarks.bench_meeting_model --participants 10 --topics 5 50
+"""
+
+import argparse
+import copy
+import json
+import statistics
+import time
+import tracemalloc
+
+from benchmarks.transcripts import make_meeting, make_transcript
+from utils.llm_cache import LLMResponseCache
+from utils.llm_parser import MeetingParser
+from utils.meeting_model import LEGACY_TOPIC_FIELDS, MeetingRecord, participant_name
+from utils.roster import Roster
+
+
+def legacy_render_fields(meeting_data):
+    """原渲染入口对字典做的整理：参会人员拼接、agenda_items转换为议题"""
+    participants = meeting_data.get("participants", [])
+    text = "、".join(participant_name(p) for p in participants) if isinstance(participants, list) else participants
+    topics = meeting_data.get("topics") or [
+        {new: item[old] for old, new in LEGACY_TOPIC_FIELDS.items() if old in item}
+        for item in meeting_data.get("agenda_items", [])
+    ]
+    return text, [(topic.get("title", ""), topic.get("leader", "")) for topic in topics]
+
+
+def legacy_complete(result, mock_data, roster):
+    """原_complete_result：复制模拟数据后update，再逐个整理参会人员"""
+    complete_result = mock_data.copy()
+    complete_result.update(result)
+    fixed = []
+    for p in complete_result.get("participants", []):
+        name = participant_name(p)
+        if name:
+            names, has_stop = roster.scan(name)
+            if names:
+                fixed.extend(n for n in names if n not in fixed)
+            elif not has_stop:
+                fixed.append(name)
+    host = complete_result.get("host", "")
+    if host and host not in fixed:
+        fixed.append(host)
+    complete_result["participants"] = fixed or mock_data.get("participants", [])
+    complete_result["participant_count"] = len(complete_result["participants"])
+    return complete_result
+
+
+def measure(fn, repeat):
+    fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(samples), peak
+
+
+def retained(factory, count):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    items = [factory(i) for i in range(count)]
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del items
+    return size / count
+
+
+def report(label, legacy, current):
+    (legacy_ms, legacy_bytes), (current_ms, current_bytes) = legacy, current
+    print(f"  {label:<12} 字典 {legacy_ms * 1000:8.1f}us {legacy_bytes / 1024:7.1f}KB   "
+          f"MeetingRecord {current_ms * 1000:8.1f}us {current_bytes / 1024:7.1f}KB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="会议信息模型基准测试")
+    parser.add_argument("--participants", type=int, default=10, help="参会人数")
+    parser.add_argument("--topics", type=int, nargs="+", default=[5, 50], help="议题数")
+    parser.add_argument("--records", type=int, default=2000, help="常驻内存测试的会议份数")
+    parser.add_argument("--repeat", type=int, default=200, help="每项测量次数")
+    args = parser.parse_args()
+
+    roster = Roster()
+    meeting_parser = MeetingParser(cache=LLMResponseCache(max_entries=0), roster=roster)
+    for topics in args.topics:
+        meeting = make_meeting(0, args.participants, topics)
+        cached = json.loads(json.dumps(meeting, ensure_ascii=False))
+        text = make_transcript(0, args.participants, topics, 10)
+        mock_data = meeting_parser._get_mock_data(text)
+        print(f"\n{args.participants}人、{topics}个议题（耗时为中位数，内存为单次分配峰值）")
+
+        def legacy_hit():
+            data = copy.deepcopy(cached)
+            legacy_render_fields(data)
+
+        report("缓存命中", measure(legacy_hit, args.repeat),
+               measure(lambda: MeetingRecord.from_dict(cached).copy(), args.repeat))
+        report("整理模型输出", measure(lambda: legacy_complete(meeting, mock_data, roster), args.repeat),
+               measure(lambda: meeting_parser._complete_result(meeting, text), args.repeat))
+
+        dict_size = retained(lambda i: copy.deepcopy(cached), args.records)
+        record_size = retained(lambda i: MeetingRecord.from_dict(cached), args.records)
+        print(f"  {'常驻内存':<12} 字典 {dict_size / 1024:7.2f}KB/份   MeetingRecord {record_size / 1024:7.2f}KB/份")
+
+
+if __name__ == "__main__":
+    main()
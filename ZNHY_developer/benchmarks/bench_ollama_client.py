@@ -0,0 +1,74 @@
+"""
+对比Ollama调用在连接复用前后的延迟（p50/p99）
+
+用法（在ZNHY_developer目录下运行）：
+    python -m benchmarks.bench_ollama_client --requests 500 --threads 4
+"""
+
+import argparse
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from benchmarks.stub_ollama import StubOllamaServer
+from utils.ollama_client import OllamaClient
+
+PAYLOAD = {"model": "qwen:1.8b", "prompt": "会议主题：项目进度讨论", "stream": False}
+
+
+def percentile(samples, pct):
+    """计算百分位数（最近秩法）"""
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100.0 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def run(call, total, threads):
+    """并发执行total次调用，返回每次调用的耗时（毫秒）"""
+    def timed(_):
+        start = time.perf_counter()
+        response = call()
+        response.raise_for_status()
+        response.json()
+        return (time.perf_counter() - start) * 1000
+
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        return list(pool.map(timed, range(total)))
+
+
+def report(name, samples):
+    print(f"{name:<24} p50={percentile(samples, 50):7.3f}ms  "
+          f"p99={percentile(samples, 99):7.3f}ms  mean={statistics.mean(samples):7.3f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ollama连接池基准测试")
+    parser.add_argument("--requests", type=int, default=500, help="每组请求数")
+    parser.add_argument("--threads", type=int, default=4, help="并发线程数")
+    args = parser.parse_args()
+
+    with StubOllamaServer() as server:
+        url = server.url
+
+        # 之前：每次调用模块级requests.post，都会新建TCP连接
+        before = run(lambda: requests.post(url, json=PAYLOAD, timeout=30), args.requests, args.threads)
+        before_connections = server.connection_count
+
+        # 之后：共享客户端，复用连接池中的长连接
+        client = OllamaClient(pool_maxsize=args.threads)
+        run(lambda: client.post(url, PAYLOAD), args.threads, args.threads)  # 预热连接池
+        after = run(lambda: client.post(url, PAYLOAD), args.requests, args.threads)
+        after_connections = server.connection_count - before_connections
+        client.close()
+
+    print(f"请求数: {args.requests}, 并发: {args.threads}")
+    report("requests.post（每次新连接）", before)
+    print(f"    建立连接数: {before_connections}")
+    report("OllamaClient（连接池）", after)
+    print(f"    建立连接数: {after_connections}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+解析/预览/渲染分离的基准测试：只需要结构化数据或预览时，跳过docx渲染能省下多少
+
+- /generate：解析并渲染docx（修改前唯一的入口）
+- /parse：只返回会议信息JSON
+- /parse?format=html：返回HTML预览
+- /render：不调用大模型，把JSON渲染为docx（关闭文档缓存）
+
+解析结果都命中缓存，测量的是解析之后的开销。
+
+用法（在ZNHY_developer目录下运行）：
+    python -m benchmarks.bench_parse_render --topics 50
+"""
+
+import argparse
+import os
+import statistics
+import time
+
+from benchmarks.stub_ollama import StubOllamaServer
+from benchmarks.transcripts import make_meeting, make_transcript
+
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="解析/预览/渲染分离的基准测试")
+    parser.add_argument("--participants", type=int, default=20, help="参会人数")
+    parser.add_argument("--topics", type=int, default=50, help="议题数")
+    parser.add_argument("--repeat", type=int, default=20, help="每项测量次数")
+    args = parser.parse_args()
+
+    meeting = make_meeting(0, args.participants, args.topics)
+    text = make_transcript(0, args.participants, args.topics, 100)
+    with StubOllamaServer(meeting_json=meeting, latency="fixed:0") as server:
+        os.environ["OLLAMA_URL"] = server.url
+        try:
+            from app import DOCX_MIMETYPE, create_app
+            from config import Config
+            from utils.render_cache import get_render_cache
+
+            client = create_app(Config(WARMUP="off")).test_client()
+            parsed = client.post("/parse", json={"text": text}).get_json()["meeting"]
+
+            def post(path, body, content_type):
+                def run():
+                    get_render_cache().clear()
+                    response = client.post(path, json=body)
+                    assert response.status_code == 200 and response.mimetype == content_type
+                    return len(response.data)
+                return run
+
+            cases = [
+                ("/generate", post("/generate", {"text": text}, DOCX_MIMETYPE)),
+                ("/parse", post("/parse", {"text": text}, "application/json")),
+                ("/parse?format=html", post("/parse?format=html", {"text": text}, "text/html")),
+                ("/render", post("/render", {"meeting": parsed}, DOCX_MIMETYPE)),
+            ]
+            print(f"会议规模: {args.participants}人 {args.topics}个议题")
+            print(f"{'接口':<20} {'p50(ms)':>10} {'响应(KB)':>10}")
+            for name, run in cases:
+                size = run()
+                print(f"{name:<20} {timed(run, args.repeat):10.2f} {size / 1024:10.1f}")
+            print(f"大模型调用次数: {server.request_count}")
+        finally:
+            os.environ.pop("OLLAMA_URL", None)
+
+
+if __name__ == "__main__":
+    main()
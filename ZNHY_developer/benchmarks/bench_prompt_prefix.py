@@ -0,0 +1,126 @@
+"""
+首个token延迟（TTFT）基准测试：固定说明放入system提示词并预热前后对比
+
+桩服务模拟Ollama的两种开销：模型未加载时的加载时间，以及与上一个请求不同的提示词部分的处理时间。
+旧提示词把会议内容放在说明中间，每个请求几乎都要重新处理全部说明；
+新提示词的system部分每次相同，只有会议内容需要处理。
+
+用法（在ZNHY_developer目录下运行）：
+    python -m benchmarks.bench_prompt_prefix
+"""
+
+import argparse
+import json
+import statistics
+import time
+
+from benchmarks.bench_ollama_client import percentile
+from benchmarks.stub_ollama import StubOllamaServer
+from benchmarks.transcripts import make_transcript
+from utils.llm_parser import SYSTEM_PROMPT, MeetingParser
+from utils.ollama_client import OllamaClient
+
+# 原_build_prompt的提示词：说明和示例与会议内容拼在一起
+LEGACY_PROMPT_TEMPLATE = """
+你是一个会议信息提取专家，请严格从以下会议内容中提取所有相关信息：
+
+会议内容："{text}"
+
+请从提供的会议内容中提取所有相关信息，并严格按照JSON格式输出。
+
+特别注意：必须准确提取参会人员信息：
+- 参会人员包括主持人和所有列出的参会者
+- 主持人从'主持人：'关键字后提取
+- 其他参会者从'参会人员：'关键字后提取（以顿号分隔）
+- 将所有人员姓名作为独立元素放入participants数组，确保不遗漏任何人员
+
+输出格式示例（仅用于说明结构，请勿直接使用示例内容）：
+```json
+{{
+  "meeting_topic": "下季度产品推广方案",
+  "meeting_time": "2023年10月15日下午3点",
+  "meeting_location": "公司三楼大会议室",
+  "host": "李明",
+  "participants": ["李明", "张娜", "王磊", "赵晓雨"],
+  "participant_count": 4,
+  "meeting_duration": "约两小时",
+  "topics": [
+    {{
+      "title": "下季度产品推广方案（线上广告投放预算分配）",
+      "leader": "李明",
+      "preparation": "准备相关数据"
+    }},
+    {{
+      "title": "新版APP研发进度",
+      "leader": "王磊"
+    }},
+    {{
+      "title": "下月底团建活动安排（备选地点：近郊民宿、爬山）",
+      "leader": "张娜",
+      "participants": "全体参会者（赵晓雨参与讨论）"
+    }}
+  ],
+  "pre_meeting_preparations": "提前将会议资料发到群里"
+}}
+```
+
+注意事项：
+1. **JSON格式要求**：必须使用英文引号，不得使用中文引号；必须是 valid JSON 格式
+2. **participant_count字段要求**：必须等于participants数组的长度，为数字类型
+3. 所有字段的值必须来自输入的会议内容，不得使用任何示例内容或外部信息
+4. 输出仅为JSON格式，不得包含任何解释性文字或标记（如```json```等）
+"""
+
+
+def time_to_first_token(client, url, payload):
+    """发送流式请求，返回收到第一个片段的耗时（毫秒）"""
+    start = time.perf_counter()
+    response = client.post(url, payload, stream=True)
+    try:
+        for line in response.iter_lines():
+            if line and json.loads(line).get("response"):
+                return (time.perf_counter() - start) * 1000
+    finally:
+        response.close()
+    return (time.perf_counter() - start) * 1000
+
+
+def run(url, texts, legacy):
+    client = OllamaClient()
+    parser = MeetingParser(client=client)
+    parser.ollama_url = url
+    if not legacy:
+        parser.warmup()
+    samples = []
+    for text in texts:
+        if legacy:
+            # 旧请求：没有system提示词，也不指定keep_alive
+            payload = {"model": parser.model_name, "prompt": LEGACY_PROMPT_TEMPLATE.format(text=text), "stream": True}
+        else:
+            payload = {"model": parser.model_name, "system": SYSTEM_PROMPT, "prompt": parser._build_prompt(text),
+                       "stream": True, "keep_alive": parser.keep_alive}
+        samples.append(time_to_first_token(client, url, payload))
+    client.close()
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description="首个token延迟基准测试")
+    parser.add_argument("--requests", type=int, default=20, help="请求数")
+    parser.add_argument("--latency-per-kchar", type=float, default=150, help="每处理1000字提示词的耗时（毫秒）")
+    parser.add_argument("--load-ms", type=float, default=2000, help="模型加载时间（毫秒）")
+    args = parser.parse_args()
+
+    texts = [make_transcript(seed, 4, 3, 10) for seed in range(args.requests)]
+    print(f"{'方式':<16} {'首个请求(ms)':>12} {'p50(ms)':>10} {'p99(ms)':>10} {'mean(ms)':>10}")
+    for name, legacy in (("旧提示词", True), ("system+预热", False)):
+        # 每种方式使用新的桩服务，从模型未加载的状态开始
+        with StubOllamaServer(latency_per_kchar=args.latency_per_kchar, load_ms=args.load_ms,
+                              prefix_cache=True) as server:
+            samples = run(server.url, texts, legacy)
+        print(f"{name:<16} {samples[0]:12.1f} {percentile(samples, 50):10.1f} {percentile(samples, 99):10.1f} "
+              f"{statistics.mean(samples):10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+文档缓存和ETag基准测试：重复下载同一份会议记录时/generate的耗时
+
+- 首次：调用大模型解析并渲染
+- 解析缓存命中、不缓存文档：只重新渲染（修改前重复下载的情况）
+- 解析和文档缓存都命中
+- 带If-None-Match：直接返回304
+
+用法（在ZNHY_developer目录下运行）：
+    python -m benchmarks.bench_render_cache --topics 50
+"""
+
+import argparse
+import os
+import statistics
+import time
+
+from benchmarks.stub_ollama import StubOllamaServer
+from benchmarks.transcripts import make_meeting, make_transcript
+
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="文档缓存和ETag基准测试")
+    parser.add_argument("--participants", type=int, default=20, help="参会人数")
+    parser.add_argument("--topics", type=int, default=50, help="议题数")
+    parser.add_argument("--latency", default="fixed:500", help="桩服务的延迟分布")
+    parser.add_argument("--repeat", type=int, default=20, help="每项测量次数")
+    args = parser.parse_args()
+
+    meeting = make_meeting(0, args.participants, args.topics)
+    text = make_transcript(0, args.participants, args.topics, 100)
+    with StubOllamaServer(meeting_json=meeting, latency=args.latency) as server:
+        os.environ["OLLAMA_URL"] = server.url
+        try:
+            from app import create_app
+            from config import Config
+            from utils.render_cache import get_render_cache
+
+            client = create_app(Config(WARMUP="off")).test_client()
+
+            start = time.perf_counter()
+            response = client.post("/generate", json={"text": text})
+            first = (time.perf_counter() - start) * 1000
+            etag = response.headers["ETag"]
+
+            def rerender():
+                get_render_cache().clear()
+                assert client.post("/generate", json={"text": text}).status_code == 200
+
+            def cached():
+                assert client.post("/generate", json={"text": text}).status_code == 200
+
+            def not_modified():
+                response = client.post("/generate", json={"text": text}, headers={"If-None-Match": etag})
+                assert response.status_code == 304
+
+            print(f"会议规模: {args.participants}人 {args.topics}个议题，文档{len(response.data) / 1024:.0f}KB")
+            print(f"{'情况':<24} {'p50(ms)':>10}")
+            print(f"{'首次（大模型+渲染）':<24} {first:10.2f}")
+            print(f"{'解析缓存命中，重新渲染':<24} {timed(rerender, args.repeat):10.2f}")
+            print(f"{'解析和文档缓存都命中':<24} {timed(cached, args.repeat):10.2f}")
+            print(f"{'If-None-Match -> 304':<24} {timed(not_modified, args.repeat):10.2f}")
+            print(f"大模型调用次数: {server.request_count}")
+        finally:
+            os.environ.pop("OLLAMA_URL", None)
+
+
+if __name__ == "__main__":
+    main()
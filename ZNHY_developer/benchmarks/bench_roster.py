@@ -0,0 +1,118 @@
+"""
+花名册索引基准测试：没有"参会人员"字段的会议记录中识别参会人员
+
+- 正则猜测：原来的[\\u4e00-\\u9fa5]{2,4}匹配后去重（不用花名册）
+- 逐个查找：对花名册中每个姓名做一次 name in text
+- 自动机：Roster.find_names一次扫描全文
+
+同时给出识别结果的准确率、召回率和是否保持出现顺序，以及建立索引的耗时和
+整理大模型输出的参会人员（原关键词循环对比自动机）的耗时。
+
+用法（在ZNHY_developer目录下运行）：
+    python -m benchmarks.bench_roster --roster-size 1000 10000 50000
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+from benchmarks.transcripts import make_transcript
+from utils.heuristic_extractor import _guess_names
+from utils.roster import STOP_KEYWORDS, Roster
+
+# 生成花名册用的名字用字
+GIVEN_CHARS = "伟芳娜敏静磊洋勇艳杰涛明超晓雨建国志强秀英华慧巧美淑惠珠翠雅芝玉萍红娥玲芬燕彩春菊兰凤洁梅琳素云莲真环雪荣爱妹霞香月莺媛瑞凡佳嘉琼勤珍贞莉桂娣叶璧璐娅琦晶妍茜秋珊莎锦黛青倩婷姣婉娴瑾颖露瑶怡婵雁蓓纨仪荷丹蓉眉君琴蕊薇菁梦岚苑婕馨瑗琰韵融园艺咏卿聪澜纯毓悦昭冰爽琬茗羽希宁欣飘育滢馥筠柔竹霭凝晓欢霄枫芸菲寒伊亚宜可姬舒影荔枝思丽"
+SURNAMES = "张李王赵刘陈杨黄周吴徐孙马朱胡郭何高林罗郑梁谢宋唐许韩冯邓曹彭曾肖田董袁潘于蒋蔡余杜叶程苏魏吕丁任沈姚卢姜崔钟谭陆汪范金石廖贾夏韦付方白邹孟熊秦邱江尹薛闫段雷侯龙史陶黎贺顾毛郝龚邵万钱严覃武戴莫孔向汤"
+FILLER = ["大家讨论了下季度的推广安排，{name}负责跟进。", "{name}汇报了本周的进展，整体符合预期。",
+          "关于预算的问题，{name}建议下周再确认。", "会议时间比较紧，{name}补充了测试情况。"]
+
+
+def make_roster_names(rng, count):
+    names = {}
+    while len(names) < count:
+        given = "".join(rng.choice(GIVEN_CHARS) for _ in range(rng.choice((1, 2, 2))))
+        names.setdefault(rng.choice(SURNAMES) + given, None)
+    return list(names)
+
+
+def make_free_transcript(rng, attendees, remarks):
+    """不含"参会人员"字段的会议记录：字段行去掉参会人员，发言中依次提到参会者"""
+    head = [line for line in make_transcript(0, 4, 3, 0).splitlines() if "参会人员" not in line and "主持人" not in line]
+    lines = [f"参会的有{'、'.join(attendees[:3])}等同事。"]
+    for i in range(remarks):
+        lines.append(rng.choice(FILLER).format(name=attendees[i % len(attendees)]))
+    return "\n".join(head + lines)
+
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), result
+
+
+def score(found, attendees):
+    expected = set(attendees)
+    hits = [name for name in found if name in expected]
+    precision = len(hits) / len(found) if found else 0.0
+    recall = len(set(hits)) / len(expected)
+    ordered = hits == attendees[:len(hits)]
+    return f"{precision:6.0%} {recall:6.0%} {'是' if ordered else '否':>4}"
+
+
+def legacy_filter(candidates):
+    return [name for name in candidates if not any(keyword in name for keyword in STOP_KEYWORDS)]
+
+
+def roster_filter(roster, candidates):
+    result = []
+    for name in candidates:
+        names, has_stop = roster.scan(name)
+        if names:
+            result.extend(n for n in names if n not in result)
+        elif not has_stop:
+            result.append(name)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="花名册索引基准测试")
+    parser.add_argument("--roster-size", type=int, nargs="+", default=[1000, 10000, 50000], help="花名册人数")
+    parser.add_argument("--attendees", type=int, default=12, help="参会人数")
+    parser.add_argument("--remarks", type=int, default=200, help="发言条数")
+    parser.add_argument("--repeat", type=int, default=5, help="每项测量次数")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    all_names = make_roster_names(rng, max(args.roster_size))
+    attendees = rng.sample(all_names[:min(args.roster_size)], args.attendees)
+    text = make_free_transcript(rng, attendees, args.remarks)
+    candidates = [f"市场部{name}" if i % 3 == 0 else name for i, name in enumerate(attendees)] + \
+        ["项目进度", "下午三点", "会议室A"]
+    print(f"会议记录{len(text)}字，参会{len(attendees)}人")
+
+    elapsed, found = timed(lambda: _guess_names(text), args.repeat)
+    print(f"\n{'方式':<10} {'花名册':>8} {'耗时(ms)':>10} {'准确率':>6} {'召回率':>6} {'保序':>4}")
+    print(f"{'正则猜测':<10} {'-':>8} {elapsed:10.2f} {score(found, attendees)}")
+    for size in args.roster_size:
+        start = time.perf_counter()
+        roster = Roster((name, ()) for name in all_names[:size])
+        build_ms = (time.perf_counter() - start) * 1000
+        elapsed, found = timed(lambda: [name for name in roster.names if name in text], args.repeat)
+        print(f"{'逐个查找':<10} {size:>8} {elapsed:10.2f} {score(found, attendees)}")
+        elapsed, found = timed(lambda: roster.find_names(text), args.repeat)
+        print(f"{'自动机':<10} {size:>8} {elapsed:10.2f} {score(found, attendees)}  （建索引{build_ms:.0f}ms）")
+
+    roster = Roster((name, ()) for name in all_names[:max(args.roster_size)])
+    legacy_ms, legacy = timed(lambda: legacy_filter(candidates), args.repeat * 100)
+    roster_ms, cleaned = timed(lambda: roster_filter(roster, candidates), args.repeat * 100)
+    print(f"\n整理大模型输出的{len(candidates)}个候选：")
+    print(f"  关键词循环 {legacy_ms * 1000:8.1f}us  {legacy}")
+    print(f"  自动机     {roster_ms * 1000:8.1f}us  {cleaned}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+相同会议记录并发提交的基准测试：合并在途请求前后的大模型调用次数和耗时
+
+模拟会议结束后多人同时粘贴同一份记录：每轮N个线程同时解析相同内容，
+各自使用独立的MeetingParser（与app中每个请求一样）。
+
+用法（在ZNHY_developer目录下运行）：
+    python -m benchmarks.bench_single_flight --concurrency 8 --rounds 5
+"""
+
+import argparse
+import threading
+import time
+
+from benchmarks.bench_ollama_client import percentile
+from benchmarks.stub_ollama import StubOllamaServer
+from benchmarks.transcripts import make_transcript
+from utils.llm_cache import LLMResponseCache
+from utils.llm_parser import MeetingParser
+from utils.metrics import COALESCED_TOTAL
+from utils.ollama_client import OllamaClient
+from utils.single_flight import SingleFlight
+
+
+def run_round(url, text, concurrency, client, single_flight):
+    """concurrency个线程同时解析text，返回每个线程的耗时（毫秒）"""
+    latencies = []
+    lock = threading.Lock()
+    barrier = threading.Barrier(concurrency)
+
+    def worker():
+        # 不使用缓存，只比较合并在途请求的效果
+        parser = MeetingParser(client=client, cache=LLMResponseCache(max_entries=0))
+        # None表示不合并
+        parser.single_flight = single_flight
+        parser.ollama_url = url
+        barrier.wait()
+        start = time.perf_counter()
+        parser.parse_meeting_text(text)
+        with lock:
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description="合并相同并发请求的基准测试")
+    parser.add_argument("--concurrency", type=int, default=8, help="同时提交相同内容的请求数")
+    parser.add_argument("--rounds", type=int, default=5, help="轮数，每轮使用不同的会议记录")
+    parser.add_argument("--latency", default="fixed:500", help="桩服务的延迟分布")
+    parser.add_argument("--parallel", type=int, default=1, help="桩服务同时生成的请求数，与OLLAMA_NUM_PARALLEL对应")
+    args = parser.parse_args()
+
+    print(f"{'模式':<8} {'请求数':>6} {'大模型调用':>10} {'合并':>6} {'p50(ms)':>10} {'max(ms)':>10}")
+    for label, single_flight in (("不合并", None), ("合并", SingleFlight())):
+        # 与真实Ollama一样，超出parallel的生成请求排队等待
+        with StubOllamaServer(templated=True, latency=args.latency, parallel=args.parallel) as server:
+            client = OllamaClient(pool_maxsize=args.concurrency)
+            coalesced = COALESCED_TOTAL.value()
+            latencies = []
+            for i in range(args.rounds):
+                text = make_transcript(i, 6, 3, 30)
+                latencies += run_round(server.url, text, args.concurrency, client, single_flight)
+            print(f"{label:<8} {len(latencies):>6} {server.request_count:>10} "
+                  f"{int(COALESCED_TOTAL.value() - coalesced):>6} {percentile(latencies, 50):10.1f} "
+                  f"{max(latencies):10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""
+基准测试套件：分别测量响应解析、启发式提取、两种文档渲染以及/generate端到端（关闭和命中文档缓存）耗时
+
+结果保存为JSON，传入--compare可以与之前的结果对比，发现性能回退。
+
+用法（在ZNHY_developer目录下运行）：
+    python -m benchmarks.bench_suite --output bench_results.json
+    python -m benchmarks.bench_suite --output new.json --compare bench_results.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List
+
+from benchmarks.bench_ollama_client import percentile
+from benchmarks.stub_ollama import StubOllamaServer
+from benchmarks.transcripts import PROFILES, make_llm_response, make_meeting, make_transcript
+from meeting_template import create_meeting_record
+from utils.llm_cache import LLMResponseCache
+from utils.llm_parser import MeetingParser
+from utils.word_generator import WordGenerator
+
+
+def time_calls(fn: Callable[[int], object], repeat: int, warmup: int = 1) -> List[float]:
+    """调用fn(i)共repeat次，返回每次耗时（毫秒）"""
+    samples = []
+    for i in range(warmup):
+        fn(-1 - i)
+    for i in range(repeat):
+        start = time.perf_counter()
+        fn(i)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def summarize(name: str, profile: str, samples: List[float]) -> Dict[str, object]:
+    return {
+        "name": name,
+        "profile": profile,
+        "runs": len(samples),
+        "mean_ms": round(statistics.mean(samples), 4),
+        "p50_ms": round(percentile(samples, 50), 4),
+        "p95_ms": round(percentile(samples, 95), 4),
+        "min_ms": round(min(samples), 4),
+    }
+
+
+def bench_profile(profile: str, repeat: int) -> List[Dict[str, object]]:
+    participants, topics, remarks = PROFILES[profile]
+    text = make_transcript(0, participants, topics, remarks)
+    raw_response = make_llm_response(0, participants, topics)
+    meeting = make_meeting(0, participants, topics)
+    # 旧模板的参会人员是字符串
+    template_meeting = dict(meeting, participants="、".join(meeting["participants"]))
+    parser = MeetingParser(cache=LLMResponseCache(max_entries=0))
+
+    def parse_response(_):
+        # 每次清空记忆，测量完整的解析和补全过程
+        parser._mock_memo = None
+        parser._parse_response(raw_response, text)
+
+    def get_mock_data(_):
+        parser._mock_memo = None
+        parser._get_mock_data(text)
+
+    cases = {
+        "parse_response": parse_response,
+        "get_mock_data": get_mock_data,
+        "word_generator": lambda _: WordGenerator().generate_document(meeting),
+        "meeting_template": lambda _: create_meeting_record(template_meeting),
+    }
+    return [summarize(name, profile, time_calls(fn, repeat)) for name, fn in cases.items()]
+
+
+def bench_end_to_end(profile: str, repeat: int) -> List[Dict[str, object]]:
+    """通过Flask测试客户端调用/generate，大模型由本地桩服务代替
+
+    桩服务每次返回相同的会议信息，generate_end_to_end关闭文档缓存，每次都完整渲染文档，
+    与加入文档缓存之前的结果可比；generate_render_cache_hit单独测量命中文档缓存时的耗时。
+    """
+    from app import create_app
+    from config import Config
+    from utils.render_cache import reset_render_cache
+
+    participants, topics, remarks = PROFILES[profile]
+    text = make_transcript(0, participants, topics, remarks)
+    results = []
+    with StubOllamaServer(meeting_json=make_meeting(0, participants, topics)) as server:
+        os.environ["OLLAMA_URL"] = server.url
+        try:
+            client = create_app(Config(WARMUP="off")).test_client()
+
+            for name, cache_size in (("generate_end_to_end", "0"), ("generate_render_cache_hit", None)):
+                if cache_size is None:
+                    os.environ.pop("RENDER_CACHE_SIZE", None)
+                else:
+                    os.environ["RENDER_CACHE_SIZE"] = cache_size
+                reset_render_cache()
+
+                def generate(i, name=name):
+                    # 每次追加不同的编号，避免命中解析缓存
+                    response = client.post("/generate", json={"text": f"{text}\n记录编号：{name}-{i}"})
+                    assert response.status_code == 200, response.get_data(as_text=True)
+
+                results.append(summarize(name, profile, time_calls(generate, repeat)))
+        finally:
+            os.environ.pop("OLLAMA_URL", None)
+            os.environ.pop("RENDER_CACHE_SIZE", None)
+            reset_render_cache()
+    return results
+
+
+def compare(results, baseline, threshold: float) -> int:
+    """按p50对比两次结果，返回变慢超过阈值的项数"""
+    previous = {(item["name"], item["profile"]): item for item in baseline["results"]}
+    regressions = 0
+    print(f"\n{'项目':<22} {'档位':<8} {'之前p50':>10} {'现在p50':>10} {'变化':>8}")
+    for item in results:
+        old = previous.get((item["name"], item["profile"]))
+        if old is None:
+            continue
+        change = item["p50_ms"] / old["p50_ms"] - 1 if old["p50_ms"] else 0.0
+        flag = ""
+        if change > threshold:
+            regressions += 1
+            flag = "  <- 变慢"
+        print(f"{item['name']:<22} {item['profile']:<8} {old['p50_ms']:10.3f} {item['p50_ms']:10.3f} "
+              f"{change:+7.1%}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="会议记录生成基准测试套件")
+    parser.add_argument("--repeat", type=int, default=20, help="每项测量次数")
+    parser.add_argument("--profiles", nargs="+", default=list(PROFILES), choices=list(PROFILES), help="测试的规模档位")
+    parser.add_argument("--output", default="bench_results.json", help="结果JSON文件")
+    parser.add_argument("--compare", help="与之前保存的结果JSON对比")
+    parser.add_argument("--threshold", type=float, default=0.1, help="p50变慢超过该比例视为回退")
+    args = parser.parse_args()
+
+    results = []
+    for profile in args.profiles:
+        results += bench_profile(profile, args.repeat)
+        results += bench_end_to_end(profile, args.repeat)
+
+    print(f"{'项目':<22} {'档位':<8} {'p50(ms)':>10} {'p95(ms)':>10} {'mean(ms)':>10}")
+    for item in results:
+        print(f"{item['name']:<22} {item['profile']:<8} {item['p50_ms']:10.3f} {item['p95_ms']:10.3f} "
+              f"{item['mean_ms']:10.3f}")
+
+    report = {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "profiles": {name: PROFILES[name] for name in args.profiles},
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n结果已保存到 {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"{regressions}项变慢超过{args.threshold:.0%}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
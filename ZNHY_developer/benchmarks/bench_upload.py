@@ -0,0 +1,105 @@
+"""
+上传会议记录的基准测试：读取大文件时的耗时和内存峰值（tracemalloc）
+
+- txt：整体read()后decode（以及JSON请求体整体解析），对比从临时文件分块增量解码
+- docx：python-docx加载整个文档树后取段落文字，对比流式解析word/document.xml
+
+上传的文件事先写入临时文件（与超过UPLOAD_SPOOL_BYTES的上传一样），测量的是把文件转换为会议内容这一步。
+
+用法（在ZNHY_developer目录下运行）：
+    python -m benchmarks.bench_upload --size-mb 1 10
+"""
+
+import argparse
+import io
+import json
+import tempfile
+import time
+import tracemalloc
+import zipfile
+from xml.sax.saxutils import escape
+
+from docx import Document
+
+from benchmarks.transcripts import make_transcript
+from utils.upload_reader import iter_docx_paragraphs, read_text
+
+
+def make_text(size):
+    lines = []
+    total = 0
+    seed = 0
+    while total < size:
+        chunk = make_transcript(seed, remarks=50)
+        lines.append(chunk)
+        total += len(chunk.encode("utf-8"))
+        seed += 1
+    return "\n".join(lines)
+
+
+def make_docx(text):
+    """每行一段的docx；段落直接写入document.xml，逐段add_paragraph在几万段时太慢"""
+    buffer = io.BytesIO()
+    Document().save(buffer)
+    paragraphs = "".join(f'<w:p><w:r><w:t xml:space="preserve">{escape(line)}</w:t></w:r></w:p>'
+                         for line in text.splitlines())
+    output = io.BytesIO()
+    with zipfile.ZipFile(buffer) as source, zipfile.ZipFile(output, "w", zipfile.ZIP_DEFLATED) as target:
+        for item in source.infolist():
+            data = source.read(item.filename)
+            if item.filename == "word/document.xml":
+                xml = data.decode("utf-8")
+                index = xml.index("<w:sectPr")
+                data = (xml[:index] + paragraphs + xml[index:]).encode("utf-8")
+            target.writestr(item, data)
+    return output.getvalue()
+
+
+def spooled(data):
+    file = tempfile.TemporaryFile()
+    file.write(data)
+    return file
+
+
+def measure(fn, file):
+    """耗时和内存峰值分两次测量，tracemalloc会明显拖慢执行"""
+    file.seek(0)
+    start = time.perf_counter()
+    result = fn(file)
+    elapsed = (time.perf_counter() - start) * 1000
+    file.seek(0)
+    tracemalloc.start()
+    fn(file)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, len(result)
+
+
+def report(label, elapsed, peak, chars):
+    print(f"  {label:<22} {elapsed:9.0f}ms {peak / 1048576:9.1f}MB {chars:>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="上传会议记录的基准测试")
+    parser.add_argument("--size-mb", type=float, nargs="+", default=[1, 10], help="会议记录文本的大小（MB）")
+    args = parser.parse_args()
+
+    for size_mb in args.size_mb:
+        text = make_text(int(size_mb * 1048576))
+        raw = text.encode("utf-8")
+        body = json.dumps({"text": text}, ensure_ascii=False).encode("utf-8")
+        docx = make_docx(text)
+        print(f"\n文本{len(raw) / 1048576:.1f}MB，docx {len(docx) / 1048576:.1f}MB")
+        print(f"  {'方式':<22} {'耗时':>11} {'内存峰值':>9} {'字数':>10}")
+        with spooled(raw) as file:
+            report("txt 整体读取", *measure(lambda f: f.read().decode("utf-8"), file))
+            report("txt 分块增量解码", *measure(read_text, file))
+        with spooled(body) as file:
+            report("JSON请求体 整体解析", *measure(lambda f: json.loads(f.read())["text"], file))
+        with spooled(docx) as file:
+            report("docx python-docx", *measure(lambda f: "\n".join(p.text for p in Document(f).paragraphs), file))
+            report("docx 流式解析", *measure(lambda f: "\n".join(iter_docx_paragraphs(f)), file))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Word渲染基准测试：复制预构建骨架对比每次从空白模板构建
+
+用法（在ZNHY_developer目录下运行）：
+    python -m benchmarks.bench_word_generator
+"""
+
+import argparse
+import time
+import tracemalloc
+
+from docx import Document
+
+from utils.heuristic_extractor import extract_meeting_fields
+from utils.layout import get_layout
+from utils.word_generator import WordGenerator, get_document_skeleton
+
+SAMPLE = """会议主题：下季度产品推广方案
+会议时间：2023年10月15日 14:00-16:00
+会议地点：公司三楼大会议室
+参会人员：张三、李四、王五、赵六
+会议时长：约2小时
+议题：线上广告投放预算分配
+议题：新版APP研发进度
+会前准备事项：提前将会议资料发到群里
+"""
+
+
+def render_from_scratch(meeting_data):
+    """旧流程：每次打开空白模板，重新设置样式、标题和表格"""
+    return WordGenerator(get_layout("table").build(Document())).generate_document(meeting_data)
+
+
+def render_from_skeleton(meeting_data):
+    """新流程：复制骨架后只填入会议内容"""
+    return WordGenerator().generate_document(meeting_data)
+
+
+def measure(fn, meeting_data, repeat):
+    """返回(每次平均耗时毫秒, 单次渲染的内存分配峰值KB)"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(meeting_data)
+    elapsed = (time.perf_counter() - start) / repeat * 1000
+
+    tracemalloc.start()
+    fn(meeting_data)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Word渲染基准测试")
+    parser.add_argument("--repeat", type=int, default=50, help="每种方式渲染次数")
+    args = parser.parse_args()
+
+    meeting_data = extract_meeting_fields(SAMPLE)
+    # 骨架在服务启动后构建一次，不计入单次渲染
+    get_document_skeleton()
+    render_from_scratch(meeting_data)
+
+    print(f"{'方式':<12} {'平均耗时(ms)':>14} {'分配峰值(KB)':>14}")
+    results = {}
+    for name, fn in (("从空白模板构建", render_from_scratch), ("复制骨架", render_from_skeleton)):
+        results[name] = measure(fn, meeting_data, args.repeat)
+        elapsed, peak = results[name]
+        print(f"{name:<12} {elapsed:14.2f} {peak:14.0f}")
+    old, new = results["从空白模板构建"][0], results["复制骨架"][0]
+    print(f"加速比: {old / new:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
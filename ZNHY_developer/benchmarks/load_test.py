@@ -0,0 +1,129 @@
+"""
+按目标RPS压测会议记录生成服务，报告吞吐量和尾延迟
+
+压测已经启动的服务（例如配合 python -m benchmarks.stub_ollama 使用）：
+    python -m benchmarks.load_test --url http://127.0.0.1:5000 --rps 20 --duration 30
+
+在进程内同时启动Ollama桩服务和app，无需其他准备：
+    python -m benchmarks.load_test --self-host --rps 20 --duration 10 --stub-latency lognormal:300,0.5
+"""
+
+import argparse
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from benchmarks.bench_ollama_client import percentile
+from benchmarks.stub_ollama import StubOllamaServer
+from benchmarks.transcripts import make_transcript
+
+_local = threading.local()
+
+
+def _session():
+    # requests.Session不保证线程安全，每个线程使用自己的会话
+    if not hasattr(_local, "session"):
+        _local.session = requests.Session()
+    return _local.session
+
+
+def run_load(url, rps, duration, concurrency, texts, timeout):
+    """开环发送请求：按计划时间发出，延迟从计划时间算起，服务变慢时排队时间也计入
+
+    返回(每个请求的(状态, 延迟毫秒)列表, 实际耗时秒)
+    """
+    total = int(rps * duration)
+    results = []
+    lock = threading.Lock()
+
+    def send(index, scheduled):
+        try:
+            response = _session().post(url, json={"text": texts[index % len(texts)]}, timeout=timeout)
+            status = response.status_code
+        except requests.RequestException as e:
+            status = type(e).__name__
+        latency = (time.perf_counter() - scheduled) * 1000
+        with lock:
+            results.append((status, latency))
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="load") as pool:
+        for index in range(total):
+            scheduled = start + index / rps
+            wait = scheduled - time.perf_counter()
+            if wait > 0:
+                time.sleep(wait)
+            pool.submit(send, index, scheduled)
+    return results, time.perf_counter() - start
+
+
+def report(results, elapsed, rps):
+    statuses = Counter(status for status, _ in results)
+    latencies = [latency for status, latency in results if status == 200]
+    print(f"目标RPS: {rps:.1f}  发送: {len(results)}  耗时: {elapsed:.1f}s")
+    print(f"成功吞吐量: {len(latencies) / elapsed:.2f} req/s")
+    print("状态码: " + ", ".join(f"{status}={count}" for status, count in sorted(statuses.items(), key=str)))
+    if latencies:
+        print(f"延迟(ms): p50={percentile(latencies, 50):.1f}  p90={percentile(latencies, 90):.1f}  "
+              f"p99={percentile(latencies, 99):.1f}  max={max(latencies):.1f}")
+
+
+def _serve_app():
+    """在后台线程中启动app，返回(服务器, 基础地址)"""
+    from werkzeug.serving import make_server
+    from app import app
+
+    # 压测时不输出每个请求的访问日志
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="会议记录生成服务压测")
+    parser.add_argument("--url", default="http://127.0.0.1:5000", help="服务基础地址")
+    parser.add_argument("--endpoint", default="/generate", help="压测的接口路径")
+    parser.add_argument("--rps", type=float, default=10, help="目标每秒请求数")
+    parser.add_argument("--duration", type=float, default=10, help="持续时间（秒）")
+    parser.add_argument("--concurrency", type=int, default=64, help="最多同时在途的请求数")
+    parser.add_argument("--timeout", type=float, default=120, help="单个请求超时（秒）")
+    parser.add_argument("--distinct", type=int, default=1000, help="不同会议内容的数量，较小时更容易命中解析缓存")
+    parser.add_argument("--self-host", action="store_true", help="在进程内启动Ollama桩服务和app")
+    parser.add_argument("--stub-latency", default="lognormal:300,0.5", help="--self-host时桩服务的延迟分布")
+    parser.add_argument("--stub-error-rate", type=float, default=0.0, help="--self-host时桩服务返回500的比例")
+    parser.add_argument("--stub-junk-rate", type=float, default=0.0, help="--self-host时JSON外包裹多余文字的比例")
+    args = parser.parse_args()
+
+    texts = [make_transcript(seed, 2 + seed % 10, 1 + seed % 5, 10 + seed % 50) for seed in range(args.distinct)]
+
+    stub = app_server = None
+    base_url = args.url
+    if args.self_host:
+        stub = StubOllamaServer(latency=args.stub_latency, error_rate=args.stub_error_rate,
+                                junk_rate=args.stub_junk_rate, templated=True, seed=0).start()
+        os.environ["OLLAMA_URL"] = stub.url
+        app_server, base_url = _serve_app()
+
+    try:
+        results, elapsed = run_load(base_url + args.endpoint, args.rps, args.duration,
+                                    args.concurrency, texts, args.timeout)
+        report(results, elapsed, args.rps)
+        if stub:
+            print(f"桩服务: 收到{stub.request_count}个请求，其中{stub.error_count}个返回500")
+    finally:
+        if app_server:
+            app_server.shutdown()
+        if stub:
+            stub.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,337 @@
+"""
+本地Ollama桩服务，用于在没有GPU机器的情况下压测解析流程
+
+可以单独启动，代替真实的Ollama：
+    python -m benchmarks.stub_ollama --port 11434 --latency lognormal:800,0.4 --error-rate 0.05 --junk-rate 0.2
+"""
+
+import argparse
+import contextlib
+import json
+import math
+import os
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Optional
+
+# 默认返回的会议JSON（与提示词中的输出结构一致）
+DEFAULT_MEETING_JSON = {
+    "meeting_topic": "项目进度讨论",
+    "meeting_time": "今天下午3点",
+    "meeting_location": "会议室A",
+    "host": "张三",
+    "participants": ["张三", "李四", "王五"],
+    "participant_count": 3,
+    "meeting_duration": "约1小时",
+    "topics": [
+        {"title": "讨论项目当前进度", "leader": "张三", "preparation": "准备进度报告"}
+    ],
+    "pre_meeting_preparations": "提前准备相关资料"
+}
+
+
+# 小模型常见的多余输出：代码块包裹以及前后的说明文字
+JUNK_PREFIX = "好的，以下是从会议内容中提取的信息：\n```json\n"
+JUNK_SUFFIX = "\n```\n以上信息均来自会议内容，如有遗漏请补充。"
+
+
+def parse_latency(spec: str) -> Callable[[random.Random], float]:
+    """解析延迟分布，返回按分布采样的函数（单位：秒）
+
+    支持 fixed:MS、uniform:MIN_MS,MAX_MS、normal:MEAN_MS,STD_MS、lognormal:MEDIAN_MS,SIGMA
+    """
+    kind, _, args = spec.partition(":")
+    values = [float(v) for v in args.split(",")] if args else []
+    if kind == "fixed" and len(values) == 1:
+        return lambda rng: values[0] / 1000
+    if kind == "uniform" and len(values) == 2:
+        return lambda rng: rng.uniform(values[0], values[1]) / 1000
+    if kind == "normal" and len(values) == 2:
+        return lambda rng: max(0.0, rng.gauss(values[0], values[1])) / 1000
+    if kind == "lognormal" and len(values) == 2:
+        mu = math.log(values[0])
+        return lambda rng: rng.lognormvariate(mu, values[1]) / 1000
+    raise ValueError(f"无法识别的延迟分布: {spec}")
+
+
+def keep_alive_seconds(value) -> float:
+    """解析Ollama的keep_alive参数：秒数或"10m"、"1h"这样的时长，负数表示一直保持"""
+    if isinstance(value, (int, float)):
+        seconds = float(value)
+    else:
+        match = re.fullmatch(r"(-?\d+(?:\.\d+)?)([smh]?)", str(value).strip())
+        if match is None:
+            return 300.0
+        seconds = float(match.group(1)) * {"": 1, "s": 1, "m": 60, "h": 3600}[match.group(2)]
+    return math.inf if seconds < 0 else seconds
+
+
+def _prompt_text(prompt: str) -> str:
+    """从提示词中取出会议内容原文"""
+    start = prompt.find('会议内容："')
+    if start == -1:
+        return prompt
+    start += len('会议内容："')
+    end = prompt.find('"\n\n', start)
+    return prompt[start:end if end != -1 else len(prompt)]
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    # 使用HTTP/1.1，允许客户端复用连接
+    protocol_version = "HTTP/1.1"
+    # 响应头与响应体分两次写出，关闭Nagle算法避免长连接上的延迟确认等待
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        with self.server.stats_lock:
+            self.server.connection_count += 1
+
+    def handle(self):
+        try:
+            super().handle()
+        except (BrokenPipeError, ConnectionResetError):
+            # 客户端在流式响应中途断开或等待超时后，长连接上不会再有请求
+            pass
+
+    def do_GET(self):
+        # 断路器的健康探测
+        if self.server.outage:
+            self._send_json(503, {"error": "service unavailable"})
+            return
+        self._send_json(200, {"version": "0.0.0-stub"})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        payload = json.loads(self.rfile.read(length) or b"{}")
+        delay, failed, junk = self.server.roll()
+        if self.server.outage == "hang":
+            # 模拟过载：迟迟不响应，直到恢复或客户端超时断开
+            self.server.recovered.wait(60)
+        if self.server.outage:
+            self._send_json(503, {"error": "server overloaded"})
+            return
+        delay += self.server.prompt_delay(payload)
+        if delay:
+            # 模拟模型加载和首个token之前的等待，同时生成的请求数有上限时排队
+            with self.server.generate_slots:
+                time.sleep(delay)
+        if failed:
+            self._send_json(500, {"error": "llama runner process has terminated"})
+            return
+        text = json.dumps(self._meeting_json(payload), ensure_ascii=False)
+        if junk:
+            text = JUNK_PREFIX + text + JUNK_SUFFIX
+        text += self.server.trailing_text
+        if payload.get("stream", True):
+            self._stream(text)
+            return
+        self._send_json(200, {
+            "model": "qwen:1.8b",
+            "response": text,
+            "done": True
+        })
+
+    def _meeting_json(self, payload):
+        """固定返回meeting_json；templated模式下根据提示词中的会议内容生成"""
+        if not self.server.templated:
+            return self.server.meeting_json
+        from utils.heuristic_extractor import extract_meeting_fields
+        return extract_meeting_fields(_prompt_text(payload.get("prompt", "")))
+
+    def _send_json(self, status, obj):
+        body = json.dumps(obj, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _stream(self, text):
+        """按NDJSON分块返回，模拟Ollama逐token输出"""
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        size = self.server.chunk_chars
+        try:
+            for i in range(0, len(text), size):
+                self._write_chunk({"model": "qwen:1.8b", "response": text[i:i + size], "done": False})
+                with self.server.stats_lock:
+                    self.server.chunks_sent += 1
+                if self.server.chunk_delay:
+                    time.sleep(self.server.chunk_delay)
+            self._write_chunk({"model": "qwen:1.8b", "response": "", "done": True})
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            # 客户端提前断开，停止生成
+            self.close_connection = True
+
+    def _write_chunk(self, obj):
+        data = (json.dumps(obj, ensure_ascii=False) + "\n").encode("utf-8")
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+
+    def log_message(self, format, *args):
+        # 压测时不输出访问日志
+        pass
+
+
+class StubOllamaServer:
+    """在后台线程中运行的Ollama桩服务，可作为上下文管理器使用"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, meeting_json=None,
+                 trailing_text: str = "", chunk_chars: int = 8, chunk_delay: float = 0.0,
+                 latency: Optional[str] = None, error_rate: float = 0.0, junk_rate: float = 0.0,
+                 templated: bool = False, seed: Optional[int] = None, latency_per_kchar: float = 0.0,
+                 prefix_cache: bool = False, load_ms: float = 0.0, parallel: int = 0):
+        self.httpd = ThreadingHTTPServer((host, port), _StubHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.meeting_json = meeting_json or DEFAULT_MEETING_JSON
+        # JSON之后追加的多余输出，模拟小模型在闭合括号后继续说话
+        self.httpd.trailing_text = trailing_text
+        # 流式模式下每个片段的字符数及片段之间的间隔（秒）
+        self.httpd.chunk_chars = chunk_chars
+        self.httpd.chunk_delay = chunk_delay
+        # templated时按提示词中的会议内容生成JSON，而不是固定返回meeting_json
+        self.httpd.templated = templated
+        # 每处理1000个提示词字符增加的延迟（毫秒）
+        self._latency_per_kchar = latency_per_kchar
+        # prefix_cache时与上一个请求相同的提示词前缀不再计入延迟，近似Ollama复用已计算的前缀
+        self._prefix_cache = prefix_cache
+        self._last_prompt = ""
+        # 模型未加载（首次请求或空闲超过keep_alive）时额外的加载时间（毫秒）
+        self._load_ms = load_ms
+        self._loaded_until = 0.0
+        # 模拟故障：None正常，"error"立即返回503，"hang"挂起生成请求直到恢复
+        self.httpd.outage = None
+        self.httpd.recovered = threading.Event()
+        # 同时生成的请求数上限（对应OLLAMA_NUM_PARALLEL），0表示不限制
+        self.httpd.generate_slots = threading.Semaphore(parallel) if parallel > 0 else contextlib.nullcontext()
+        self.httpd.prompt_delay = self._prompt_delay
+        self.httpd.roll = self._roll
+        self._latency = parse_latency(latency) if latency else None
+        self._error_rate = error_rate
+        self._junk_rate = junk_rate
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self.httpd.request_count = 0
+        self.httpd.error_count = 0
+        self.httpd.chunks_sent = 0
+        self.httpd.connection_count = 0
+        self.httpd.stats_lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        """/api/generate 的完整地址"""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/api/generate"
+
+    def set_outage(self, mode: Optional[str]):
+        """开始（"error"或"hang"）或结束（None）模拟故障"""
+        if mode not in (None, "error", "hang"):
+            raise ValueError(f"无法识别的故障模式: {mode}")
+        self.httpd.outage = mode
+        if mode is None:
+            self.httpd.recovered.set()
+        else:
+            self.httpd.recovered.clear()
+
+    def _roll(self):
+        """为一次请求抽取(延迟秒数, 是否返回错误, 是否包裹多余文字)"""
+        with self._rng_lock:
+            delay = self._latency(self._rng) if self._latency else 0.0
+            failed = self._rng.random() < self._error_rate
+            junk = self._rng.random() < self._junk_rate
+            self.httpd.request_count += 1
+            self.httpd.error_count += failed
+        return delay, failed, junk
+
+    def _prompt_delay(self, payload) -> float:
+        """按需要处理的提示词长度和模型是否已加载计算首个token前的延迟（秒）"""
+        full = payload.get("system", "") + payload.get("prompt", "")
+        delay = 0.0
+        with self._rng_lock:
+            now = time.monotonic()
+            if self._load_ms and now >= self._loaded_until:
+                # 重新加载模型后之前计算的前缀也不再可用
+                delay += self._load_ms / 1000
+                self._last_prompt = ""
+            self._loaded_until = now + delay + keep_alive_seconds(payload.get("keep_alive", "5m"))
+            cached = len(os.path.commonprefix([self._last_prompt, full])) if self._prefix_cache else 0
+            self._last_prompt = full
+        return delay + (len(full) - cached) / 1000 * self._latency_per_kchar / 1000
+
+    @property
+    def request_count(self) -> int:
+        """收到的生成请求总数"""
+        return self.httpd.request_count
+
+    @property
+    def error_count(self) -> int:
+        """按error_rate返回500的请求数"""
+        return self.httpd.error_count
+
+    @property
+    def connection_count(self) -> int:
+        """服务端接受的TCP连接总数"""
+        return self.httpd.connection_count
+
+    @property
+    def chunks_sent(self) -> int:
+        """流式模式下已发送的片段总数"""
+        return self.httpd.chunks_sent
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        # 放开挂起的请求
+        self.httpd.recovered.set()
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="本地Ollama桩服务")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11434)
+    parser.add_argument("--latency", help="首个token前的延迟分布，如 fixed:200、lognormal:800,0.4")
+    parser.add_argument("--latency-per-kchar", type=float, default=0.0, help="每1000个提示词字符额外增加的延迟（毫秒）")
+    parser.add_argument("--prefix-cache", action="store_true", help="与上一个请求相同的提示词前缀不计入延迟")
+    parser.add_argument("--load-ms", type=float, default=0.0, help="模型未加载时的加载时间（毫秒）")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="返回500的比例")
+    parser.add_argument("--junk-rate", type=float, default=0.0, help="JSON外包裹多余文字的比例")
+    parser.add_argument("--chunk-delay", type=float, default=0.0, help="流式模式下片段之间的间隔（秒）")
+    parser.add_argument("--fixed", action="store_true", help="总是返回固定的会议JSON，而不是根据会议内容生成")
+    parser.add_argument("--seed", type=int, help="随机种子")
+    parser.add_argument("--parallel", type=int, default=0, help="同时生成的请求数上限，0表示不限制")
+    args = parser.parse_args()
+
+    server = StubOllamaServer(args.host, args.port, chunk_delay=args.chunk_delay, latency=args.latency,
+                              error_rate=args.error_rate, junk_rate=args.junk_rate,
+                              templated=not args.fixed, seed=args.seed,
+                              latency_per_kchar=args.latency_per_kchar, prefix_cache=args.prefix_cache,
+                              load_ms=args.load_ms, parallel=args.parallel)
+    print(f"Ollama桩服务已启动: {server.url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
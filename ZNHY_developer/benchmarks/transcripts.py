@@ -0,0 +1,90 @@
+"""
+合成中文会议记录，用于基准测试和压测
+
+同一个种子总是生成相同的文本，不同版本的测试结果可以直接比较。
+"""
+
+import json
+import random
+from typing import Any, Dict, List
+
+SURNAMES = "张李王赵刘陈杨黄周吴徐孙马朱胡郭何高林罗"
+GIVEN_NAMES = ["伟", "芳", "娜", "敏", "静", "磊", "洋", "勇", "艳", "杰", "涛", "明", "超", "晓雨", "建国", "志强"]
+PLACES = ["公司三楼大会议室", "会议室12", "线上会议", "二楼培训室", "总部报告厅"]
+SUBJECTS = ["下季度产品推广方案", "新版APP研发进度", "年度预算复盘", "客户满意度调查", "供应链优化", "团建活动安排"]
+REMARKS = [
+    "{name}汇报了本周的进展，整体符合预期。",
+    "{name}提出需要协调更多测试资源，否则上线时间可能推迟。",
+    "大家讨论了{subject}的风险，{name}负责跟进。",
+    "{name}补充说明了上一次会议遗留问题的处理情况。",
+    "关于{subject}，{name}建议下周再开一次专项会议确认细节。",
+]
+
+
+def make_names(rng: random.Random, count: int) -> List[str]:
+    """生成count个不重复的中文姓名"""
+    names = []
+    while len(names) < count:
+        name = rng.choice(SURNAMES) + rng.choice(GIVEN_NAMES)
+        if name not in names:
+            names.append(name)
+    return names
+
+
+def make_meeting(seed: int = 0, participants: int = 4, topics: int = 3) -> Dict[str, Any]:
+    """生成结构化的会议信息（与大模型输出的JSON结构一致）"""
+    rng = random.Random(seed)
+    names = make_names(rng, participants)
+    return {
+        "meeting_topic": rng.choice(SUBJECTS),
+        "meeting_time": f"2024年{rng.randint(1, 12)}月{rng.randint(1, 28)}日下午{rng.randint(1, 5)}点",
+        "meeting_location": rng.choice(PLACES),
+        "host": names[0],
+        "participants": names,
+        "participant_count": len(names),
+        "meeting_duration": f"约{rng.randint(1, 3)}小时",
+        "topics": [{
+            "title": f"{rng.choice(SUBJECTS)}（第{i}项）",
+            "leader": rng.choice(names),
+            "preparation": "准备相关数据"
+        } for i in range(1, topics + 1)],
+        "pre_meeting_preparations": "提前将会议资料发到群里"
+    }
+
+
+def make_transcript(seed: int = 0, participants: int = 4, topics: int = 3, remarks: int = 10) -> str:
+    """生成会议记录文本：字段行 + 议题 + remarks条发言记录"""
+    meeting = make_meeting(seed, participants, topics)
+    rng = random.Random(seed + 1)
+    lines = [
+        f"会议主题：{meeting['meeting_topic']}",
+        f"会议时间：{meeting['meeting_time']}",
+        f"会议地点：{meeting['meeting_location']}",
+        f"主持人：{meeting['host']}",
+        f"参会人员：{'、'.join(meeting['participants'])}",
+        f"会议时长：{meeting['meeting_duration']}",
+        "",
+    ]
+    lines += [f"议题：{topic['title']}" for topic in meeting["topics"]]
+    lines.append("")
+    for _ in range(remarks):
+        template = rng.choice(REMARKS)
+        lines.append(template.format(name=rng.choice(meeting["participants"]), subject=rng.choice(SUBJECTS)))
+    lines.append(f"会前准备事项：{meeting['pre_meeting_preparations']}")
+    return "\n".join(lines)
+
+
+def make_llm_response(seed: int = 0, participants: int = 4, topics: int = 3, wrapped: bool = True) -> str:
+    """生成大模型的原始响应，wrapped时带上markdown代码块和多余的说明文字"""
+    text = json.dumps(make_meeting(seed, participants, topics), ensure_ascii=False, indent=2)
+    if wrapped:
+        text = f"以下是提取结果：\n```json\n{text}\n```\n如有遗漏请补充。"
+    return text
+
+
+# 基准测试使用的规模档位：(参会人数, 议题数, 发言条数)
+PROFILES = {
+    "small": (3, 2, 5),
+    "medium": (8, 10, 100),
+    "large": (20, 50, 2000),
+}
@@ -0,0 +1,53 @@
+import os
+
+
+class Config:
+    """应用配置，create_app通过app.config.from_object加载
+
+    默认值从环境变量读取；实例化时读取，测试中修改环境变量后重新创建即可生效。
+    """
+
+    DEBUG = False
+
+    def __init__(self, **overrides):
+        # 后台任务池：限制同时进行的大模型解析和文档渲染数量
+        # 任务保存在进程内存中，只能由提交任务的进程查询和下载（gunicorn默认只用一个进程，见gunicorn.conf.py）
+        self.JOB_WORKERS = int(os.environ.get('JOB_WORKERS', 4))
+        self.JOB_MAX_PENDING = int(os.environ.get('JOB_MAX_PENDING', 32))
+        self.JOB_RETENTION = float(os.environ.get('JOB_RETENTION', 600))
+        # 保留期内最多保留的已结束任务数和结果字节数，超出时最早结束的任务提前清理
+        self.JOB_MAX_RETAINED = int(os.environ.get('JOB_MAX_RETAINED', 256))
+        self.JOB_MAX_RETAINED_BYTES = int(os.environ.get('JOB_MAX_RETAINED_BYTES', 64 * 1024 * 1024))
+        # 同步接口等待任务完成的最长时间（秒）
+        self.JOB_SYNC_TIMEOUT = float(os.environ.get('JOB_SYNC_TIMEOUT', 120))
+        # 批量生成：单批最多条数及同时提交到任务池的数量
+        self.BATCH_MAX_ITEMS = int(os.environ.get('BATCH_MAX_ITEMS', 200))
+        self.BATCH_CONCURRENCY = int(os.environ.get('BATCH_CONCURRENCY', 4))
+        # 请求体（JSON或上传的会议记录文件）的字节数上限，超出时返回413
+        self.MAX_CONTENT_LENGTH = int(os.environ.get('MAX_CONTENT_LENGTH', 16 * 1024 * 1024))
+        # 上传的文件超过该字节数后写入临时文件
+        self.UPLOAD_SPOOL_BYTES = int(os.environ.get('UPLOAD_SPOOL_BYTES', 512 * 1024))
+        # 从上传的文件中读出的会议内容字数上限，以及docx中document.xml解压后的字节数上限，超出时返回413
+        self.UPLOAD_MAX_CHARS = int(os.environ.get('UPLOAD_MAX_CHARS', 8 * 1024 * 1024))
+        self.UPLOAD_MAX_XML_BYTES = int(os.environ.get('UPLOAD_MAX_XML_BYTES', 128 * 1024 * 1024))
+        # 启动预热：async在后台线程中进行，sync在create_app返回前完成，off不预热
+        self.WARMUP = os.environ.get('APP_WARMUP', 'async')
+        # 预热时是否调用Ollama加载模型和system提示词
+        self.OLLAMA_WARMUP = os.environ.get('OLLAMA_WARMUP', '1') == '1'
+        for name, value in overrides.items():
+            setattr(self, name, value)
+
+
+class DevelopmentConfig(Config):
+    """python app.py使用的开发配置"""
+
+    DEBUG = True
+
+
+class ProductionConfig(Config):
+    """wsgi.py使用的生产配置：预热在主进程中同步完成，fork出的工作进程直接继承"""
+
+    def __init__(self, **overrides):
+        super().__init__(**overrides)
+        if 'WARMUP' not in overrides and 'APP_WARMUP' not in os.environ:
+            self.WARMUP = 'sync'
@@ -0,0 +1,22 @@
+"""
+gunicorn配置：gunicorn -c gunicorn.conf.py wsgi:app
+"""
+
+import os
+
+bind = os.environ.get('BIND', '0.0.0.0:5000')
+# 任务（/jobs）、/metrics和文档缓存都保存在进程内，多个进程时查询和下载任务会落到没有该任务的进程上返回404，
+# 因此默认只用一个进程；大模型解析是IO等待，由多个线程并发处理
+workers = int(os.environ.get('WEB_CONCURRENCY', 1))
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 16))
+# 在主进程中导入应用并完成预热，fork出的工作进程直接继承
+preload_app = True
+# /generate最多等待JOB_SYNC_TIMEOUT秒
+timeout = int(float(os.environ.get('JOB_SYNC_TIMEOUT', 120))) + 30
+
+
+def post_fork(server, worker):
+    # 主进程中打开的Ollama长连接和SQLite连接不能在多个工作进程之间共用
+    from app import reset_after_fork
+    reset_after_fork()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+测试应用工厂、配置对象、启动预热和延迟导入
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+
+from app import create_app, reset_after_fork, warmup
+from benchmarks.stub_ollama import StubOllamaServer
+from config import Config, ProductionConfig
+from utils import llm_cache
+from utils.render_cache import get_render_cache
+
+
+def test_config_from_env_and_overrides():
+    """配置默认读取环境变量，关键字参数优先"""
+    old = os.environ.get("JOB_WORKERS")
+    os.environ["JOB_WORKERS"] = "7"
+    try:
+        assert Config().JOB_WORKERS == 7
+        assert Config(JOB_WORKERS=2).JOB_WORKERS == 2
+    finally:
+        if old is None:
+            os.environ.pop("JOB_WORKERS")
+        else:
+            os.environ["JOB_WORKERS"] = old
+    assert Config(WARMUP="off").WARMUP == "off"
+    if "APP_WARMUP" not in os.environ:
+        assert ProductionConfig().WARMUP == "sync" and not ProductionConfig.DEBUG
+    print("✓ 配置读取")
+
+
+def test_create_app():
+    """每次调用创建独立的应用和任务池，配置生效"""
+    first = create_app(Config(WARMUP="off", JOB_WORKERS=2, BATCH_MAX_ITEMS=1))
+    second = create_app(Config(WARMUP="off"))
+    assert first.extensions["meeting_jobs"] is not second.extensions["meeting_jobs"]
+    assert first.extensions["meeting_jobs"].max_workers == 2
+    client = first.test_client()
+    assert client.get("/").status_code == 200
+    assert client.get("/metrics").status_code == 200
+    response = client.post("/generate/batch", json={"items": ["a", "b"]})
+    assert response.status_code == 400 and "1" in response.get_json()["error"]
+    print("✓ 应用工厂")
+
+
+def test_warmup_steps():
+    """预热编译模板并加载docx骨架，关闭OLLAMA_WARMUP时不调用Ollama"""
+    app = create_app(Config(WARMUP="off", OLLAMA_WARMUP=False))
+    timings = warmup(app)
+    assert set(timings) == {"templates", "docx"}
+    assert any(name == "index.html" for _, name in app.jinja_env.cache.keys())
+    print("✓ 启动预热")
+
+
+def test_sync_warmup_closes_connections():
+    """同步预热在fork之前关闭打开的缓存数据库连接；reset_after_fork丢弃进程内共享的连接和缓存"""
+    with tempfile.TemporaryDirectory() as tmp, StubOllamaServer() as server:
+        os.environ["OLLAMA_URL"] = server.url
+        os.environ["LLM_CACHE_PATH"] = os.path.join(tmp, "cache.db")
+        reset_after_fork()
+        try:
+            create_app(Config(WARMUP="sync", OLLAMA_WARMUP=True))
+            assert server.request_count == 1
+            assert llm_cache._shared_cache is None, "主进程中不保留打开的缓存数据库连接"
+
+            cache = llm_cache.get_response_cache()
+            render_cache = get_render_cache()
+            assert cache._db is not None
+            reset_after_fork()
+            assert cache._db is None and llm_cache.get_response_cache() is not cache
+            assert get_render_cache() is not render_cache
+        finally:
+            os.environ.pop("OLLAMA_URL")
+            os.environ.pop("LLM_CACHE_PATH")
+            reset_after_fork()
+    print("✓ 同步预热后关闭连接")
+
+
+def test_lazy_imports():
+    """只导入app模块时不加载python-docx和requests"""
+    code = ("import sys, app; "
+            "print(all(name not in sys.modules for name in ('docx', 'requests', 'utils.llm_parser'))); "
+            "print(hasattr(app, 'app'))")
+    env = dict(os.environ, APP_WARMUP="off", OLLAMA_WARMUP="0")
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                            env=env, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.split()
+    assert output == ["True", "True"], output
+    print("✓ 延迟导入")
+
+
+def main():
+    print("=== 应用工厂测试 ===")
+    test_config_from_env_and_overrides()
+    test_create_app()
+    test_warmup_steps()
+    test_sync_warmup_closes_connections()
+    test_lazy_imports()
+    print("\n✅ 测试通过")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
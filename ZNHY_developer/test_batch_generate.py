@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+测试批量生成接口返回的流式ZIP
+"""
+
+import io
+import json
+import os
+import sys
+import zipfile
+
+from benchmarks.stub_ollama import StubOllamaServer
+from utils.zip_stream import ZipStream
+
+
+def test_zip_stream_roundtrip():
+    """流式写出的ZIP可以被正常读取"""
+    stream = ZipStream()
+    data = stream.add("a.txt", b"hello") + stream.add("会议/b.txt", "你好".encode("utf-8")) + stream.close()
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        assert archive.read("a.txt") == b"hello"
+        assert archive.read("会议/b.txt").decode("utf-8") == "你好"
+    print("✓ 流式ZIP可以正常解压")
+
+
+def test_batch_endpoint():
+    """批量接口逐条生成文档，失败条目记录在manifest中"""
+    with StubOllamaServer() as server:
+        os.environ["OLLAMA_URL"] = server.url
+        from app import app
+        client = app.test_client()
+        items = [
+            {"name": "周会", "text": "会议主题：周会\n参会人员：张三、李四"},
+            {"name": "空内容", "text": ""},
+            "会议主题：项目评审\n参会人员：王五、赵六"
+        ]
+        response = client.post("/generate/batch", json={"items": items})
+        assert response.status_code == 200
+        assert response.mimetype == "application/zip"
+        os.environ.pop("OLLAMA_URL")
+
+    with zipfile.ZipFile(io.BytesIO(response.data)) as archive:
+        manifest = json.loads(archive.read("manifest.json"))["items"]
+        assert [item["status"] for item in manifest] == ["ok", "failed", "ok"]
+        assert manifest[0]["file"] == "001_周会.docx"
+        for item in manifest:
+            if item["status"] == "ok":
+                assert archive.read(item["file"])[:2] == b"PK"
+
+    assert client.post("/generate/batch", json={"items": []}).status_code == 400
+    print("✓ 批量生成返回ZIP，失败条目写入manifest")
+
+
+def test_batch_uses_job_pool():
+    """批量条目通过任务池生成：任务池排队已满时等待而不是失败，完成后不再保留任务"""
+    from app import create_app
+    from config import Config
+
+    with StubOllamaServer() as server:
+        os.environ["OLLAMA_URL"] = server.url
+        try:
+            app = create_app(Config(WARMUP="off", JOB_WORKERS=1, JOB_MAX_PENDING=0, BATCH_CONCURRENCY=3))
+            items = [f"会议主题：第{i}次周会\n参会人员：张三、李四" for i in range(5)]
+            response = app.test_client().post("/generate/batch", json={"items": items})
+            data = response.data
+        finally:
+            os.environ.pop("OLLAMA_URL")
+
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        manifest = json.loads(archive.read("manifest.json"))["items"]
+    assert [item["status"] for item in manifest] == ["ok"] * 5, manifest
+    assert not app.extensions["meeting_jobs"]._jobs
+    print("✓ 批量条目共用任务池，排队已满时等待")
+
+
+def main():
+    print("=== 批量生成测试 ===")
+    test_zip_stream_roundtrip()
+    test_batch_endpoint()
+    test_batch_uses_job_pool()
+    print("\n✅ 测试通过")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
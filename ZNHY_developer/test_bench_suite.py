@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+测试合成会议记录生成器和基准测试套件的结果格式
+"""
+
+import sys
+
+from benchmarks.bench_suite import bench_profile, compare
+from benchmarks.transcripts import make_meeting, make_transcript
+from utils.heuristic_extractor import extract_meeting_fields
+
+
+def test_transcript_deterministic():
+    """同一种子生成相同文本，字段可以被启发式提取"""
+    assert make_transcript(7, 5, 4, 20) == make_transcript(7, 5, 4, 20)
+    meeting = make_meeting(7, 5, 4)
+    extracted = extract_meeting_fields(make_transcript(7, 5, 4, 20))
+    assert extracted["participants"] == meeting["participants"]
+    assert extracted["meeting_topic"] == meeting["meeting_topic"]
+    assert len(extracted["topics"]) == 4
+    print("✓ 合成会议记录可复现")
+
+
+def test_results_and_compare():
+    """每项结果包含统计字段，变慢超过阈值时被识别"""
+    results = bench_profile("small", 2)
+    assert {item["name"] for item in results} == {"parse_response", "get_mock_data", "word_generator", "meeting_template"}
+    assert all(item["runs"] == 2 and item["p50_ms"] > 0 for item in results)
+    baseline = {"results": [dict(item, p50_ms=item["p50_ms"] / 2) for item in results]}
+    assert compare(results, baseline, 0.1) == len(results)
+    assert compare(results, {"results": results}, 0.1) == 0
+    print("✓ 结果格式正确，可以识别性能回退")
+
+
+def main():
+    print("=== 基准测试套件测试 ===")
+    test_transcript_deterministic()
+    test_results_and_compare()
+    print("\n✅ 测试通过")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+测试长会议记录的分片切分、并发解析与结果合并
+"""
+
+import sys
+import time
+
+from benchmarks.stub_ollama import StubOllamaServer
+from benchmarks.transcripts import make_meeting, make_transcript
+from utils.llm_cache import LLMResponseCache
+from utils.llm_parser import MeetingParser
+from utils.ollama_client import OllamaClient
+from utils.transcript_chunker import merge_partial_results, split_transcript
+
+
+def _parser(server, chunk_chars):
+    parser = MeetingParser(client=OllamaClient(), cache=LLMResponseCache(max_entries=0), chunk_chars=chunk_chars)
+    parser.ollama_url = server.url
+    return parser
+
+
+def test_split_transcript():
+    """优先按行切分，超长的行按句子切分，拼接后与原文相同"""
+    text = make_transcript(1, 6, 4, 200)
+    chunks = split_transcript(text, 500)
+    assert len(chunks) > 1 and all(len(chunk) <= 500 for chunk in chunks)
+    assert "".join(chunks) == text
+    assert all(chunk.endswith("\n") for chunk in chunks[:-1])
+
+    long_line = "张三说：" + "我们需要加快进度。" * 100
+    chunks = split_transcript(long_line, 100)
+    assert "".join(chunks) == long_line
+    assert all(len(chunk) <= 100 for chunk in chunks)
+    assert all(chunk.endswith("。") for chunk in chunks[:-1])
+    assert split_transcript("短文本", 100) == ["短文本"]
+    print("✓ 按行和句子边界切分")
+
+
+def test_merge_partial_results():
+    """字段取第一个非空值，参会人员和议题去重，保留主持人"""
+    merged = merge_partial_results([
+        {"meeting_topic": "季度复盘", "host": "张三", "participants": ["张三", "李四"],
+         "topics": [{"title": "预算", "leader": ""}], "pre_meeting_preparations": "准备报表"},
+        {"meeting_topic": "", "host": "李四", "meeting_location": "会议室A",
+         "participants": [{"name": "李四"}, "王五"],
+         "topics": [{"title": " 预算 ", "leader": "王五"}, {"title": "招聘"}],
+         "pre_meeting_preparations": "准备报表"},
+    ])
+    assert merged["meeting_topic"] == "季度复盘"
+    assert merged["host"] == "张三"
+    assert merged["meeting_location"] == "会议室A"
+    assert merged["participants"] == ["张三", "李四", "王五"]
+    assert merged["topics"] == [{"title": "预算", "leader": "王五"}, {"title": "招聘"}]
+    assert merged["pre_meeting_preparations"] == "准备报表"
+    print("✓ 片段结果合并去重")
+
+
+def test_chunked_parse_concurrent():
+    """分片并发调用大模型，耗时接近单个片段"""
+    text = make_transcript(2, 5, 3, 120)
+    meeting = make_meeting(2, 5, 3)
+    with StubOllamaServer(templated=True, latency="fixed:300") as server:
+        parser = _parser(server, 1000)
+        start = time.perf_counter()
+        result = parser.parse_meeting_text(text)
+        elapsed = time.perf_counter() - start
+        chunks = len(split_transcript(text, 1000))
+        assert 1 < chunks <= 4 and server.request_count == chunks
+        assert elapsed < 0.3 * chunks - 0.1
+    assert not parser.used_fallback
+    assert result["host"] == meeting["host"]
+    assert result["meeting_topic"] == meeting["meeting_topic"]
+    assert result["participants"][:5] == meeting["participants"]
+    assert result["participant_count"] == len(set(result["participants"]))
+    print("✓ 分片并发解析并合并结果")
+
+
+def test_all_chunks_fail():
+    """所有片段都失败时退回模拟数据"""
+    with StubOllamaServer(error_rate=1.0) as server:
+        parser = _parser(server, 300)
+        result = parser.parse_meeting_text(make_transcript(3, 4, 2, 30))
+    assert parser.used_fallback
+    assert result["participants"] == make_meeting(3, 4, 2)["participants"]
+    print("✓ 全部失败时退回模拟数据")
+
+
+def main():
+    print("=== 分片解析测试 ===")
+    test_split_transcript()
+    test_merge_partial_results()
+    test_chunked_parse_concurrent()
+    test_all_chunks_fail()
+    print("\n✅ 测试通过")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
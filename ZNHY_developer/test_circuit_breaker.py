@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+测试Ollama断路器：连续失败后打开、打开期间快速退回、探测恢复后关闭
+"""
+
+import sys
+import time
+
+import requests
+
+from benchmarks.stub_ollama import StubOllamaServer
+from utils.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError, is_backend_failure
+from utils.llm_cache import LLMResponseCache
+from utils.llm_parser import MeetingParser
+from utils.metrics import FALLBACK_TOTAL
+from utils.ollama_client import OllamaClient
+
+
+def _http_error(status):
+    response = requests.Response()
+    response.status_code = status
+    return requests.HTTPError(response=response)
+
+
+def test_failure_classification():
+    """连接错误、超时和5xx算作后端故障，4xx和其他异常不算"""
+    assert is_backend_failure(requests.ConnectionError())
+    assert is_backend_failure(requests.Timeout())
+    assert is_backend_failure(_http_error(503))
+    assert not is_backend_failure(_http_error(404))
+    assert not is_backend_failure(ValueError())
+    print("✓ 故障分类")
+
+
+def test_state_transitions():
+    """closed -> open -> half_open -> closed，half_open只放行一个试探请求"""
+    healthy = []
+    breaker = CircuitBreaker(failure_threshold=2, probe_interval=0.05, probe=lambda: bool(healthy))
+    breaker.record_failure()
+    assert breaker.state == CLOSED and breaker.allow_request()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CLOSED, "成功后重新计数"
+    breaker.record_failure()
+    assert breaker.state == OPEN and not breaker.allow_request()
+
+    time.sleep(0.15)
+    assert breaker.state == OPEN, "探测失败时保持打开"
+    healthy.append(True)
+    deadline = time.time() + 2
+    while breaker.state != HALF_OPEN and time.time() < deadline:
+        time.sleep(0.01)
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow_request() and not breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == OPEN, "试探失败后重新打开"
+
+    deadline = time.time() + 2
+    while breaker.state != HALF_OPEN and time.time() < deadline:
+        time.sleep(0.01)
+    assert breaker.allow_request()
+    breaker.record_success()
+    assert breaker.state == CLOSED and breaker.wait_closed(0)
+    print("✓ 状态转换")
+
+
+def test_guard():
+    breaker = CircuitBreaker(failure_threshold=1, probe_interval=60)
+    try:
+        with breaker.guard():
+            raise ValueError("响应格式错误")
+    except ValueError:
+        pass
+    assert breaker.state == CLOSED
+    try:
+        with breaker.guard():
+            raise requests.ConnectionError()
+    except requests.ConnectionError:
+        pass
+    assert breaker.state == OPEN
+    try:
+        with breaker.guard():
+            raise AssertionError("断路器打开时不应执行调用")
+    except CircuitOpenError:
+        pass
+    disabled = CircuitBreaker(failure_threshold=0)
+    for _ in range(3):
+        disabled.record_failure()
+    assert disabled.state == CLOSED and disabled.allow_request()
+    print("✓ guard和关闭断路器")
+
+
+def test_parser_fast_fallback():
+    """后端挂起时打开断路器，之后的请求不再等待超时；恢复后重新使用大模型"""
+    with StubOllamaServer(templated=True) as server:
+        client = OllamaClient(read_timeout=0.5)
+        version_url = server.url.replace("/api/generate", "/api/version")
+        breaker = CircuitBreaker(failure_threshold=2, probe_interval=0.05, probe=lambda: client.get(version_url).ok)
+        parser = MeetingParser(client=client, cache=LLMResponseCache(max_entries=0), breaker=breaker)
+        parser.ollama_url = server.url
+
+        server.set_outage("hang")
+        for i in range(2):
+            parser.parse_meeting_text(f"会议主题：周会{i}\n主持人：张三")
+            assert parser.used_fallback
+        assert breaker.state == OPEN
+        before = FALLBACK_TOTAL.value(reason="circuit_open")
+        requests_before = server.request_count
+        start = time.perf_counter()
+        result = parser.parse_meeting_text("会议主题：周会9\n主持人：张三")
+        assert time.perf_counter() - start < 0.1
+        assert parser.used_fallback and result["participants"]
+        assert FALLBACK_TOTAL.value(reason="circuit_open") == before + 1
+        assert server.request_count == requests_before
+
+        server.set_outage(None)
+        deadline = time.time() + 2
+        while breaker.state == OPEN and time.time() < deadline:
+            time.sleep(0.01)
+        parser.parse_meeting_text("会议主题：周会10\n主持人：张三")
+        assert not parser.used_fallback and breaker.state == CLOSED
+    print("✓ 断路器打开时快速退回，恢复后关闭")
+
+
+def main():
+    print("=== 断路器测试 ===")
+    test_failure_classification()
+    test_state_transitions()
+    test_guard()
+    test_parser_fast_fallback()
+    print("\n✅ 测试通过")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
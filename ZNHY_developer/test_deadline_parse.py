@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+测试带截止时间的解析：大模型超时先返回启发式提取的临时结果，后台完成后再次获取得到完整结果
+"""
+
+import io
+import json
+import os
+import sys
+import time
+import uuid
+import zipfile
+
+from benchmarks.stub_ollama import StubOllamaServer
+from utils import llm_parser
+from utils.llm_cache import LLMResponseCache
+from utils.llm_parser import BoundedExecutor, MeetingParser
+from utils.metrics import FALLBACK_TOTAL
+from utils.ollama_client import OllamaClient
+
+
+def _text():
+    # 每个用例使用不同的会议内容，避免命中其他用例的缓存
+    return f"会议主题：周会{uuid.uuid4().hex[:6]}\n主持人：张三\n参会人员：李四、王五"
+
+
+def _wait_until(condition, timeout=5.0):
+    end = time.monotonic() + timeout
+    while time.monotonic() < end:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def test_deadline_returns_provisional():
+    """大模型超过截止时间时立即返回临时结果，后台解析完成后写入缓存"""
+    text = _text()
+    with StubOllamaServer(templated=True, latency="fixed:600") as server:
+        parser = MeetingParser(client=OllamaClient(), cache=LLMResponseCache())
+        parser.ollama_url = server.url
+        before = FALLBACK_TOTAL.value(reason="deadline")
+        start = time.monotonic()
+        record = parser.parse_record(text, deadline=0.1)
+        assert time.monotonic() - start < 0.4
+        assert parser.provisional and parser.used_fallback
+        assert record == parser._get_mock_record(text)
+        assert FALLBACK_TOTAL.value(reason="deadline") == before + 1
+
+        assert _wait_until(lambda: parser.cached_record(text) is not None)
+        upgraded = parser.parse_record(text, deadline=0.1)
+        assert not parser.provisional and not parser.used_fallback
+        assert upgraded.meeting_topic == text.splitlines()[0].split("：")[1]
+        assert server.request_count == 1
+    print("✓ 超时返回临时结果，后台结果写入缓存")
+
+
+def test_fast_llm_within_deadline():
+    """大模型在截止时间内完成时直接返回其结果；deadline为0时一直等待"""
+    with StubOllamaServer(templated=True, latency="fixed:50") as server:
+        parser = MeetingParser(client=OllamaClient(), cache=LLMResponseCache(max_entries=0))
+        parser.ollama_url = server.url
+        text = _text()
+        record = parser.parse_record(text, deadline=5)
+        assert not parser.provisional and not parser.used_fallback
+        assert "王五" in record.participants
+        parser.parse_record(text, deadline=0)
+        assert not parser.provisional and server.request_count == 2
+    print("✓ 截止时间内完成时返回大模型结果")
+
+
+def test_saturated_pool():
+    """后台调用已满时不排队直接返回临时结果；超时时还在排队的调用被丢弃，不再调用大模型"""
+    saved = llm_parser._deadline_pool
+    try:
+        with StubOllamaServer(templated=True, latency="fixed:500") as server:
+            parser = MeetingParser(client=OllamaClient(), cache=LLMResponseCache())
+            parser.ollama_url = server.url
+
+            # 一个线程、不排队：第一个调用超时后仍在执行，第二个请求不等待截止时间
+            llm_parser._deadline_pool = BoundedExecutor(max_workers=1, max_pending=0)
+            first, second = _text(), _text()
+            parser.parse_record(first, deadline=0.1)
+            before = FALLBACK_TOTAL.value(reason="deadline_pool_full")
+            start = time.monotonic()
+            parser.parse_record(second, deadline=0.1)
+            assert time.monotonic() - start < 0.05 and parser.provisional
+            assert FALLBACK_TOTAL.value(reason="deadline_pool_full") == before + 1
+            assert _wait_until(lambda: parser.cached_record(first) is not None)
+
+            # 一个线程、可排队一个：排队中超时的调用被取消
+            llm_parser._deadline_pool = BoundedExecutor(max_workers=1, max_pending=1)
+            running, queued = _text(), _text()
+            count = server.request_count
+            parser.parse_record(running, deadline=0.1)
+            parser.parse_record(queued, deadline=0.1)
+            assert parser.provisional
+            assert _wait_until(lambda: parser.cached_record(running) is not None)
+            time.sleep(0.1)
+            assert server.request_count == count + 1 and parser.cached_record(queued) is None
+            # 名额全部释放，可以再次提交
+            assert llm_parser._deadline_pool.try_submit(lambda: None) is not None
+    finally:
+        llm_parser._deadline_pool = saved
+    print("✓ 后台调用已满时直接返回，排队中超时的调用被丢弃")
+
+
+def test_generate_and_job_upgrade():
+    """/generate、任务下载、流式和批量生成在超时时标记临时文档，大模型完成后重新获取得到完整文档"""
+    with StubOllamaServer(templated=True, latency="fixed:500") as server:
+        os.environ["OLLAMA_URL"] = server.url
+        os.environ["LLM_DEADLINE"] = "0.1"
+        try:
+            from app import PROVISIONAL_HEADER, create_app
+            from config import Config
+            client = create_app(Config(WARMUP="off")).test_client()
+
+            text = _text()
+            response = client.post("/generate", json={"text": text})
+            assert response.status_code == 200 and response.headers.get(PROVISIONAL_HEADER) == "1"
+            assert response.headers.get("ETag") is None
+            assert _wait_until(lambda: MeetingParser().cached_record(text) is not None)
+            response = client.post("/generate", json={"text": text})
+            assert PROVISIONAL_HEADER not in response.headers and response.headers.get("ETag")
+
+            text = _text()
+            job_id = client.post("/jobs", json={"text": text}).get_json()["job_id"]
+            assert _wait_until(lambda: client.get(f"/jobs/{job_id}").get_json()["status"] == "done")
+            assert client.get(f"/jobs/{job_id}").get_json()["provisional"]
+            assert _wait_until(lambda: MeetingParser().cached_record(text) is not None)
+            response = client.get(f"/jobs/{job_id}/download")
+            assert response.status_code == 200 and PROVISIONAL_HEADER not in response.headers
+            assert not client.get(f"/jobs/{job_id}").get_json()["provisional"]
+
+            text = _text()
+            response = client.post("/generate/stream", json={"text": text})
+            assert response.status_code == 200 and response.headers.get(PROVISIONAL_HEADER) == "1"
+            items = [{"name": "临时", "text": _text()}]
+            with zipfile.ZipFile(io.BytesIO(client.post("/generate/batch", json={"items": items}).data)) as archive:
+                assert json.loads(archive.read("manifest.json"))["items"][0]["provisional"]
+            assert _wait_until(lambda: MeetingParser().cached_record(text) is not None)
+            response = client.post("/generate/stream", json={"text": text})
+            assert PROVISIONAL_HEADER not in response.headers
+        finally:
+            os.environ.pop("OLLAMA_URL")
+            os.environ.pop("LLM_DEADLINE")
+    print("✓ 临时文档在大模型完成后升级")
+
+
+def main():
+    print("=== 截止时间解析测试 ===")
+    test_deadline_returns_provisional()
+    test_fast_llm_within_deadline()
+    test_saturated_pool()
+    test_generate_and_job_upgrade()
+    print("\n✅ 测试通过")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
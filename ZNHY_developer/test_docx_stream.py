@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+测试流式写入的文档与WordGenerator输出一致，并以分块响应返回
+"""
+
+import io
+import os
+import random
+import sys
+import zipfile
+
+from benchmarks.bench_docx_stream import make_meeting
+from benchmarks.stub_ollama import StubOllamaServer
+from utils.docx_stream import StreamingDocxWriter
+from utils.word_generator import WordGenerator
+
+# 覆盖需要转义、保留空白、制表符和换行的字符
+ALPHABET = ["会", "议", "a", " ", "\t", "\n", "\r", "&", "<", ">", "\"", "'", "　"]
+
+
+def _parts(data):
+    archive = zipfile.ZipFile(io.BytesIO(data))
+    return {name: archive.read(name) for name in archive.namelist()}
+
+
+def _random_text(rng):
+    return "".join(rng.choice(ALPHABET) for _ in range(rng.randint(0, 8)))
+
+
+def test_same_parts_as_word_generator():
+    """随机内容下每个部件都与WordGenerator逐字节相同"""
+    rng = random.Random(0)
+    for i in range(200):
+        meeting_data = {
+            "meeting_topic": _random_text(rng),
+            "host": _random_text(rng),
+            "meeting_location": _random_text(rng),
+            "participants": [_random_text(rng) for _ in range(3)],
+            "topics": [{"title": _random_text(rng), "leader": _random_text(rng), "preparation": _random_text(rng)}
+                       for _ in range(rng.randint(0, 4))],
+            "pre_meeting_preparations": _random_text(rng),
+        }
+        if i % 3 == 0:
+            meeting_data["agenda_items"] = [{"topic": _random_text(rng), "responsible_person": _random_text(rng)}]
+            meeting_data.pop("topics")
+        expected = _parts(WordGenerator().generate_document(meeting_data).getvalue())
+        assert _parts(StreamingDocxWriter().render(meeting_data)) == expected
+    print("✓ 流式写入与WordGenerator输出一致")
+
+
+def test_chunked_output():
+    """议题很多时分多块输出"""
+    chunks = list(StreamingDocxWriter(flush_size=4096).iter_document(make_meeting(500)))
+    assert len(chunks) > 10
+    document = zipfile.ZipFile(io.BytesIO(b"".join(chunks))).read("word/document.xml").decode("utf-8")
+    assert "第500项" in document
+    print("✓ 长会议分块输出")
+
+
+def test_stream_endpoint():
+    """流式接口返回可以打开的docx"""
+    with StubOllamaServer() as server:
+        os.environ["OLLAMA_URL"] = server.url
+        from app import app
+        client = app.test_client()
+        response = client.post("/generate/stream", json={"text": "会议主题：项目进度讨论\n参会人员：张三、李四、王五"})
+        assert response.status_code == 200 and response.is_streamed
+        document = zipfile.ZipFile(io.BytesIO(response.data)).read("word/document.xml").decode("utf-8")
+        assert "项目进度讨论" in document
+        assert client.post("/generate/stream", json={"text": ""}).status_code == 400
+        os.environ.pop("OLLAMA_URL")
+    print("✓ 流式接口正常")
+
+
+def main():
+    print("=== 流式文档写入测试 ===")
+    test_same_parts_as_word_generator()
+    test_chunked_output()
+    test_stream_endpoint()
+    print("\n✅ 测试通过")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+测试启发式提取与原实现结果一致，并且每个请求只计算一次
+"""
+
+import random
+import sys
+
+from benchmarks.bench_heuristic_extractor import SCENARIOS, legacy_get_mock_data
+from utils import llm_parser
+from utils.heuristic_extractor import extract_meeting_fields
+from utils.llm_cache import LLMResponseCache
+from utils.llm_parser import MeetingParser
+
+SAMPLES = [
+    "会议主题：项目进度讨论 时间：今天下午3点 地点：会议室A 参会人员：张三、李四、王五 议程：讨论项目当前进度和下一步计划",
+    "今天上午十点召开产品评审会，地点在公司三楼会议室，参会人员包括产品经理、开发人员和测试人员。主要评审新产品的设计方案和功能需求。",
+    "下周三下午三点，我想在公司三楼的大会议室开个会，参会的有市场部的李明、张娜，技术部的王磊，还有新来的实习生赵晓雨。"
+    "会议主要说三件事，一是讨论下季度的产品推广方案，对了，会议大概开两个小时，记得提前把会议资料发到群里。",
+    "会议主题：下季度产品推广方案\n会议时间：2023年10月15日 14:00-16:00\n主持人：张三\n参会人员：李四、王五、赵六\n"
+    "会议时长：约2小时\n\n会议议程：\n1. 讨论线上广告投放预算分配\n\n会前准备事项：提前准备相关资料\n",
+    "2024-03-01在线上会议讨论：预算\n约3小时",
+    "周会在会议室12召开，10月8日开始，议题\n\n预算审批",
+    "",
+]
+
+
+def test_matches_legacy_on_samples():
+    """典型会议文本的提取结果与原实现一致"""
+    for text in SAMPLES:
+        assert extract_meeting_fields(text) == legacy_get_mock_data(text), text
+    for make in SCENARIOS.values():
+        text = make(4 << 10)
+        assert extract_meeting_fields(text) == legacy_get_mock_data(text)
+    print("✓ 典型文本与原实现结果一致")
+
+
+def test_matches_legacy_on_random_text():
+    """由关键字随机拼出的文本与原实现结果一致"""
+    alphabet = list("主题会议室时间地点办公线上参人员题程讨论事项前准备提长约下周月日和以及、,，：: \n0123456789１-张三李四")
+    rng = random.Random(20231015)
+    for _ in range(5000):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 60)))
+        assert extract_meeting_fields(text) == legacy_get_mock_data(text), repr(text)
+    print("✓ 随机文本与原实现结果一致")
+
+
+def test_guessed_names_keep_order():
+    """没有明确的参会人员时，猜出的人名去重后按第一次出现的顺序排列"""
+    text = "下周三开会，参会的有王磊、张娜，还有李明和张娜"
+    participants = extract_meeting_fields(text)["participants"]
+    assert participants == list(dict.fromkeys(participants))
+    positions = [text.index(name) for name in participants]
+    assert positions == sorted(positions), participants
+    print("✓ 猜出的人名保持出现顺序")
+
+
+def test_computed_once_per_request():
+    """一次解析中启发式提取最多执行一次"""
+    calls = []
+    original = llm_parser.extract_meeting_fields
+
+    def counting(text, *args):
+        calls.append(text)
+        return original(text, *args)
+
+    llm_parser.extract_meeting_fields = counting
+    try:
+        parser = MeetingParser(cache=LLMResponseCache())
+        parser._parse_response('{"participants": ["讨论"]}', SAMPLES[0])
+        assert len(calls) == 1
+        parser._parse_response('这不是JSON', SAMPLES[0])
+        assert len(calls) == 1
+    finally:
+        llm_parser.extract_meeting_fields = original
+    print("✓ 每个请求只执行一次启发式提取")
+
+
+def main():
+    print("=== 启发式提取测试 ===")
+    test_matches_legacy_on_samples()
+    test_matches_legacy_on_random_text()
+    test_guessed_names_keep_order()
+    test_computed_once_per_request()
+    print("\n✅ 测试通过")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
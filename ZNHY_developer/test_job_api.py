@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+测试异步任务接口：提交、查询、下载
+"""
+
+import os
+import sys
+import threading
+import time
+
+from benchmarks.stub_ollama import StubOllamaServer
+from utils.job_manager import JobManager, JobQueueFullError
+
+TEXT = "会议主题：项目进度讨论\n参会人员：张三、李四、王五"
+
+
+def test_job_manager_bounds_and_retention():
+    """排队已满时拒绝提交，结束的任务超过保留期后被清理"""
+    release = threading.Event()
+    manager = JobManager(max_workers=1, max_pending=1, retention=0.05)
+    first = manager.submit(lambda: release.wait() and b"first")
+    second = manager.submit(lambda: b"second")
+    try:
+        manager.submit(lambda: b"third")
+        assert False, "队列已满时应拒绝提交"
+    except JobQueueFullError:
+        pass
+    release.set()
+    assert first.wait(1) and second.wait(1)
+    assert first.result == b"first" and second.status == "done"
+    time.sleep(0.1)
+    assert manager.get(first.job_id) is None
+    manager.shutdown()
+    print("✓ 任务池有界，过期结果被清理")
+
+
+def test_retained_limits():
+    """保留的已结束任务超过数量或字节上限时，最早结束的任务先被清理"""
+    manager = JobManager(max_workers=1, max_retained=2, max_retained_bytes=10)
+    jobs = [manager.submit(lambda: b"1234") for _ in range(3)]
+    assert all(job.wait(1) for job in jobs)
+    assert manager.get(jobs[0].job_id) is None
+    assert manager.get(jobs[1].job_id) and manager.get(jobs[2].job_id)
+    manager.discard(jobs[1].job_id)
+    big = manager.submit(lambda: b"x" * 8)
+    assert big.wait(1)
+    assert manager.get(jobs[2].job_id) is None and manager.get(big.job_id).result == b"x" * 8
+    manager.shutdown()
+    print("✓ 保留的任务结果有上限")
+
+
+def test_failed_job():
+    """任务异常时状态为failed并记录错误信息"""
+    manager = JobManager(max_workers=1)
+
+    def boom():
+        raise ValueError("渲染失败")
+
+    job = manager.submit(boom)
+    job.wait(1)
+    assert job.status == "failed" and job.error == "渲染失败"
+    manager.shutdown()
+    print("✓ 失败任务记录错误信息")
+
+
+def test_submit_poll_download():
+    """通过HTTP接口提交任务、轮询状态并下载文档"""
+    with StubOllamaServer() as server:
+        os.environ["OLLAMA_URL"] = server.url
+        from app import app
+        client = app.test_client()
+
+        response = client.post("/jobs", json={"text": TEXT})
+        assert response.status_code == 202
+        job_id = response.get_json()["job_id"]
+
+        for _ in range(100):
+            status = client.get(f"/jobs/{job_id}").get_json()["status"]
+            if status in ("done", "failed"):
+                break
+            time.sleep(0.05)
+        assert status == "done"
+
+        response = client.get(f"/jobs/{job_id}/download")
+        assert response.status_code == 200
+        assert response.data[:2] == b"PK"
+
+        # 同步接口保持不变
+        response = client.post("/generate", json={"text": TEXT})
+        assert response.status_code == 200 and response.data[:2] == b"PK"
+        assert client.post("/generate", json={"text": ""}).status_code == 400
+        assert client.get("/jobs/unknown").status_code == 404
+        os.environ.pop("OLLAMA_URL")
+    print("✓ 提交/查询/下载流程正常，同步接口兼容")
+
+
+def test_invalid_payloads():
+    """请求体不是对象或text不是字符串时各接口返回400的JSON错误"""
+    from app import create_app
+    from config import Config
+    client = create_app(Config(WARMUP="off")).test_client()
+    for payload in (["x"], "x", {"text": 5}, {"text": ["x"]}, {}):
+        for path in ("/generate", "/generate/stream", "/jobs", "/parse"):
+            response = client.post(path, json=payload)
+            assert response.status_code == 400, (path, payload, response.status_code)
+            assert response.get_json()["error"] == "请输入会议内容"
+    print("✓ 非法请求体返回400")
+
+
+def main():
+    print("=== 异步任务接口测试 ===")
+    test_job_manager_bounds_and_retention()
+    test_retained_limits()
+    test_failed_job()
+    test_submit_poll_download()
+    test_invalid_payloads()
+    print("\n✅ 测试通过")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+测试大模型输出的JSON修复和输出格式约束
+"""
+
+import os
+import sys
+
+from utils.json_repair import repair_json
+from utils.llm_cache import LLMResponseCache
+from utils.llm_parser import MEETING_SCHEMA, MeetingParser
+from utils.metrics import LLM_RESPONSES_TOTAL
+from test_prompt_prefix import _RecordingClient
+
+
+def test_repair_common_errors():
+    """说明文字、代码块、多余逗号、单引号、None、注释、未加引号的键"""
+    assert repair_json('好的：\n```json\n{"a": 1,}\n```\n以上。') == {"a": 1}
+    assert repair_json("{'host': None, 'ok': True, 'list': [1, 2,]}") == {"host": None, "ok": True, "list": [1, 2]}
+    assert repair_json('{meeting_topic: 周会, // 注释\n "count": 3 /* 说明 */}') == {"meeting_topic": "周会", "count": 3}
+    assert repair_json('{“host”：“张三”，“time”：“上午”}') == {"host": "张三", "time": "上午"}
+    assert repair_json('{"a": "x" "b": "y"}') == {"a": "x", "b": "y"}
+    print("✓ 修复常见的格式错误")
+
+
+def test_repair_strings():
+    """字符串内部的内容不做修改"""
+    assert repair_json('{"host": "Noneya, True"}') == {"host": "Noneya, True"}
+    assert repair_json('说明{"loc": "A栋}302{"} 之后的{文字}') == {"loc": "A栋}302{"}
+    assert repair_json('{"say": "他说"好的"就走了"}') == {"say": '他说"好的"就走了'}
+    assert repair_json('{"a": "\\u5f20\\n"}') == {"a": "张\n"}
+    # 转义的代理对合并为一个字符，不成对的代理项替换为U+FFFD
+    assert repair_json('{"a": "\\ud83d\\ude00好",}') == {"a": "😀好"}
+    assert repair_json("{'a': '\\ud83d', 'b': '\\ude00\\ud83dx'}") == {"a": "\ufffd", "b": "\ufffd\ufffdx"}
+    print("✓ 字符串内容保持不变")
+
+
+def test_repair_truncated():
+    """输出被截断时补全字符串和括号"""
+    assert repair_json('{"topics": [{"title": "预算') == {"topics": [{"title": "预算"}]}
+    assert repair_json('{"a": 1, "b":') == {"a": 1, "b": None}
+    assert repair_json('{"a": 1, "b"') == {"a": 1, "b": None}
+    for text in ("没有JSON", "{[1]}"):
+        try:
+            repair_json(text)
+        except ValueError:
+            continue
+        raise AssertionError(f"应当无法修复: {text}")
+    print("✓ 补全截断的输出")
+
+
+def test_extract_counts_results():
+    """解析结果按parsed/repaired/discarded计数"""
+    parser = MeetingParser(client=_RecordingClient(), cache=LLMResponseCache(max_entries=0))
+    before = {name: LLM_RESPONSES_TOTAL.value(result=name) for name in ("parsed", "repaired", "discarded")}
+    assert parser._extract_json('{"host": "张三"}') == {"host": "张三"}
+    assert parser._extract_json("```json\n{'host': '张三',}\n```") == {"host": "张三"}
+    assert parser._extract_json("无法提取") is None
+    for name in before:
+        assert LLM_RESPONSES_TOTAL.value(result=name) == before[name] + 1, name
+    print("✓ 响应解析结果计数")
+
+
+def test_payload_format():
+    """OLLAMA_FORMAT控制请求中的format参数"""
+    old = os.environ.pop("OLLAMA_FORMAT", None)
+    try:
+        for value, expected in ((None, MEETING_SCHEMA), ("json", "json"), ("", None)):
+            if value is not None:
+                os.environ["OLLAMA_FORMAT"] = value
+            client = _RecordingClient()
+            parser = MeetingParser(client=client, cache=LLMResponseCache(max_entries=0))
+            parser.parse_meeting_text("会议主题：周会")
+            parser.warmup()
+            for payload in client.payloads:
+                assert payload.get("format") == expected, (value, payload.get("format"))
+    finally:
+        os.environ.pop("OLLAMA_FORMAT", None)
+        if old is not None:
+            os.environ["OLLAMA_FORMAT"] = old
+    assert "topics" in MEETING_SCHEMA["properties"]
+    print("✓ 请求的输出格式约束")
+
+
+def main():
+    print("=== JSON修复测试 ===")
+    test_repair_common_errors()
+    test_repair_strings()
+    test_repair_truncated()
+    test_extract_counts_results()
+    test_payload_format()
+    print("\n✅ 测试通过")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
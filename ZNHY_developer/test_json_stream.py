@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+测试流式解析：增量JSON扫描与提前结束生成
+"""
+
+import json
+import sys
+import time
+
+from benchmarks.stub_ollama import StubOllamaServer
+from utils.json_stream import IncrementalJSONScanner
+from utils.llm_cache import LLMResponseCache
+from utils.llm_parser import MeetingParser
+from utils.ollama_client import OllamaClient
+
+
+def scan(chunks):
+    scanner = IncrementalJSONScanner()
+    for chunk in chunks:
+        if scanner.feed(chunk):
+            break
+    return scanner
+
+
+def test_scanner_skips_prefix_and_trailing_text():
+    """跳过```json前缀，闭合后忽略后续输出"""
+    text = '```json\n{"meeting_topic": "周会", "topics": [{"title": "进度"}]}\n```\n以上是提取结果。'
+    scanner = scan([text[i:i + 3] for i in range(0, len(text), 3)])
+    assert scanner.complete
+    assert json.loads(scanner.text) == {"meeting_topic": "周会", "topics": [{"title": "进度"}]}
+    print("✓ 跳过前缀并在对象闭合时停止")
+
+
+def test_scanner_ignores_braces_in_strings():
+    """字符串中的括号和转义引号不影响深度计算"""
+    text = '{"meeting_topic": "讨论{预算}分配", "note": "他说\\"}\\"", "host": "张三"} 多余内容}'
+    scanner = scan([text[i:i + 2] for i in range(0, len(text), 2)])
+    assert json.loads(scanner.text)["host"] == "张三"
+    print("✓ 字符串中的括号与转义引号被正确忽略")
+
+
+def test_scanner_incomplete():
+    """对象未闭合时text为None"""
+    scanner = scan(['{"meeting_topic": "周', '会"'])
+    assert not scanner.complete and scanner.text is None
+    print("✓ 未闭合的对象不会被提前返回")
+
+
+def test_stream_cutoff():
+    """流式模式在JSON闭合后立即断开，不再等待多余输出"""
+    trailing = "\n以上就是本次会议的全部信息，如有需要可以继续补充。" * 20
+    with StubOllamaServer(trailing_text=trailing, chunk_chars=8, chunk_delay=0.002) as server:
+        client = OllamaClient()
+        parser = MeetingParser(client=client, cache=LLMResponseCache(), stream=True)
+        parser.ollama_url = server.url
+        start = time.perf_counter()
+        meeting_data = parser.parse_meeting_text("会议主题：项目进度讨论 参会人员：张三、李四、王五")
+        elapsed = time.perf_counter() - start
+        time.sleep(0.05)
+        chunks_sent = server.chunks_sent
+        client.close()
+
+    total_chunks = -(-len(json.dumps(server.httpd.meeting_json, ensure_ascii=False) + trailing) // 8)
+    assert not parser.used_fallback
+    assert meeting_data["meeting_topic"] == "项目进度讨论"
+    assert chunks_sent < total_chunks / 2
+    print(f"✓ 提前结束生成：发送 {chunks_sent}/{total_chunks} 个片段，耗时 {elapsed * 1000:.0f}ms")
+
+
+def main():
+    print("=== 流式解析测试 ===")
+    test_scanner_skips_prefix_and_trailing_text()
+    test_scanner_ignores_braces_in_strings()
+    test_scanner_incomplete()
+    test_stream_cutoff()
+    print("\n✅ 测试通过")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
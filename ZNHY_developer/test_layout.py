@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+测试声明式版式：两种版式由同一套编译后的渲染计划输出，流式写入与python-docx结果一致
+"""
+
+import io
+import sys
+import zipfile
+
+from docx import Document
+
+from meeting_template import create_meeting_record
+from utils.docx_stream import StreamingDocxWriter
+from utils.layout import compile_layout, get_layout
+from utils.meeting_model import MeetingRecord
+from utils.word_generator import WordGenerator
+
+MEETING = {
+    "meeting_topic": "季度规划",
+    "host": "张三",
+    "participants": ["张三", "李四"],
+    "topics": [
+        {"title": "预算", "leader": "李四", "preparation": "报表", "participants": "财务组"},
+        {"title": "招聘"},
+    ],
+    "pre_meeting_preparations": "提前发资料",
+}
+
+
+def _parts(data):
+    archive = zipfile.ZipFile(io.BytesIO(data))
+    # core.xml带有创建时间，不参与比较
+    return {name: archive.read(name) for name in archive.namelist() if name != "docProps/core.xml"}
+
+
+def _save(document):
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def test_headings_layout():
+    """标题版式：会议信息是一级标题下的段落，议题和会前准备事项逐段输出"""
+    document = create_meeting_record(MEETING)
+    texts = [paragraph.text for paragraph in document.paragraphs]
+    assert texts[2:4] == ["会议主题", "季度规划"] and "张三、李四" in texts
+    assert document.paragraphs[2].style.name == "Heading 1"
+    assert ["议题1：预算", "负责人：李四", "会前准备：报表", "参与人员：财务组", "", "议题2：招聘", ""] == \
+        texts[texts.index("会议内容记录") + 2:-1]
+    last = document.paragraphs[-1]
+    assert [(run.text, bool(run.bold)) for run in last.runs] == [("会前准备事项：", True), (" 提前发资料", False)]
+    # 参会人员为字符串时原样输出，旧格式agenda_items也能渲染
+    legacy = create_meeting_record({"participants": "王五、赵六", "agenda_items": [{"topic": "旧议题"}]})
+    legacy_texts = [paragraph.text for paragraph in legacy.paragraphs]
+    assert "王五、赵六" in legacy_texts and "议题1：旧议题" in legacy_texts
+    print("✓ 标题版式")
+
+
+def test_same_engine_for_both_layouts():
+    """两种版式的python-docx渲染、从空白模板构建和流式写入结果逐部件相同"""
+    for layout in ("table", "headings"):
+        plan = get_layout(layout)
+        expected = _parts(_save(plan.render(plan.new_document(), MEETING)))
+        assert _parts(_save(plan.render(plan.build(Document()), MEETING))) == expected
+        assert _parts(StreamingDocxWriter(layout=layout).render(MEETING)) == expected
+    assert _parts(WordGenerator().generate_document(MEETING).getvalue()) == \
+        _parts(StreamingDocxWriter().render(MEETING))
+    assert _parts(_save(create_meeting_record(MEETING))) == _parts(StreamingDocxWriter(layout="headings").render(MEETING))
+    assert get_layout("table") is get_layout("table")
+    print("✓ 两种版式共用渲染计划")
+
+
+def test_custom_layout():
+    """新增版式只需要写版式说明"""
+    plan = compile_layout("brief", (
+        {"type": "paragraph", "text": "{meeting_topic}（{host}）", "bold": True},
+        {"type": "topics", "title": "{index}. {title}", "lines": ("负责人：{leader}",)},
+    ))
+    document = plan.render(plan.new_document(), MEETING)
+    assert [paragraph.text for paragraph in document.paragraphs] == [
+        "季度规划（张三）", "1. 预算", "负责人：李四", "", "2. 招聘", ""]
+    assert MeetingRecord.from_dict({"participants": [{"name": "甲"}, {"name": "乙"}]}).participants_text == "甲、乙"
+    print("✓ 自定义版式")
+
+
+def test_invalid_layout():
+    """不支持的版式说明在编译时报错"""
+    invalid = [
+        ({"type": "unknown"},),
+        ({"type": "topics", "title": "{title}"}, {"type": "table", "cols": 1, "rows": (("a",),)}),
+        ({"type": "topics", "title": "{title}"}, {"type": "paragraph", "text": "a", "style": "Heading 1"}),
+        ({"type": "topics", "title": "{title}", "lines": ("{leader}{preparation}",)},),
+        ({"type": "table", "cols": 4, "rows": (("a", "b"),)},),
+    ]
+    for spec in invalid:
+        try:
+            compile_layout("invalid", spec)
+        except ValueError:
+            continue
+        raise AssertionError(spec)
+    try:
+        get_layout("missing")
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("未知版式应报错")
+    print("✓ 版式校验")
+
+
+def main():
+    print("=== 声明式版式测试 ===")
+    test_headings_layout()
+    test_same_engine_for_both_layouts()
+    test_custom_layout()
+    test_invalid_layout()
+    print("\n✅ 测试通过")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+测试大模型解析结果缓存
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.stub_ollama import StubOllamaServer
+from utils.llm_cache import LLMResponseCache, make_cache_key
+from utils.llm_parser import MeetingParser
+from utils.ollama_client import OllamaClient
+
+
+def test_cache_key_normalization():
+    """只有空白差异的文本使用同一个缓存键"""
+    key = make_cache_key("会议主题：周会\n参会人员：张三", "qwen:1.8b", "1")
+    assert key == make_cache_key("  会议主题：周会  \r\n参会人员：张三\n", "qwen:1.8b", "1")
+    assert key != make_cache_key("会议主题：周会\n参会人员：张三", "qwen:7b", "1")
+    assert key != make_cache_key("会议主题：周会\n参会人员：张三", "qwen:1.8b", "2")
+    print("✓ 缓存键区分模型与提示词版本，忽略空白差异")
+
+
+def test_lru_eviction():
+    """超过容量时淘汰最久未使用的条目"""
+    cache = LLMResponseCache(max_entries=2)
+    cache.set("a", {"v": 1})
+    cache.set("b", {"v": 2})
+    assert cache.get("a") == {"v": 1}
+    cache.set("c", {"v": 3})
+    assert cache.get("b") is None
+    assert cache.get("a") == {"v": 1}
+    stats = cache.stats()
+    assert stats["evictions"] == 1 and stats["hits"] == 2 and stats["misses"] == 1
+    print("✓ LRU淘汰与命中计数正确")
+
+
+def test_ttl():
+    """过期条目不再返回"""
+    cache = LLMResponseCache(ttl=0.05)
+    cache.set("a", {"v": 1})
+    assert cache.get("a") == {"v": 1}
+    time.sleep(0.1)
+    assert cache.get("a") is None
+    print("✓ 过期条目被丢弃")
+
+
+def test_disk_persistence():
+    """磁盘层在重新创建缓存后依然命中"""
+    db_path = os.path.join(tempfile.mkdtemp(), "llm_cache.sqlite3")
+    cache = LLMResponseCache(db_path=db_path)
+    cache.set("a", {"participants": ["张三", "李四"]})
+    cache.close()
+
+    reopened = LLMResponseCache(db_path=db_path)
+    assert reopened.get("a") == {"participants": ["张三", "李四"]}
+    assert reopened.stats()["disk_hits"] == 1
+    reopened.close()
+    print("✓ 磁盘缓存重启后依然有效")
+
+
+def test_disk_pruning():
+    """磁盘层每PRUNE_INTERVAL次写入删除过期条目，条目超过上限时只保留最近写入的"""
+    from utils import llm_cache
+    db_path = os.path.join(tempfile.mkdtemp(), "llm_cache.sqlite3")
+    cache = LLMResponseCache(max_entries=0, ttl=0.05, db_path=db_path, max_disk_entries=100)
+
+    def keys():
+        return [key for key, in cache._db.execute("SELECT key FROM llm_cache ORDER BY rowid")]
+
+    cache.set("old", {"v": 0})
+    time.sleep(0.1)
+    cache.ttl = 3600
+    for i in range(llm_cache.PRUNE_INTERVAL):
+        cache.set(f"k{i}", {"v": i})
+    assert keys() == [f"k{i}" for i in range(llm_cache.PRUNE_INTERVAL)], "过期条目已删除"
+
+    cache.max_disk_entries = 3
+    for i in range(llm_cache.PRUNE_INTERVAL):
+        cache.set(f"n{i}", {"v": i})
+    last = llm_cache.PRUNE_INTERVAL - 1
+    assert keys() == [f"n{last - 2}", f"n{last - 1}", f"n{last}"], keys()
+    assert cache.get(f"n{last}") == {"v": last}
+    cache.close()
+    print("✓ 磁盘缓存清理过期和超出上限的条目")
+
+
+def test_repeat_parse_hits_cache():
+    """重复解析同一份会议内容不再调用大模型"""
+    text = "会议主题：项目进度讨论\n参会人员：张三、李四、王五"
+    with StubOllamaServer() as server:
+        client = OllamaClient()
+        cache = LLMResponseCache()
+        parser = MeetingParser(client=client, cache=cache)
+        parser.ollama_url = server.url
+        first = parser.parse_meeting_text(text)
+
+        start = time.perf_counter()
+        second = parser.parse_meeting_text(text + "\n")
+        elapsed = (time.perf_counter() - start) * 1e6
+        client.close()
+
+    assert first == second
+    assert cache.stats()["hits"] == 1
+    print(f"✓ 重复解析命中缓存，耗时 {elapsed:.1f}µs")
+
+
+def test_fallback_not_cached():
+    """大模型不可用时退回的模拟数据不写入缓存"""
+    cache = LLMResponseCache()
+    parser = MeetingParser(client=OllamaClient(connect_timeout=0.2), cache=cache)
+    parser.ollama_url = "http://127.0.0.1:9/api/generate"
+    parser.parse_meeting_text("会议主题：周会")
+    assert parser.used_fallback
+    assert cache.stats()["size"] == 0
+    print("✓ 模拟数据不写入缓存")
+
+
+def main():
+    print("=== 解析结果缓存测试 ===")
+    test_cache_key_normalization()
+    test_lru_eviction()
+    test_ttl()
+    test_disk_persistence()
+    test_disk_pruning()
+    test_repeat_parse_hits_cache()
+    test_fallback_not_cached()
+    print("\n✅ 测试通过")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
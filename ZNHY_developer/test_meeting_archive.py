@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+测试会议归档：保存、全文检索、分页、查看和下载
+"""
+
+import os
+import sys
+import tempfile
+
+from benchmarks.stub_ollama import StubOllamaServer
+from utils.meeting_archive import MeetingArchive, build_match_query, reset_meeting_archive, segment
+from utils.meeting_model import MeetingRecord, Topic
+
+
+def _record(topic, participants, topics=()):
+    return MeetingRecord(meeting_topic=topic, host=participants[0], participants=list(participants),
+                         topics=[Topic(title) for title in topics])
+
+
+def test_segment_and_query():
+    """汉字切分为相邻两字，查询词转换为短语，单字按前缀匹配"""
+    assert segment("张三丰参加了ABC会议，2024年") == "张三 三丰 丰参 参加 加了 了 abc 会议 议 2024 年"
+    assert build_match_query("张三丰") == '"张三 三丰"'
+    assert build_match_query("张 App 预算") == '"张" * AND "app" AND "预算"'
+    assert build_match_query("，！") is None
+    print("✓ 分词和查询转换")
+
+
+def test_save_and_search():
+    """按主题、姓名、议题和原文检索，同一份会议记录重新保存时更新原条目"""
+    archive = MeetingArchive(":memory:")
+    first = archive.save("周一例会，张三丰汇报了预算。", _record("周例会", ["张三丰", "李四"], ["预算审批"]), b"doc1")
+    second = archive.save("产品评审会，王五主持。", _record("产品评审", ["王五", "张三"], ["新版APP"]), b"doc2",
+                          used_fallback=True, provisional=True)
+    third = archive.save("季度复盘，赵六参加。", _record("季度复盘", ["赵六"]), b"doc3")
+    assert len(archive) == 3
+
+    def ids(query, **kwargs):
+        return [item["id"] for item in archive.search(query, **kwargs)["items"]]
+
+    assert ids("张三丰") == [first]
+    assert ids("张三") == [second, first], "两字姓名同样命中三字姓名中的相同部分"
+    assert ids("张") == [second, first]
+    assert ids("app") == [second] and ids("预算") == [first]
+    assert ids("评审 王五") == [second] and ids("评审 赵六") == []
+    assert ids("复盘") == [third]
+    assert ids("") == [third, second, first]
+    assert ids("张三丰", order="relevance") == [first]
+
+    result = archive.search("", page=2, per_page=2)
+    assert result["total"] == 3 and not result["total_capped"] and [item["id"] for item in result["items"]] == [first]
+    item = archive.search("产品")["items"][0]
+    assert item["participants"] == "王五、张三" and item["provisional"] and "docx" not in item
+
+    # 大模型后台完成后用完整结果更新临时结果：原来的索引词被删除
+    assert archive.save("产品评审会，王五主持。\n", _record("产品规划", ["王五"]), b"doc2-final") == second
+    assert len(archive) == 3
+    assert ids("产品评审") == [second], "原文中仍有产品评审"
+    assert ids("张三") == [first] and ids("规划") == [second]
+    data = archive.get(second, with_transcript=True)
+    assert data["meeting"]["meeting_topic"] == "产品规划" and not data["provisional"]
+    assert data["transcript"] == "产品评审会，王五主持。\n"
+    assert "transcript" not in archive.get(second)
+    assert archive.get_document(second) == b"doc2-final"
+    assert archive.get(999) is None and archive.get_document(999) is None
+    print("✓ 保存、检索和更新")
+
+
+def test_repeat_save_skips_index():
+    """会议信息和原文都相同的重复保存只更新时间、标记和文档，不重新切分原文"""
+    from utils import meeting_archive
+    archive = MeetingArchive(":memory:")
+    record = _record("周例会", ["张三", "李四"])
+    meeting_id = archive.save("周一例会。", record, b"doc1", provisional=True)
+    calls = []
+    original = meeting_archive._index_values
+    meeting_archive._index_values = lambda *args: calls.append(args) or original(*args)
+    try:
+        assert archive.save("周一例会。", record.copy(), b"doc2") == meeting_id
+        assert not calls
+        assert archive.get_document(meeting_id) == b"doc2" and not archive.get(meeting_id)["provisional"]
+        assert [item["id"] for item in archive.search("例会")["items"]] == [meeting_id]
+        # 会议信息变化时仍然重建索引
+        archive.save("周一例会。", _record("周例会", ["王五"]), b"doc3")
+        assert len(calls) == 2 and archive.search("李四")["total"] == 0
+    finally:
+        meeting_archive._index_values = original
+    print("✓ 重复保存不重建索引")
+
+
+def test_archive_api():
+    """生成的文档自动归档，可以通过接口检索、查看和下载"""
+    with tempfile.TemporaryDirectory() as tmp, StubOllamaServer(templated=True) as server:
+        os.environ["OLLAMA_URL"] = server.url
+        os.environ["ARCHIVE_PATH"] = os.path.join(tmp, "archive.db")
+        reset_meeting_archive()
+        try:
+            from app import create_app
+            from config import Config
+            client = create_app(Config(WARMUP="off")).test_client()
+
+            text = "会议主题：归档测试周会\n主持人：张三\n参会人员：李四、王五"
+            generated = client.post("/generate", json={"text": text})
+            assert generated.status_code == 200
+
+            result = client.get("/archive", query_string={"q": "归档测试"}).get_json()
+            assert result["total"] == 1
+            meeting_id = result["items"][0]["id"]
+            assert client.get("/archive", query_string={"q": "李四 王五", "order": "relevance"}).get_json()["total"] == 1
+            assert client.get("/archive", query_string={"order": "random"}).status_code == 400
+
+            data = client.get(f"/archive/{meeting_id}", query_string={"transcript": "1"}).get_json()
+            assert data["transcript"] == text and "李四" in data["meeting"]["participants"]
+            download = client.get(f"/archive/{meeting_id}/download")
+            assert download.status_code == 200 and download.data == generated.data
+            assert client.get("/archive/999").status_code == 404
+        finally:
+            os.environ.pop("OLLAMA_URL")
+            os.environ.pop("ARCHIVE_PATH")
+            reset_meeting_archive()
+        assert client.get("/archive").status_code == 404, "未设置ARCHIVE_PATH时不提供归档接口"
+    print("✓ 归档接口")
+
+
+def main():
+    print("=== 会议归档测试 ===")
+    test_segment_and_query()
+    test_save_and_search()
+    test_repeat_save_skips_index()
+    test_archive_api()
+    print("\n✅ 测试通过")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+测试会议信息模型：解析器边界一次完成规范化，渲染和缓存直接使用MeetingRecord
+"""
+
+import json
+import sys
+
+from benchmarks.stub_ollama import StubOllamaServer
+from utils.docx_stream import StreamingDocxWriter
+from utils.llm_cache import LLMResponseCache
+from utils.llm_parser import MeetingParser
+from utils.meeting_model import MeetingRecord, Topic, as_record
+from utils.ollama_client import OllamaClient
+from utils.word_generator import WordGenerator, iter_content_paragraphs
+
+
+def test_from_dict_normalizes():
+    """参会人员统一为姓名列表，旧格式议题转换为Topic，缺少的字段取默认值"""
+    record = MeetingRecord.from_dict({
+        "meeting_topic": "周会",
+        "host": None,
+        "participants": ["张三", {"name": ": 李四"}, '{"participant_name": "王五"}', " ", {"person": "赵六"}],
+        "agenda_items": [{"topic": "预算", "responsible_person": "李四"}, "无效条目"],
+        "extra": "多余字段",
+    })
+    assert record.participants == ["张三", "李四", "王五", "赵六"]
+    assert record.participant_count == 4 and record.participants_text == "张三、李四、王五、赵六"
+    assert record.host == "" and record["participants"] == "张三、李四、王五、赵六"
+    assert record.topics == [Topic("预算", leader="李四")]
+    assert record["unknown"] == "" and record.topics[0]["unknown"] == ""
+
+    assert MeetingRecord.from_dict({"participants": "张三、李四、"}).participants == ["张三", "李四"]
+
+    defaults = MeetingRecord(meeting_topic="默认主题", participants=["张三"], topics=[Topic("默认议题")])
+    merged = MeetingRecord.from_dict({"meeting_time": "周三"}, defaults=defaults)
+    assert merged.meeting_topic == "默认主题" and merged.meeting_time == "周三"
+    assert merged.topics == defaults.topics and merged.participants is not defaults.participants
+    # 大模型给出的topics为空时才使用agenda_items
+    assert MeetingRecord.from_dict({"topics": [], "agenda_items": [{"topic": "招聘"}]}).topics == [Topic("招聘")]
+    assert MeetingRecord.from_dict({"topics": []}, defaults=defaults).topics == []
+    print("✓ 规范化会议信息")
+
+
+def test_strict_validation():
+    """外部提交的数据类型不对时给出错误说明"""
+    cases = [
+        ([], "请提交会议信息对象"),
+        ({"host": 1}, "host应为字符串"),
+        ({"participants": "张三"}, "participants应为姓名列表"),
+        ({"participants": ["张三", {"name": "李四"}]}, "participants应为姓名列表"),
+        ({"topics": ["预算"]}, "topics应为议题对象列表"),
+        ({"topics": [{"title": 5}]}, "topics.title应为字符串"),
+        ({"topics": [{"title": "预算", "leader": None}]}, "topics.leader应为字符串"),
+        ({"participants": ["a\u0001"]}, "participants含有无法写入文档的控制字符"),
+        ({"meeting_topic": "周会\x00"}, "meeting_topic含有无法写入文档的控制字符"),
+        ({"topics": [{"title": "预算\ufffe"}]}, "topics.title含有无法写入文档的控制字符"),
+    ]
+    for data, message in cases:
+        try:
+            MeetingRecord.from_dict(data, strict=True)
+        except ValueError as e:
+            assert str(e) == message, (data, e)
+        else:
+            raise AssertionError(f"应当拒绝{data}")
+    assert MeetingRecord.from_dict({"participants": [{"name": "李四"}]}, strict=True).participants == ["李四"]
+    print("✓ 严格校验")
+
+
+def test_round_trip_and_copy():
+    """to_dict的结构与原来的字典一致，from_dict还原后相等；副本的列表可以独立修改"""
+    record = MeetingRecord("周会", "周三", "会议室A", "张三", "1小时", "带电脑", ["张三", "李四"],
+                           [Topic("预算", "李四", "报表", "财务组"), Topic("招聘")])
+    data = record.to_dict()
+    assert list(data) == ["meeting_topic", "meeting_time", "meeting_location", "host", "participants",
+                          "participant_count", "meeting_duration", "topics", "pre_meeting_preparations"]
+    assert data["topics"][1] == {"title": "招聘"} and data["participant_count"] == 2
+    assert MeetingRecord.from_dict(json.loads(json.dumps(data, ensure_ascii=False))) == record
+
+    copy = record.copy()
+    copy.participants.append("王五")
+    copy.topics.pop()
+    assert record.participants == ["张三", "李四"] and len(record.topics) == 2
+    assert as_record(record) is record and as_record(data) == record
+    print("✓ 转换与复制")
+
+
+def test_renderers_accept_record():
+    """两种渲染方式对MeetingRecord和等价字典输出相同的内容"""
+    data = {"meeting_topic": "周会", "host": "张三", "participants": ["张三", "李四"],
+            "topics": [{"title": "预算", "leader": "李四"}]}
+    record = MeetingRecord.from_dict(data)
+    assert list(iter_content_paragraphs(record)) == list(iter_content_paragraphs(data))
+    assert WordGenerator().generate_document(record).getvalue()
+    assert b"".join(StreamingDocxWriter().iter_document(record))
+    print("✓ 渲染直接使用MeetingRecord")
+
+
+def test_parse_record():
+    """parse_record返回规范化的记录，缓存命中时每次得到独立的副本"""
+    meeting = {"meeting_topic": "周会", "host": "张三", "participants": [" 李四 ", {"name": "王五"}],
+               "topics": [{"title": "预算"}]}
+    with StubOllamaServer(meeting_json=meeting) as server:
+        parser = MeetingParser(client=OllamaClient(), cache=LLMResponseCache())
+        parser.ollama_url = server.url
+        first = parser.parse_record("会议主题：周会")
+        assert not parser.used_fallback
+        assert first.participants == ["李四", "王五", "张三"] and first.topics == [Topic("预算")]
+        first.participants.clear()
+        second = parser.parse_record("会议主题：周会")
+        assert server.request_count == 1
+        assert second.participants == ["李四", "王五", "张三"]
+        assert parser.parse_meeting_text("会议主题：周会") == second.to_dict()
+    print("✓ 解析返回MeetingRecord")
+
+
+def main():
+    print("=== 会议信息模型测试 ===")
+    test_from_dict_normalizes()
+    test_strict_validation()
+    test_round_trip_and_copy()
+    test_renderers_accept_record()
+    test_parse_record()
+    print("\n✅ 测试通过")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
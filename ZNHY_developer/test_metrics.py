@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+测试各阶段耗时统计、退回计数和/metrics接口
+"""
+
+import os
+import sys
+
+from benchmarks.stub_ollama import StubOllamaServer
+from utils.metrics import FALLBACK_TOTAL, STAGE_SECONDS, Counter, Histogram, span
+
+
+def test_histogram_format():
+    """直方图分桶累加，输出符合Prometheus文本格式"""
+    histogram = Histogram("demo_seconds", "Demo.", labelnames=("stage",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.7, 3.0):
+        histogram.observe(value, stage="a")
+    lines = histogram.collect()
+    assert 'demo_seconds_bucket{stage="a",le="0.1"} 1' in lines
+    assert 'demo_seconds_bucket{stage="a",le="1.0"} 3' in lines
+    assert 'demo_seconds_bucket{stage="a",le="+Inf"} 4' in lines
+    assert 'demo_seconds_count{stage="a"} 4' in lines
+    counter = Counter("demo_total", "Demo.", labelnames=("reason",))
+    counter.inc(reason='a"b')
+    assert 'demo_total{reason="a\\"b"} 1' in counter.collect()
+    print("✓ 指标输出格式正确")
+
+
+def test_span_records_on_error():
+    """阶段抛出异常时耗时同样被记录"""
+    before = STAGE_SECONDS.count(stage="test_error")
+    try:
+        with span("test_error"):
+            raise RuntimeError("boom")
+    except RuntimeError:
+        pass
+    assert STAGE_SECONDS.count(stage="test_error") == before + 1
+    print("✓ 异常阶段也计入耗时")
+
+
+def test_metrics_endpoint():
+    """生成一次文档后各阶段都有记录，Ollama失败时计入退回次数"""
+    from app import app
+    client = app.test_client()
+    text = "会议主题：指标测试\n参会人员：张三、李四"
+    with StubOllamaServer() as server:
+        os.environ["OLLAMA_URL"] = server.url
+        assert client.post("/generate", json={"text": text}).status_code == 200
+    with StubOllamaServer(error_rate=1.0) as server:
+        os.environ["OLLAMA_URL"] = server.url
+        before = FALLBACK_TOTAL.value(reason="llm_error")
+        assert client.post("/generate", json={"text": text + "\n失败"}).status_code == 200
+        assert FALLBACK_TOTAL.value(reason="llm_error") == before + 1
+    os.environ.pop("OLLAMA_URL")
+
+    body = client.get("/metrics").get_data(as_text=True)
+    for stage in ("prompt_build", "llm_call", "json_extract", "fallback", "docx_render", "buffer_save"):
+        assert f'meeting_stage_seconds_count{{stage="{stage}"}}' in body, stage
+    assert 'meeting_fallback_total{reason="llm_error"}' in body
+    print("✓ /metrics导出各阶段耗时和退回次数")
+
+
+def main():
+    print("=== 指标测试 ===")
+    test_histogram_format()
+    test_span_records_on_error()
+    test_metrics_endpoint()
+    print("\n✅ 测试通过")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
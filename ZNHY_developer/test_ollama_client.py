@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+测试共享Ollama客户端的连接复用
+"""
+
+import sys
+
+from benchmarks.stub_ollama import StubOllamaServer
+from utils.llm_parser import MeetingParser
+from utils.ollama_client import OllamaClient, get_ollama_client
+
+
+def test_shared_client():
+    """多个解析器实例共享同一个客户端"""
+    assert get_ollama_client() is get_ollama_client()
+    assert MeetingParser().client is MeetingParser().client
+    print("✓ 解析器实例共享同一个Ollama客户端")
+
+
+def test_timeouts():
+    """连接超时与读取超时分开配置"""
+    client = OllamaClient(connect_timeout=1.5, read_timeout=20)
+    assert client.timeout == (1.5, 20)
+    client.close()
+    print("✓ 连接超时与读取超时分开配置")
+
+
+def test_parse_with_stub():
+    """通过桩服务完成解析，并复用同一条连接"""
+    with StubOllamaServer() as server:
+        client = OllamaClient(pool_maxsize=1)
+        parser = MeetingParser(client=client)
+        parser.ollama_url = server.url
+        for _ in range(3):
+            meeting_data = parser.parse_meeting_text("会议主题：项目进度讨论 参会人员：张三、李四、王五")
+            assert meeting_data["meeting_topic"] == "项目进度讨论"
+        assert server.connection_count == 1
+        client.close()
+    print("✓ 连续三次解析只建立了一条连接")
+
+
+def main():
+    print("=== Ollama客户端连接复用测试 ===")
+    test_shared_client()
+    test_timeouts()
+    test_parse_with_stub()
+    print("\n✅ 测试通过")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+测试/parse（JSON和HTML预览）和/render（不调用大模型渲染docx）
+"""
+
+import os
+import sys
+
+from benchmarks.stub_ollama import StubOllamaServer
+
+
+def make_client():
+    from app import create_app
+    from config import Config
+
+    return create_app(Config(WARMUP="off")).test_client()
+
+
+def test_parse_json_and_html():
+    """/parse返回会议信息JSON，format=html时返回HTML预览"""
+    meeting = {"meeting_topic": "预览测试", "host": "张三", "participants": ["张三", "李四"],
+               "topics": [{"title": "预算", "leader": "李四", "preparation": "报表"}]}
+    with StubOllamaServer(meeting_json=meeting) as server:
+        os.environ["OLLAMA_URL"] = server.url
+        try:
+            client = make_client()
+            text = "会议主题：预览测试\n主持人：张三"
+            response = client.post("/parse", json={"text": text})
+            assert response.status_code == 200
+            body = response.get_json()
+            assert body["meeting"]["meeting_topic"] == "预览测试" and body["used_fallback"] is False
+
+            html = client.post("/parse?format=html", json={"text": text})
+            assert html.status_code == 200 and html.mimetype == "text/html"
+            page = html.get_data(as_text=True)
+            assert "预览测试" in page and "张三、李四" in page and "<strong>议题1：预算</strong>" in page
+            assert server.request_count == 1
+            assert client.post("/parse", json={"text": ""}).status_code == 400
+        finally:
+            os.environ.pop("OLLAMA_URL", None)
+    print("✓ /parse JSON和HTML预览")
+
+
+def test_render_without_llm():
+    """/render直接渲染提交的JSON，返回ETag，不访问大模型"""
+    os.environ["OLLAMA_URL"] = "http://127.0.0.1:9/api/generate"
+    try:
+        client = make_client()
+        meeting = {"meeting_topic": "渲染测试", "host": "王五", "participants": [{"name": "王五"}], "topics": []}
+        response = client.post("/render", json={"meeting": meeting})
+        assert response.status_code == 200 and response.data[:2] == b"PK"
+        etag = response.headers["ETag"]
+        raw = client.post("/render", json=meeting)
+        assert raw.headers["ETag"] == etag
+        cached = client.post("/render", json=meeting, headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+
+        html = client.post("/render?format=html", json=meeting)
+        assert html.status_code == 200 and "渲染测试" in html.get_data(as_text=True)
+    finally:
+        os.environ.pop("OLLAMA_URL", None)
+    print("✓ /render")
+
+
+def test_render_validation():
+    """提交的会议信息结构不对时返回400"""
+    client = make_client()
+    for body in (None, ["a"], {"meeting_topic": 1}, {"participants": "张三"},
+                 {"participants": ["张三", {"name": "李四"}]}, {"topics": ["议题"]}, {"topics": [{"title": 5}]},
+                 {"participants": ["a\u0001"]}, {"meeting": {"host": "张\x0b三"}}):
+        response = client.post("/render", json=body)
+        assert response.status_code == 400 and response.get_json()["error"], body
+    print("✓ 参数校验")
+
+
+def main():
+    print("=== 解析/渲染分离测试 ===")
+    test_parse_json_and_html()
+    test_render_without_llm()
+    test_render_validation()
+    print("\n✅ 测试通过")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
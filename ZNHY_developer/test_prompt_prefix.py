@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+测试system提示词、keep_alive和预热
+"""
+
+import math
+import sys
+
+from benchmarks.stub_ollama import StubOllamaServer, keep_alive_seconds
+from utils.llm_cache import LLMResponseCache
+from utils.llm_parser import SYSTEM_PROMPT, MeetingParser
+from utils.ollama_client import OllamaClient
+
+
+class _RecordingClient:
+    """记录请求内容，返回固定响应的客户端"""
+
+    def __init__(self):
+        self.payloads = []
+
+    def post(self, url, payload, stream=False):
+        self.payloads.append(payload)
+        return _Response()
+
+
+class _Response:
+    status_code = 200
+    headers = {}
+    text = '{"response": "{}"}'
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return {"response": '{"meeting_topic": "周会", "host": "张三", "participants": ["张三"]}'}
+
+
+def test_payload_uses_system_prompt():
+    """固定说明放在system中，prompt只包含会议内容"""
+    client = _RecordingClient()
+    parser = MeetingParser(client=client, cache=LLMResponseCache(max_entries=0))
+    parser.parse_meeting_text("会议主题：周会\n主持人：张三")
+    payload = client.payloads[0]
+    assert payload["system"] == SYSTEM_PROMPT
+    assert "会议主题：周会" in payload["prompt"]
+    assert "输出格式示例" not in payload["prompt"] and "输出格式示例" in SYSTEM_PROMPT
+    assert payload["keep_alive"] == parser.keep_alive
+    print("✓ 请求使用system提示词和keep_alive")
+
+
+def test_warmup():
+    """预热请求成功时返回True，Ollama不可用时返回False而不抛出异常"""
+    with StubOllamaServer() as server:
+        parser = MeetingParser(client=OllamaClient())
+        parser.ollama_url = server.url
+        assert parser.warmup()
+        assert server.request_count == 1
+    parser.ollama_url = "http://127.0.0.1:9/api/generate"
+    assert not parser.warmup()
+    print("✓ 预热成功与失败")
+
+
+def test_stub_prefix_and_keep_alive():
+    """桩服务：相同前缀不再计入延迟，模型加载后在keep_alive内不再重新加载"""
+    assert keep_alive_seconds("30m") == 1800 and keep_alive_seconds(10) == 10
+    assert keep_alive_seconds("-1") == math.inf and keep_alive_seconds("abc") == 300
+    server = StubOllamaServer(latency_per_kchar=1000, prefix_cache=True, load_ms=500)
+    delay = server.httpd.prompt_delay
+    system = "说明" * 500
+    first = delay({"system": system, "prompt": "会议A", "keep_alive": "30m"})
+    second = delay({"system": system, "prompt": "会议B", "keep_alive": "30m"})
+    assert first > 1.5 and second < 0.01
+    server.httpd.server_close()
+    print("✓ 桩服务模拟前缀复用和模型常驻")
+
+
+def main():
+    print("=== 提示词前缀复用测试 ===")
+    test_payload_uses_system_prompt()
+    test_warmup()
+    test_stub_prefix_and_keep_alive()
+    print("\n✅ 测试通过")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+测试渲染文档缓存和/generate的ETag
+"""
+
+import os
+import sys
+
+from benchmarks.stub_ollama import StubOllamaServer
+from utils.render_cache import RenderCache, get_render_cache, make_render_key
+
+
+def test_render_key_canonical():
+    """键的顺序不影响缓存键，内容和版式版本号影响"""
+    a = {"meeting_topic": "周会", "participants": ["张三", "李四"]}
+    b = {"participants": ["张三", "李四"], "meeting_topic": "周会"}
+    assert make_render_key(a, "1") == make_render_key(b, "1")
+    assert make_render_key(a, "1") != make_render_key(a, "2")
+    assert make_render_key(a, "1") != make_render_key(dict(a, meeting_topic="月会"), "1")
+    print("✓ 规范化的缓存键")
+
+
+def test_render_cache_bounds():
+    """按LRU淘汰，条目数和总字节数都不超过上限"""
+    cache = RenderCache(max_bytes=100, max_entries=3)
+    for key in "abc":
+        cache.set(key, b"x" * 30)
+    assert cache.get("a") is not None
+    cache.set("d", b"x" * 30)
+    assert cache.get("b") is None and cache.get("a") is not None
+    cache.set("e", b"x" * 60)
+    stats = cache.stats()
+    assert stats["bytes"] <= 100 and stats["size"] <= 3
+    cache.set("huge", b"x" * 101)
+    assert cache.get("huge") is None
+    assert RenderCache(max_entries=0).get("a") is None
+    print("✓ 容量上限和LRU淘汰")
+
+
+def test_generate_etag():
+    """/generate返回ETag，带If-None-Match再次请求时返回304，不再调用大模型"""
+    with StubOllamaServer() as server:
+        os.environ["OLLAMA_URL"] = server.url
+        try:
+            from app import create_app
+            from config import Config
+
+            client = create_app(Config(WARMUP="off")).test_client()
+            text = "会议主题：文档缓存测试\n主持人：张三"
+            first = client.post("/generate", json={"text": text})
+            assert first.status_code == 200
+            etag = first.headers["ETag"]
+            assert etag.startswith('W/"')
+            hits = get_render_cache().stats()["hits"]
+            second = client.post("/generate", json={"text": text})
+            assert second.data == first.data and second.headers["ETag"] == etag
+            assert get_render_cache().stats()["hits"] == hits + 1
+
+            requests_before = server.request_count
+            cached = client.post("/generate", json={"text": text}, headers={"If-None-Match": etag})
+            assert cached.status_code == 304 and cached.headers["ETag"] == etag
+            other = client.post("/generate", json={"text": text + "\n记录：李四"}, headers={"If-None-Match": etag})
+            assert other.status_code == 200 and other.headers["ETag"] != etag
+            assert server.request_count == requests_before + 1
+        finally:
+            os.environ.pop("OLLAMA_URL", None)
+
+    # Ollama不可用、退回模拟数据时不返回ETag，下次请求重新尝试大模型
+    os.environ["OLLAMA_URL"] = "http://127.0.0.1:9/api/generate"
+    try:
+        fallback = client.post("/generate", json={"text": "会议主题：退回测试\n主持人：王五"})
+        assert fallback.status_code == 200 and "ETag" not in fallback.headers
+    finally:
+        os.environ.pop("OLLAMA_URL", None)
+    print("✓ ETag和304")
+
+
+def main():
+    print("=== 文档缓存测试 ===")
+    test_render_key_canonical()
+    test_render_cache_bounds()
+    test_generate_etag()
+    print("\n✅ 测试通过")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
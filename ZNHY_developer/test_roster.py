@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+测试花名册索引：多模式匹配自动机、花名册读取以及参会人员识别
+"""
+
+import json
+import os
+import random
+import sys
+import tempfile
+
+from utils.heuristic_extractor import extract_meeting_fields
+from utils.llm_cache import LLMResponseCache
+from utils.llm_parser import MeetingParser
+from utils.roster import AhoCorasick, Roster, get_roster, load_roster, reset_roster
+
+
+def test_automaton_matches_brute_force():
+    """自动机找到的匹配与逐个位置比较的结果相同"""
+    rng = random.Random(0)
+    alphabet = "张三李四王五丰明"
+    for _ in range(300):
+        patterns = {"".join(rng.choice(alphabet) for _ in range(rng.randint(1, 4))) for _ in range(rng.randint(1, 12))}
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 40)))
+        found = sorted(AhoCorasick((p, p) for p in patterns).iter_matches(text))
+        expected = sorted((i, i + len(p), p) for p in patterns for i in range(len(text)) if text.startswith(p, i))
+        assert found == expected, (patterns, text)
+    print("✓ 自动机匹配正确")
+
+
+def test_roster_scan():
+    """按出现顺序返回员工，别名换成姓名，重叠时取最长，同时标出非人名关键词"""
+    roster = Roster([("张三", []), ("张三丰", ["三丰"]), ("李明", ["小明"])])
+    assert roster.scan("会议由张三丰主持，小明和张三参加，讨论项目") == (["张三丰", "李明", "张三"], True)
+    assert roster.scan("市场部李明") == (["李明"], False)
+    assert roster.find_names("王五") == []
+    empty = Roster()
+    assert not empty and empty.fingerprint == ""
+    assert empty.scan("讨论") == ([], True) and empty.scan("王五") == ([], False)
+    assert roster.fingerprint != Roster([("张三", [])]).fingerprint
+    print("✓ 花名册扫描")
+
+
+def test_load_roster():
+    """读取CSV（姓名/别名列，带BOM）和JSON花名册"""
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "roster.csv")
+        with open(csv_path, "w", encoding="utf-8-sig") as f:
+            f.write("工号,姓名,别名\n1,李明,小明|明哥\n2,张娜,\n")
+        roster = load_roster(csv_path)
+        assert roster.names == ["李明", "张娜"] and roster.find_names("明哥和张娜") == ["李明", "张娜"]
+
+        json_path = os.path.join(tmp, "roster.json")
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(["王磊", {"name": "赵晓雨", "aliases": ["晓雨"]}], f, ensure_ascii=False)
+        assert load_roster(json_path).find_names("晓雨找王磊") == ["赵晓雨", "王磊"]
+
+        bad_path = os.path.join(tmp, "bad.csv")
+        with open(bad_path, "w", encoding="utf-8") as f:
+            f.write("工号\n1\n")
+        bad_json_path = os.path.join(tmp, "bad.json")
+        with open(bad_json_path, "w", encoding="utf-8") as f:
+            json.dump(["王磊", 42], f)
+        for path in (bad_path, bad_json_path):
+            try:
+                load_roster(path)
+            except ValueError:
+                pass
+            else:
+                raise AssertionError(f"{path}应报错")
+
+        os.environ["ROSTER_PATH"] = csv_path
+        reset_roster()
+        try:
+            assert get_roster().names == ["李明", "张娜"]
+            os.environ["ROSTER_PATH"] = os.path.join(tmp, "missing.csv")
+            reset_roster()
+            assert len(get_roster()) == 0
+            # 花名册格式错误时不使用花名册，解析器照常创建
+            os.environ["ROSTER_PATH"] = bad_json_path
+            reset_roster()
+            assert len(MeetingParser(cache=LLMResponseCache(max_entries=0)).roster) == 0
+        finally:
+            os.environ.pop("ROSTER_PATH")
+            reset_roster()
+    print("✓ 读取花名册")
+
+
+def test_participants_with_roster():
+    """有花名册时启发式提取和大模型结果整理都按花名册识别参会人员"""
+    roster = Roster([("李明", []), ("张娜", []), ("王磊", ["磊哥"])])
+    text = "下周三开会，参会的有市场部的张娜、技术部的磊哥，还有李明。"
+    fields = extract_meeting_fields(text, roster)
+    assert fields["participants"] == ["张娜", "王磊", "李明"] and fields["host"] == "张娜"
+    # 没有花名册时结果不变
+    assert extract_meeting_fields(text) == extract_meeting_fields(text, Roster())
+
+    parser = MeetingParser(cache=LLMResponseCache(max_entries=0), roster=roster)
+    result = parser._complete_result({"participants": ["市场部张娜", "项目进度", "访客小陈", "张娜"], "host": "李明"}, text)
+    assert result.participants == ["张娜", "访客小陈", "李明"] and result.participant_count == 3
+
+    plain = MeetingParser(cache=LLMResponseCache(max_entries=0), roster=Roster())
+    plain_participants = plain._complete_result({"participants": ["市场部张娜", "项目进度"], "host": "李明"}, text).participants
+    assert plain_participants == ["市场部张娜", "李明"]
+    assert parser.result_key(text) != plain.result_key(text)
+    print("✓ 按花名册识别参会人员")
+
+
+def main():
+    print("=== 花名册测试 ===")
+    test_automaton_matches_brute_force()
+    test_roster_scan()
+    test_load_roster()
+    test_participants_with_roster()
+    print("\n✅ 测试通过")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+测试合并相同内容的并发解析请求
+"""
+
+import sys
+import threading
+import time
+
+from benchmarks.stub_ollama import StubOllamaServer
+from utils.llm_cache import LLMResponseCache
+from utils.llm_parser import MeetingParser
+from utils.metrics import COALESCED_TOTAL
+from utils.ollama_client import OllamaClient
+from utils.single_flight import SingleFlight
+
+
+def _run_concurrently(count, target):
+    barrier = threading.Barrier(count)
+    results = [None] * count
+
+    def worker(index):
+        barrier.wait()
+        try:
+            results[index] = target()
+        except Exception as e:
+            results[index] = e
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_single_flight_shares_result():
+    """相同键的并发调用只执行一次，异常同样共享；结束后再次调用会重新执行"""
+    flight = SingleFlight()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        time.sleep(0.2)
+        return "结果"
+
+    results = _run_concurrently(5, lambda: flight.do("a", slow))
+    assert len(calls) == 1
+    assert sorted(shared for _, shared in results) == [False, True, True, True, True]
+    assert all(value == "结果" for value, _ in results)
+    assert flight.in_flight() == 0
+    flight.do("a", slow)
+    assert len(calls) == 2
+
+    def failing():
+        time.sleep(0.1)
+        raise RuntimeError("调用失败")
+
+    errors = _run_concurrently(3, lambda: flight.do("b", failing))
+    assert all(isinstance(error, RuntimeError) for error in errors)
+    assert flight.in_flight() == 0
+    print("✓ 合并相同键的并发调用")
+
+
+def test_parser_coalesces_identical_text():
+    """多人同时提交同一份会议记录时只调用一次大模型，各自得到独立的结果副本"""
+    flight = SingleFlight()
+    with StubOllamaServer(templated=True, latency="fixed:300") as server:
+        client = OllamaClient()
+
+        def parse():
+            parser = MeetingParser(client=client, cache=LLMResponseCache(max_entries=0), single_flight=flight)
+            parser.ollama_url = server.url
+            return parser.parse_meeting_text("会议主题：周会\n主持人：张三\n参会人员：李四、王五"), parser.used_fallback
+
+        before = COALESCED_TOTAL.value()
+        results = _run_concurrently(4, parse)
+        assert server.request_count == 1
+        assert COALESCED_TOTAL.value() == before + 3
+        assert not any(used_fallback for _, used_fallback in results)
+        first = results[0][0]
+        assert all(result == first for result, _ in results)
+        assert len({id(result) for result, _ in results}) == 4
+
+        _run_concurrently(2, parse)
+        assert server.request_count == 2, "上一批结束后重新调用"
+    print("✓ 解析时合并相同内容的并发请求")
+
+
+def main():
+    print("=== 并发请求合并测试 ===")
+    test_single_flight_shares_result()
+    test_parser_coalesces_identical_text()
+    print("\n✅ 测试通过")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
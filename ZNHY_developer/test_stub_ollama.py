@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+测试Ollama桩服务的延迟、错误率、多余输出和按提示词生成，以及压测脚本
+"""
+
+import random
+import sys
+
+from benchmarks.load_test import run_load
+from benchmarks.stub_ollama import StubOllamaServer, parse_latency
+from benchmarks.transcripts import make_meeting, make_transcript
+from utils.llm_cache import LLMResponseCache
+from utils.llm_parser import MeetingParser
+from utils.ollama_client import OllamaClient
+
+
+def _parser(server, stream=False):
+    parser = MeetingParser(client=OllamaClient(), cache=LLMResponseCache(max_entries=0), stream=stream)
+    parser.ollama_url = server.url
+    return parser
+
+
+def test_parse_latency():
+    """各种延迟分布的采样结果在合理范围内"""
+    rng = random.Random(0)
+    assert parse_latency("fixed:200")(rng) == 0.2
+    assert all(0.1 <= parse_latency("uniform:100,300")(rng) <= 0.3 for _ in range(100))
+    assert all(parse_latency("normal:50,100")(rng) >= 0 for _ in range(100))
+    samples = sorted(parse_latency("lognormal:100,0.5")(rng) for _ in range(1001))
+    assert 0.08 < samples[500] < 0.12
+    try:
+        parse_latency("poisson:3")
+        assert False, "未知分布应报错"
+    except ValueError:
+        pass
+    print("✓ 延迟分布解析正确")
+
+
+def test_templated_and_junk():
+    """按提示词中的会议内容生成JSON，包裹多余文字后解析器仍能提取"""
+    text = make_transcript(3, 4, 2, 5)
+    with StubOllamaServer(templated=True, junk_rate=1.0) as server:
+        for stream in (False, True):
+            parser = _parser(server, stream)
+            result = parser.parse_meeting_text(text)
+            assert not parser.used_fallback
+            assert result["participants"] == make_meeting(3, 4, 2)["participants"]
+    print("✓ 按会议内容生成，多余文字不影响解析")
+
+
+def test_error_rate():
+    """error_rate为1时总是返回500，解析器退回模拟数据"""
+    with StubOllamaServer(error_rate=1.0, latency="fixed:10") as server:
+        parser = _parser(server)
+        parser.parse_meeting_text("会议主题：周会\n参会人员：张三、李四")
+        assert parser.used_fallback
+        assert server.request_count == server.error_count == 1
+    print("✓ 按错误率返回500")
+
+
+def test_run_load():
+    """开环压测按计划发送全部请求"""
+    with StubOllamaServer() as server:
+        results, elapsed = run_load(server.url, rps=50, duration=0.4, concurrency=4, texts=["会议"], timeout=5)
+    assert len(results) == 20 and all(status == 200 for status, _ in results)
+    assert elapsed >= 0.38
+    print("✓ 压测脚本按目标RPS发送请求")
+
+
+def main():
+    print("=== Ollama桩服务测试 ===")
+    test_parse_latency()
+    test_templated_and_junk()
+    test_error_rate()
+    test_run_load()
+    print("\n✅ 测试通过")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+测试上传.txt/.docx会议记录：分块解码、流式读取docx段落、大小上限和临时文件
+"""
+
+import io
+import os
+import sys
+import zipfile
+
+from docx import Document
+
+from benchmarks.stub_ollama import StubOllamaServer
+from utils.upload_reader import UploadError, UploadTooLargeError, iter_docx_paragraphs, read_text, read_upload
+
+TEXT = "会议主题：上传测试周会\n主持人：张三\n参会人员：李四、王五"
+
+
+def _docx(lines, table=None):
+    document = Document()
+    for line in lines:
+        document.add_paragraph(line)
+    if table:
+        cells = document.add_table(rows=1, cols=len(table)).rows[0].cells
+        for cell, text in zip(cells, table):
+            cell.text = text
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def _docx_bomb(paragraphs):
+    """document.xml由大量相同段落组成的docx，压缩比很高"""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        with archive.open("word/document.xml", "w") as xml:
+            xml.write(b'<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"><w:body>')
+            paragraph = "<w:p><w:r><w:t>{}</w:t></w:r></w:p>".format("发言" * 50).encode("utf-8")
+            for start in range(0, paragraphs, 1000):
+                xml.write(paragraph * min(1000, paragraphs - start))
+            xml.write(b"</w:body></w:document>")
+    return buffer.getvalue()
+
+
+def test_read_text():
+    """UTF-8按任意块大小增量解码结果不变，GBK文件自动识别，无法识别时报错"""
+    data = ("\ufeff" + TEXT).encode("utf-8")
+    for chunk_size in (1, 2, 5, 1 << 16):
+        assert read_text(io.BytesIO(data), chunk_size) == TEXT
+    assert read_text(io.BytesIO(TEXT.encode("gbk")), 3) == TEXT
+    try:
+        read_text(io.BytesIO(b"\xff\xfe\xff"))
+        assert False, "无法识别的编码应报错"
+    except UploadError:
+        pass
+    print("✓ 文本文件分块解码")
+
+
+def test_docx_paragraphs():
+    """逐段读取docx正文和表格中的文字，与python-docx一致"""
+    data = _docx(TEXT.splitlines() + ["", "结尾"], table=["表格甲", "表格乙"])
+    document = Document(io.BytesIO(data))
+    expected = [p.text for p in document.paragraphs] + ["表格甲", "表格乙"]
+    paragraphs = list(iter_docx_paragraphs(io.BytesIO(data)))
+    assert sorted(paragraphs) == sorted(expected)
+    assert paragraphs[:3] == TEXT.splitlines()
+    assert read_upload(io.BytesIO(_docx(TEXT.splitlines())), "会议.DOCX") == TEXT
+    for data, name in ((b"not a zip", "a.docx"), (b"", "a.pdf")):
+        try:
+            read_upload(io.BytesIO(data), name)
+            assert False, f"{name}应报错"
+        except UploadError:
+            pass
+    print("✓ 流式读取docx段落")
+
+
+def test_decompressed_limits():
+    """高压缩比的docx按解压后的大小和读出的字数拒绝，文本文件同样限制字数"""
+    bomb = _docx_bomb(10000)
+    assert zipfile.ZipFile(io.BytesIO(bomb)).getinfo("word/document.xml").file_size > 100 * len(bomb)
+    for kwargs in ({"max_xml_bytes": 1024 * 1024}, {"max_chars": 100000}):
+        try:
+            read_upload(io.BytesIO(bomb), "会议.docx", **kwargs)
+            assert False, f"{kwargs}应报错"
+        except UploadTooLargeError:
+            pass
+    assert len(read_upload(io.BytesIO(_docx_bomb(10)), "会议.docx", max_chars=1010, max_xml_bytes=4096)) == 1009
+    try:
+        read_text(io.BytesIO(TEXT.encode("utf-8")), chunk_size=4, max_chars=10)
+        assert False, "超过字数上限应报错"
+    except UploadTooLargeError:
+        pass
+    print("✓ 解压后大小和字数上限")
+
+
+def test_upload_endpoints():
+    """/parse和/generate接受上传的文件；读取失败返回400，超过大小上限返回413，大文件写入临时文件"""
+    from app import create_app
+    from config import Config
+    from flask import request
+
+    with StubOllamaServer(templated=True) as server:
+        os.environ["OLLAMA_URL"] = server.url
+        try:
+            app = create_app(Config(WARMUP="off", MAX_CONTENT_LENGTH=64 * 1024, UPLOAD_SPOOL_BYTES=1024,
+                                    UPLOAD_MAX_XML_BYTES=1024 * 1024))
+            client = app.test_client()
+
+            response = client.post("/parse", data={"file": (io.BytesIO(TEXT.encode("utf-8")), "会议.txt")})
+            meeting = response.get_json()["meeting"]
+            assert response.status_code == 200 and "王五" in meeting["participants"]
+
+            response = client.post("/generate", data={"file": (io.BytesIO(_docx(TEXT.splitlines())), "会议.docx")})
+            assert response.status_code == 200 and response.data[:2] == b"PK"
+
+            response = client.post("/generate", data={"file": (io.BytesIO(b"x"), "会议.pdf")})
+            assert response.status_code == 400 and "docx" in response.get_json()["error"]
+            assert client.post("/jobs", data={"file": (io.BytesIO(b""), "空.txt")}).status_code == 400
+
+            big = ("发言记录。" * 10000).encode("utf-8")
+            response = client.post("/generate", data={"file": (io.BytesIO(big), "会议.txt")})
+            assert response.status_code == 413 and "上限" in response.get_json()["error"]
+            assert client.post("/generate", json={"text": "长" * 40000}).status_code == 413
+            response = client.post("/generate", data={"file": (io.BytesIO(_docx_bomb(10000)), "会议.docx")})
+            assert response.status_code == 413 and "上限" in response.get_json()["error"]
+        finally:
+            os.environ.pop("OLLAMA_URL")
+
+        with app.test_request_context("/generate", method="POST",
+                                      data={"file": (io.BytesIO(b"a" * 4096), "会议.txt")}):
+            assert request.files["file"].stream._rolled, "超过UPLOAD_SPOOL_BYTES的上传写入临时文件"
+    print("✓ 上传接口")
+
+
+def main():
+    print("=== 上传会议记录测试 ===")
+    test_read_text()
+    test_docx_paragraphs()
+    test_decompressed_limits()
+    test_upload_endpoints()
+    print("\n✅ 测试通过")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+测试复制骨架渲染的文档与从空白模板构建的完全一致，且骨架不被修改
+"""
+
+import io
+import sys
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.bench_word_generator import SAMPLE, render_from_scratch
+from utils.heuristic_extractor import extract_meeting_fields
+from utils.word_generator import WordGenerator, get_document_skeleton
+
+CASES = [
+    extract_meeting_fields(SAMPLE),
+    {},
+    {
+        "meeting_topic": " 前后有空格 ",
+        "participants": [{"name": "张三"}, {"name": "李四"}],
+        "agenda_items": [{"topic": "预算", "responsible_person": "王五", "preparation": "报表"}],
+    },
+]
+
+
+def _parts(data):
+    archive = zipfile.ZipFile(io.BytesIO(data))
+    # core.xml带有创建时间，不参与比较
+    return {name: archive.read(name) for name in archive.namelist() if name != "docProps/core.xml"}
+
+
+def test_same_output_as_scratch():
+    """与每次重新构建的文档逐个部件比较"""
+    for meeting_data in CASES:
+        expected = _parts(render_from_scratch(meeting_data).getvalue())
+        actual = _parts(WordGenerator().generate_document(meeting_data).getvalue())
+        assert actual == expected
+    print("✓ 复制骨架渲染结果与原流程一致")
+
+
+def test_skeleton_untouched():
+    """填充内容只影响副本"""
+    skeleton, _ = get_document_skeleton()
+    before = len(skeleton.paragraphs)
+    WordGenerator().generate_document(CASES[0])
+    assert len(skeleton.paragraphs) == before
+    assert skeleton.tables[0].rows[0].cells[1].text == ""
+    print("✓ 骨架未被修改")
+
+
+def test_concurrent_render():
+    """多线程同时渲染，共享的部件只读"""
+    expected = _parts(WordGenerator().generate_document(CASES[0]).getvalue())
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda _: WordGenerator().generate_document(CASES[0]).getvalue(), range(32)))
+    assert all(_parts(data) == expected for data in results)
+    print("✓ 并发渲染结果一致")
+
+
+def main():
+    print("=== Word骨架渲染测试 ===")
+    test_same_output_as_scratch()
+    test_skeleton_untouched()
+    test_concurrent_render()
+    print("\n✅ 测试通过")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
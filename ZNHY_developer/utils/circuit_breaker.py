@@ -0,0 +1,156 @@
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, Optional
+from urllib.parse import urljoin
+
+import requests
+
+from utils.metrics import BREAKER_TRANSITIONS_TOTAL
+from utils.ollama_client import get_ollama_client
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """断路器打开期间拒绝调用后端"""
+
+
+def is_backend_failure(error: Exception) -> bool:
+    """连接失败、超时和5xx说明后端不可用；4xx等其他错误与后端健康无关"""
+    if isinstance(error, requests.HTTPError):
+        response = error.response
+        return response is None or response.status_code >= 500
+    return isinstance(error, requests.RequestException)
+
+
+class CircuitBreaker:
+    """后端调用的断路器
+
+    closed：正常调用，连续失败达到failure_threshold次后打开。
+    open：直接拒绝调用，由后台线程每隔probe_interval秒探测一次后端，探测成功后转为half_open。
+    half_open：只放行一个试探请求，成功则关闭，失败则重新打开。
+    failure_threshold为0时不启用断路器。
+    """
+
+    def __init__(self, name: str = "ollama", failure_threshold: Optional[int] = None,
+                 probe_interval: Optional[float] = None, probe: Optional[Callable[[], bool]] = None):
+        self.name = name
+        if failure_threshold is None:
+            failure_threshold = int(os.environ.get("OLLAMA_BREAKER_THRESHOLD", 5))
+        self.failure_threshold = failure_threshold
+        if probe_interval is None:
+            probe_interval = float(os.environ.get("OLLAMA_BREAKER_PROBE_INTERVAL", 5))
+        self.probe_interval = probe_interval
+        # 返回后端是否健康的探测函数；未提供时打开probe_interval秒后直接转为half_open
+        self.probe = probe
+        self.state = CLOSED
+        self._failures = 0
+        self._trial_in_flight = False
+        self._probe_thread = None
+        self._lock = threading.Lock()
+        self._closed_event = threading.Event()
+
+    def allow_request(self) -> bool:
+        """是否允许本次调用；half_open时只有第一个调用者获得试探机会"""
+        if self.failure_threshold <= 0:
+            return True
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._trial_in_flight = False
+            if self.state != CLOSED:
+                self._set_state(CLOSED)
+
+    def record_failure(self):
+        if self.failure_threshold <= 0:
+            return
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self.state == HALF_OPEN or (self.state == CLOSED and self._failures >= self.failure_threshold):
+                self._set_state(OPEN)
+                if self._probe_thread is None:
+                    self._probe_thread = threading.Thread(target=self._probe_loop, daemon=True,
+                                                          name=f"{self.name}-probe")
+                    self._probe_thread.start()
+
+    @contextmanager
+    def guard(self) -> Iterator[None]:
+        """包裹一次后端调用：断路器打开时抛出CircuitOpenError，并按调用结果更新状态"""
+        if not self.allow_request():
+            raise CircuitOpenError(f"{self.name}断路器已打开，跳过调用")
+        try:
+            yield
+        except Exception as e:
+            if is_backend_failure(e):
+                self.record_failure()
+            else:
+                self.record_success()
+            raise
+        self.record_success()
+
+    def wait_closed(self, timeout: Optional[float] = None) -> bool:
+        """等待断路器关闭，用于测试和压测"""
+        return self._closed_event.wait(timeout) if self.state != CLOSED else True
+
+    def _set_state(self, state: str):
+        # 调用方持有self._lock
+        logger.warning("%s断路器: %s -> %s", self.name, self.state, state)
+        self.state = state
+        if state == CLOSED:
+            self._closed_event.set()
+        else:
+            self._closed_event.clear()
+        BREAKER_TRANSITIONS_TOTAL.inc(state=state)
+
+    def _probe_loop(self):
+        """断路器打开期间定期探测后端，恢复后转为half_open，由下一个真实请求确认"""
+        while True:
+            self._closed_event.wait(self.probe_interval)
+            healthy = True
+            if self.probe is not None:
+                try:
+                    healthy = self.probe()
+                except Exception as e:
+                    logger.debug("%s健康探测失败: %s", self.name, e)
+                    healthy = False
+            with self._lock:
+                if self.state == OPEN and healthy:
+                    self._set_state(HALF_OPEN)
+                if self.state != OPEN:
+                    self._probe_thread = None
+                    return
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(url: str) -> CircuitBreaker:
+    """获取某个Ollama地址共享的断路器（首次调用时创建），探测使用同一服务的/api/version"""
+    breaker = _breakers.get(url)
+    if breaker is None:
+        with _breakers_lock:
+            breaker = _breakers.get(url)
+            if breaker is None:
+                version_url = urljoin(url, "/api/version")
+
+                def probe() -> bool:
+                    return get_ollama_client().get(version_url).ok
+
+                breaker = _breakers[url] = CircuitBreaker(probe=probe)
+    return breaker
@@ -0,0 +1,87 @@
+import io
+import threading
+import zipfile
+from typing import Dict, Iterator, List, Tuple
+
+from docx.opc.oxml import serialize_part_xml
+
+from utils.layout import MeetingData, RenderPlan, get_layout, paragraph_xml
+from utils.meeting_model import as_record
+from utils.zip_stream import ZipStream
+
+DOCUMENT_PART = "word/document.xml"
+
+# 各版式文档骨架中除正文外的各个部件，按python-docx保存时的顺序排列
+_static_entries: Dict[str, List[Tuple[str, bytes]]] = {}
+_static_lock = threading.Lock()
+
+
+def _get_static_entries(plan: RenderPlan) -> List[Tuple[str, bytes]]:
+    """保存一次文档骨架，取出固定不变的部件内容"""
+    entries = _static_entries.get(plan.name)
+    if entries is None:
+        with _static_lock:
+            entries = _static_entries.get(plan.name)
+            if entries is None:
+                buffer = io.BytesIO()
+                plan.new_document().save(buffer)
+                with zipfile.ZipFile(buffer) as archive:
+                    # 正文每次单独生成，这里只记录它在归档中的位置
+                    entries = _static_entries[plan.name] = [
+                        (name, archive.read(name) if name != DOCUMENT_PART else b"")
+                        for name in archive.namelist()
+                    ]
+    return entries
+
+
+class StreamingDocxWriter:
+    """边生成边输出的会议记录文档
+
+    与WordGenerator使用同一份编译好的版式，但会议内容部分不再构建python-docx对象树：
+    document.xml的段落逐个写入ZIP流，每累积flush_size字节就交给HTTP响应，
+    内存占用不再随议题数量增长。
+    """
+
+    def __init__(self, flush_size: int = 64 * 1024, layout: str = "table"):
+        self.flush_size = flush_size
+        self.plan = get_layout(layout)
+
+    def _document_head_tail(self, meeting_data: MeetingData) -> Tuple[bytes, bytes]:
+        """渲染骨架部分（标题、会议信息等），以sectPr为界拆成正文前后两部分"""
+        document = self.plan.new_document()
+        self.plan.fill(document, meeting_data)
+        xml = serialize_part_xml(document.element)
+        split_at = xml.rindex(b"<w:sectPr")
+        return xml[:split_at], xml[split_at:]
+
+    def iter_document(self, meeting_data: MeetingData) -> Iterator[bytes]:
+        """逐段产生.docx文件的字节"""
+        meeting_data = as_record(meeting_data)
+        head, tail = self._document_head_tail(meeting_data)
+        stream = ZipStream()
+        for name, data in _get_static_entries(self.plan):
+            if name != DOCUMENT_PART:
+                chunk = stream.add(name, data)
+                if chunk:
+                    yield chunk
+                continue
+
+            with stream.open(DOCUMENT_PART) as entry:
+                entry.write(head)
+                pending = 0
+                for paragraph in self.plan.iter_flow(meeting_data):
+                    xml = paragraph_xml(paragraph).encode("utf-8")
+                    entry.write(xml)
+                    pending += len(xml)
+                    if pending >= self.flush_size:
+                        pending = 0
+                        chunk = stream.drain()
+                        if chunk:
+                            yield chunk
+                entry.write(tail)
+        yield stream.close()
+
+    def render(self, meeting_data: MeetingData) -> bytes:
+        """一次性取得完整文档字节"""
+        return b"".join(self.iter_document(meeting_data))
+
@@ -0,0 +1,166 @@
+import re
+from typing import Any, Dict, Optional
+
+from utils.roster import Roster
+
+# 关键字之后的取值部分：可选冒号、空白，然后取到行尾
+_VALUE = r'[:：]?\s*([^\n]+)'
+
+# 所有规则在导入时编译一次；每条规则都以固定字符开头，re可以在C层快速定位，找到第一处即返回
+_TOPIC_RE = re.compile(r'主题' + _VALUE)
+_TOPIC_FALLBACK_RE = re.compile(r'会议' + _VALUE)
+_TIME_RE = re.compile(r'时间' + _VALUE)
+_PLACE_RE = re.compile(r'地点' + _VALUE)
+_PLACE_FALLBACK_RE = re.compile(r'(会议室\d+|办公室|线上会议)')
+_PARTICIPANTS_RE = re.compile(r'参会人员' + _VALUE)
+_AGENDA_RE = re.compile(r'议[题程]' + _VALUE)
+_AGENDA_FALLBACK_RE = re.compile(r'(讨论|议题|事项)' + _VALUE)
+_PRE_RE = re.compile(r'会前准备事项' + _VALUE)
+_DURATION_RE = re.compile(r'时长' + _VALUE)
+_DURATION_FALLBACK_RE = re.compile(r'约(\d+小时)')
+
+# 日期兜底规则 (\d{4}-\d{2}-\d{2}.*?)|(\d{1,2}月\d{1,2}日.*?)|(下[周月]\w+.*?)
+# 原规则以\d开头，re只能逐字符尝试；这里拆成三条以固定字符定位的规则，再补查前面的数字
+_DATE_ISO_RE = re.compile(r'-\d{2}-\d{2}')
+_DATE_CN_RE = re.compile(r'月\d{1,2}日')
+_DATE_NEXT_RE = re.compile(r'下[周月]\w+')
+
+# 参会人员字段的前缀词
+_PARTICIPANTS_PREFIX_RE = re.compile(r'^(包括|有|为|以及)\s*')
+# 没有"参会人员"字段时的人名兜底匹配
+_NAME_RE = re.compile(r'[\u4e00-\u9fa5]{2,4}(?:[、,，和以及][\u4e00-\u9fa5]{2,4})*')
+_NAME_SPLIT_RE = re.compile(r'[、,，和以及]')
+
+
+def _search_date(text: str) -> Optional[str]:
+    """查找第一个日期表达，结果与原日期兜底规则的re.search一致"""
+    candidates = []
+
+    # yyyy-mm-dd：定位"-mm-dd"后检查前面4位数字（\d与str.isdecimal同为Unicode Nd类）
+    pos = 0
+    while True:
+        match = _DATE_ISO_RE.search(text, pos)
+        if match is None:
+            break
+        start = match.start() - 4
+        if start >= 0 and text[start:match.start()].isdecimal():
+            candidates.append((start, text[start:match.end()]))
+            break
+        pos = match.start() + 1
+
+    # m月d日：定位"月d日"后向前取1~2位数字
+    pos = 0
+    while True:
+        match = _DATE_CN_RE.search(text, pos)
+        if match is None:
+            break
+        anchor = match.start()
+        if anchor >= 2 and text[anchor - 2:anchor].isdecimal():
+            candidates.append((anchor - 2, text[anchor - 2:match.end()]))
+            break
+        if anchor >= 1 and text[anchor - 1].isdecimal():
+            candidates.append((anchor - 1, text[anchor - 1:match.end()]))
+            break
+        pos = anchor + 1
+
+    match = _DATE_NEXT_RE.search(text)
+    if match:
+        candidates.append((match.start(), match.group(0)))
+
+    return min(candidates)[1] if candidates else None
+
+
+def _split_participants(participants_str: str):
+    """拆分"参会人员"字段中的姓名"""
+    # 移除前缀常见词如"包括"、"有"、"为"、"以及"
+    participants_str = _PARTICIPANTS_PREFIX_RE.sub('', participants_str)
+    # 支持顿号、逗号、中文逗号、"和"、"以及"分隔，并且去掉可能的空格
+    participants_str = participants_str.replace('，', '、').replace(',', '、').replace('和', '、').replace('以及', '、')
+    return [p.strip() for p in participants_str.split('、') if p.strip()]
+
+
+def _guess_names(text: str):
+    """没有明确的参会人员时，匹配所有可能的人名"""
+    # 匹配结果只含汉字和分隔符，用分隔符拼接后一次拆分，与逐个拆分的结果相同
+    all_names = [p for p in _NAME_SPLIT_RE.split('、'.join(_NAME_RE.findall(text))) if p]
+    # 去重，按第一次出现的顺序排列，结果不受字符串哈希随机化影响
+    return list(dict.fromkeys(all_names))
+
+
+def extract_meeting_fields(text: str, roster: Optional[Roster] = None) -> Dict[str, Any]:
+    """从会议文本中启发式提取会议信息（不依赖大模型）
+
+    结果与MeetingParser原先逐条re.search的实现完全一致：规则只编译一次，
+    兜底规则只在主规则没有命中时才执行，不再计算未使用的会议内容字段。
+    传入有员工的花名册时，参会人员按花名册中的姓名在文本里出现的顺序提取。
+    """
+    # 会议主题
+    theme_match = _TOPIC_RE.search(text) or _TOPIC_FALLBACK_RE.search(text)
+    meeting_theme = theme_match.group(1).strip() if theme_match else "会议讨论"
+
+    # 会议时间
+    time_match = _TIME_RE.search(text)
+    if time_match:
+        meeting_time = time_match.group(1).strip()
+    else:
+        meeting_date = _search_date(text)
+        meeting_time = meeting_date.strip() if meeting_date else "待定"
+
+    # 会议地点
+    location_match = _PLACE_RE.search(text) or _PLACE_FALLBACK_RE.search(text)
+    meeting_location = location_match.group(1).strip() if location_match else "公司会议室"
+
+    # 参会人员
+    participants_match = _PARTICIPANTS_RE.search(text)
+    participants = []
+    if roster:
+        # 先在"参会人员"字段中找，没有再扫描全文
+        if participants_match:
+            participants = roster.find_names(participants_match.group(1))
+        if not participants:
+            participants = roster.find_names(text)
+    if not participants and participants_match:
+        participants = _split_participants(participants_match.group(1).strip())
+    if not participants:
+        participants = _guess_names(text)
+    if not participants:
+        participants = ["参会人员1", "参会人员2"]
+
+    # 议程
+    agenda_matches = _AGENDA_RE.findall(text)
+    if agenda_matches:
+        topic_titles = [topic.strip() for topic in agenda_matches]
+    else:
+        agenda_match = _AGENDA_FALLBACK_RE.search(text)
+        topic_titles = [agenda_match.group(0).strip() if agenda_match else "会议议程"]
+    topics = [{
+        "title": title,
+        "leader": participants[0],
+        "preparation": "准备相关资料"
+    } for title in topic_titles]
+
+    # 会前准备事项
+    pre_meeting_preparations = ""
+    pre_match = _PRE_RE.search(text)
+    if pre_match:
+        pre_meeting_preparations = pre_match.group(1).strip()
+    elif "提前准备" in text:
+        pre_meeting_preparations = "提前准备相关资料"
+
+    # 会议时长
+    duration = "约1小时"
+    duration_match = _DURATION_RE.search(text) or _DURATION_FALLBACK_RE.search(text)
+    if duration_match:
+        duration = duration_match.group(1).strip()
+
+    return {
+        "meeting_topic": meeting_theme,
+        "meeting_time": meeting_time,
+        "meeting_location": meeting_location,
+        "host": participants[0],
+        "participants": participants,
+        "participant_count": len(participants),
+        "meeting_duration": duration,
+        "topics": topics,
+        "pre_meeting_preparations": pre_meeting_preparations
+    }
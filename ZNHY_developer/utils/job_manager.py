@@ -0,0 +1,133 @@
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class JobQueueFullError(Exception):
+    """待处理任务过多，拒绝新的提交"""
+
+
+class Job:
+    """一次后台生成任务"""
+
+    def __init__(self, job_id: str):
+        self.job_id = job_id
+        self.status = "queued"  # queued / running / done / failed
+        self.result: Optional[bytes] = None
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        # 生成函数记录的附加信息，如是否为超过截止时间的临时结果
+        self.info: Dict[str, Any] = {}
+        self._done = threading.Event()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """等待任务结束，返回是否在超时前完成"""
+        return self._done.wait(timeout)
+
+    @property
+    def finished(self) -> bool:
+        return self._done.is_set()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "status": self.status,
+            "error": self.error,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+            "provisional": bool(self.info.get("provisional"))
+        }
+
+
+class JobManager:
+    """有界工作线程池上的提交/查询/下载任务管理
+
+    同时最多max_workers个任务在执行，另有max_pending个任务可以排队，
+    超出时提交直接失败。任务结果在结束后保留retention秒，之后被清理；
+    保留的已结束任务超过max_retained个或结果合计超过max_retained_bytes字节时，先结束的任务提前被清理。
+    """
+
+    def __init__(self, max_workers: int = 4, max_pending: int = 32, retention: float = 600,
+                 max_retained: int = 256, max_retained_bytes: int = 64 * 1024 * 1024):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.retention = retention
+        self.max_retained = max_retained
+        self.max_retained_bytes = max_retained_bytes
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="meeting-job")
+        self._jobs: Dict[str, Job] = {}
+        # 已结束的任务按结束顺序排列，值为结果的字节数
+        self._finished: "OrderedDict[str, int]" = OrderedDict()
+        self._retained_bytes = 0
+        self._active = 0
+        self._lock = threading.Lock()
+
+    def submit(self, fn: Callable[..., bytes], *args, **kwargs) -> Job:
+        """提交任务，返回Job；排队已满时抛出JobQueueFullError"""
+        with self._lock:
+            self._purge_expired()
+            if self._active >= self.max_workers + self.max_pending:
+                raise JobQueueFullError("待处理任务过多")
+            job = Job(uuid.uuid4().hex)
+            self._jobs[job.job_id] = job
+            self._active += 1
+        self._executor.submit(self._run, job, fn, args, kwargs)
+        return job
+
+    def _run(self, job: Job, fn: Callable[..., bytes], args, kwargs):
+        job.status = "running"
+        try:
+            job.result = fn(*args, **kwargs)
+            job.status = "done"
+        except Exception as e:
+            logger.exception("任务 %s 失败", job.job_id)
+            job.error = str(e)
+            job.status = "failed"
+        finally:
+            job.finished_at = time.time()
+            with self._lock:
+                self._active -= 1
+                if job.job_id in self._jobs:
+                    self._retain(job)
+            job._done.set()
+
+    def _retain(self, job: Job):
+        """记录已结束的任务，超过数量或字节上限时清理最早结束的任务（调用方需持有锁）"""
+        size = len(job.result or b"")
+        self._finished[job.job_id] = size
+        self._retained_bytes += size
+        while len(self._finished) > self.max_retained or self._retained_bytes > self.max_retained_bytes:
+            job_id, evicted = self._finished.popitem(last=False)
+            self._retained_bytes -= evicted
+            self._jobs.pop(job_id, None)
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """查询任务，不存在或已过保留期时返回None"""
+        with self._lock:
+            self._purge_expired()
+            return self._jobs.get(job_id)
+
+    def discard(self, job_id: str):
+        """立即丢弃任务及其结果"""
+        with self._lock:
+            self._jobs.pop(job_id, None)
+            self._retained_bytes -= self._finished.pop(job_id, 0)
+
+    def _purge_expired(self):
+        """清理超过保留期的已结束任务（调用方需持有锁）"""
+        deadline = time.time() - self.retention
+        expired = [job_id for job_id, job in self._jobs.items()
+                   if job.finished_at is not None and job.finished_at < deadline]
+        for job_id in expired:
+            del self._jobs[job_id]
+            self._retained_bytes -= self._finished.pop(job_id, 0)
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait)
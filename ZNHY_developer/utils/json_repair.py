@@ -0,0 +1,201 @@
+import json
+import re
+from typing import Any, List, Optional, Tuple
+
+# 字符串定界符：英文双引号、单引号，以及小模型常误用的中文引号
+_QUOTES = {'"': '"', "'": "'", '“': '”', '‘': '’'}
+# 字符串之外的全角标点
+_FULL_WIDTH = {'：': ':', '，': ','}
+# 字符串之外的裸词
+_LITERALS = {
+    "null": "null", "None": "null", "NULL": "null", "undefined": "null", "NaN": "null",
+    "true": "true", "True": "true", "TRUE": "true",
+    "false": "false", "False": "false", "FALSE": "false",
+}
+_NUMBER_RE = re.compile(r'-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][+-]?\d+)?')
+_ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', 'b': '\b', 'f': '\f', '/': '/', '\\': '\\', '"': '"', "'": "'"}
+# 字符串结束引号之后可能出现的字符
+_AFTER_STRING = ',:}]，：'
+# 未加引号的键、值在这些字符处结束
+_KEY_STOP = ':：{}[],，"\n'
+_VALUE_STOP = ',，}]"\n\r'
+
+
+def _hex4(text: str, i: int) -> Optional[int]:
+    """text[i:i + 4]为4位十六进制数时返回其值"""
+    digits = text[i:i + 4]
+    if len(digits) == 4 and all(c in '0123456789abcdefABCDEF' for c in digits):
+        return int(digits, 16)
+    return None
+
+
+def _read_string(text: str, i: int) -> Tuple[str, int]:
+    """读取从text[i]的引号开始的字符串，返回(内容, 结束引号之后的位置)
+
+    字符串内部未转义的引号，如果后面不是逗号、冒号或括号，视为字符串内容。
+    """
+    closer = _QUOTES[text[i]]
+    n = len(text)
+    buf = []
+    j = i + 1
+    while j < n:
+        ch = text[j]
+        if ch == '\\' and j + 1 < n:
+            nxt = text[j + 1]
+            if nxt == 'u':
+                code = _hex4(text, j + 2)
+                if code is not None:
+                    j += 6
+                    if 0xD800 <= code < 0xDC00 and text.startswith('\\u', j):
+                        # 代理对（如emoji）合并为一个字符
+                        low = _hex4(text, j + 2)
+                        if low is not None and 0xDC00 <= low < 0xE000:
+                            code = 0x10000 + ((code - 0xD800) << 10) + (low - 0xDC00)
+                            j += 6
+                    # 不成对的代理项无法写入docx和缓存，与json.loads的严格模式不同，这里替换为U+FFFD
+                    buf.append('\ufffd' if 0xD800 <= code < 0xE000 else chr(code))
+                    continue
+            buf.append(_ESCAPES.get(nxt, nxt))
+            j += 2
+            continue
+        if ch == closer:
+            k = j + 1
+            while k < n and text[k] in ' \t\r':
+                k += 1
+            # 后面是逗号、冒号、括号、换行或结尾时才是结束引号；隔着空白又出现引号时是缺少逗号
+            if k >= n or text[k] in _AFTER_STRING or text[k] == '\n' or (k > j + 1 and text[k] in _QUOTES):
+                return ''.join(buf), j + 1
+        buf.append(ch)
+        j += 1
+    # 输出被截断，字符串没有结束
+    return ''.join(buf), n
+
+
+def _read_bare(text: str, i: int, stops: str) -> Tuple[str, int]:
+    """读取未加引号的内容，直到遇到stops中的字符或注释（网址中的//不算注释）"""
+    n = len(text)
+    j = i
+    while j < n and text[j] not in stops:
+        if text.startswith('/*', j) or (text.startswith('//', j) and text[j - 1] in ' \t'):
+            break
+        j += 1
+    return text[i:j].strip(), j
+
+
+def _bare_value(token: str) -> str:
+    if token in _LITERALS:
+        return _LITERALS[token]
+    if _NUMBER_RE.fullmatch(token):
+        return token
+    # 未加引号的文字按字符串处理
+    return json.dumps(token, ensure_ascii=False)
+
+
+def repair_json(text: str) -> Any:
+    """单遍扫描修复并解析大模型输出的JSON对象
+
+    从第一个'{'开始，到对应的'}'结束，之前和之后的说明文字、代码块标记都被忽略。
+    扫描时区分字符串内外，只修复字符串之外的问题：中文引号和单引号、全角冒号逗号、
+    Python的None/True/False、未加引号的键和值、缺少或多余的逗号、注释，
+    以及输出被截断时未闭合的字符串和括号。无法修复时抛出ValueError。
+    """
+    start = text.find('{')
+    if start == -1:
+        raise ValueError("未找到JSON结构")
+
+    out: List[str] = []
+    stack: List[str] = []
+    # 当前位置期望的内容：key / colon / value / comma
+    state = 'value'
+    i = start
+    n = len(text)
+    while i < n:
+        c = text[i]
+        if c in ' \t\r\n':
+            i += 1
+            continue
+        if c == '/' and text.startswith('//', i):
+            end = text.find('\n', i)
+            i = n if end == -1 else end
+            continue
+        if c == '/' and text.startswith('/*', i):
+            end = text.find('*/', i + 2)
+            i = n if end == -1 else end + 2
+            continue
+        c = _FULL_WIDTH.get(c, c)
+
+        if c in '}]':
+            if out and out[-1] == ',':
+                # 多余的逗号
+                out.pop()
+            if state == 'colon':
+                out.append(':null')
+            elif state == 'value' and out and out[-1] == ':':
+                out.append('null')
+            # 括号不匹配时按打开的括号闭合
+            out.append('}' if stack[-1] == '{' else ']')
+            stack.pop()
+            i += 1
+            state = 'comma'
+            if not stack:
+                break
+            continue
+        if c == ',':
+            if state == 'comma':
+                out.append(',')
+                state = 'key' if stack[-1] == '{' else 'value'
+            # 其他位置的逗号是重复或多余的，直接跳过
+            i += 1
+            continue
+        if c == ':':
+            if state == 'colon':
+                out.append(':')
+                state = 'value'
+            i += 1
+            continue
+
+        # 以下是一个键或值的开始
+        if state == 'comma':
+            # 缺少逗号
+            out.append(',')
+            state = 'key' if stack[-1] == '{' else 'value'
+        elif state == 'colon':
+            # 缺少冒号
+            out.append(':')
+            state = 'value'
+
+        if c in '{[':
+            if state == 'key':
+                raise ValueError(f"位置{i}处期望键名")
+            out.append(c)
+            stack.append(c)
+            state = 'key' if c == '{' else 'value'
+            i += 1
+            continue
+
+        if c in _QUOTES:
+            value, i = _read_string(text, i)
+            out.append(json.dumps(value, ensure_ascii=False))
+        else:
+            token, j = _read_bare(text, i, _KEY_STOP if state == 'key' else _VALUE_STOP)
+            if j == i:
+                # 无法识别的字符
+                i += 1
+                continue
+            i = j
+            out.append(json.dumps(token, ensure_ascii=False) if state == 'key' else _bare_value(token))
+        state = 'colon' if state == 'key' else 'comma'
+
+    # 输出被截断：补全缺少的值并闭合所有括号
+    if state == 'colon':
+        out.append(':null')
+    elif state == 'value' and out and out[-1] == ':':
+        out.append('null')
+    if out and out[-1] == ',':
+        out.pop()
+    for opener in reversed(stack):
+        out.append('}' if opener == '{' else ']')
+    try:
+        return json.loads(''.join(out))
+    except json.JSONDecodeError as e:
+        raise ValueError(f"JSON修复失败: {e}") from e
@@ -0,0 +1,72 @@
+from typing import Optional
+
+
+class IncrementalJSONScanner:
+    """增量扫描流式文本，定位第一个完整的顶层JSON对象
+
+    逐块喂入大模型的输出，跳过第一个'{'之前的内容（如```json标记），
+    按括号深度追踪对象的闭合，并正确忽略字符串中的括号和转义引号。
+    顶层对象一旦闭合，feed()返回True，调用方即可中止生成。
+    """
+
+    def __init__(self):
+        self._parts = []
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self.started = False
+        self.complete = False
+        self.consumed = 0  # 已扫描的字符总数
+
+    def feed(self, chunk: str) -> bool:
+        """喂入一段文本，返回顶层JSON对象是否已经闭合"""
+        if self.complete or not chunk:
+            return self.complete
+
+        start = 0
+        if not self.started:
+            start = chunk.find('{')
+            if start == -1:
+                self.consumed += len(chunk)
+                return False
+            self.started = True
+
+        depth = self._depth
+        in_string = self._in_string
+        escape = self._escape
+        end = None
+        for i in range(start, len(chunk)):
+            char = chunk[i]
+            if in_string:
+                if escape:
+                    escape = False
+                elif char == '\\':
+                    escape = True
+                elif char == '"':
+                    in_string = False
+            elif char == '"':
+                in_string = True
+            elif char == '{':
+                depth += 1
+            elif char == '}':
+                depth -= 1
+                if depth == 0:
+                    end = i + 1
+                    break
+
+        self._depth = depth
+        self._in_string = in_string
+        self._escape = escape
+        if end is None:
+            self._parts.append(chunk[start:])
+            self.consumed += len(chunk)
+        else:
+            self._parts.append(chunk[start:end])
+            self.consumed += end
+            self.complete = True
+        return self.complete
+
+    @property
+    def text(self) -> Optional[str]:
+        """已闭合的JSON对象文本；尚未闭合时返回None"""
+        return "".join(self._parts) if self.complete else None
@@ -0,0 +1,398 @@
+import copy
+import re
+import string
+import threading
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+from xml.sax.saxutils import escape
+
+from docx import Document
+from docx.enum.text import WD_ALIGN_PARAGRAPH
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls, qn
+from docx.shared import Inches, Pt
+
+from utils.meeting_model import INVALID_XML_CHARS_RE, MeetingRecord, Topic, as_record
+
+# 版式说明：按文档中的先后顺序排列的节点，每个节点是一个字典，type取值：
+#   style      修改样式（默认Normal）的字体名称font、字号size，east_asia为真时同时设置中文字体
+#   paragraph  段落：text为文字（可以是"{字段}"模板），bold加粗；多个不同格式的片段用
+#              runs=((文字, 是否加粗), ...)；可选style、align（center）、size；
+#              when为字段名，字段为空时不输出该段落；不写文字时为空行
+#   table      表格：rows每行一个元组，只有一个单元格时合并整行；cols列数，style表格样式，
+#              row_height行高（英寸），compact为真时单元格段落不留段前段后间距
+#   topics     议题列表：每个议题输出加粗的title，lines中字段非空的行，最后一个空行；
+#              模板中可用议题的字段和序号{index}
+#
+# 编译时，从文档开头到第一个数量或有无取决于会议内容的节点（topics或带when的段落）为止的部分
+# 只构建一次作为骨架，其中的模板在每次渲染时填入；之后的部分逐段生成，由paragraph_xml统一输出。
+
+# 表格版式：标题下是合并单元格的会议信息表（WordGenerator、流式写入和/generate使用）
+TABLE_LAYOUT = (
+    {"type": "style", "font": "微软雅黑", "east_asia": True},
+    {"type": "paragraph", "text": "会议记录", "style": "Title", "align": "center", "size": 16, "bold": True},
+    {"type": "table", "cols": 4, "style": "Table Grid", "row_height": 0.3, "compact": True, "rows": (
+        ("会议主题", "{meeting_topic}", "主持人", "{host}"),
+        ("会议地点：{meeting_location}",),
+        ("参会人员：{participants}",),
+        ("会议时长：{meeting_duration}",),
+        ("会议内容记录",),
+    )},
+    {"type": "paragraph"},
+    {"type": "topics", "title": "议题{index}：{title}", "lines": ("负责人：{leader}", "会前准备：{preparation}")},
+    {"type": "paragraph", "text": "会前准备事项：{pre_meeting_preparations}", "bold": True,
+     "when": "pre_meeting_preparations"},
+)
+
+# 标题版式：每项会议信息一个一级标题（meeting_template.create_meeting_record使用）
+HEADINGS_LAYOUT = (
+    {"type": "style", "font": "宋体", "size": 12},
+    {"type": "paragraph", "text": "会议记录", "align": "center", "size": 18, "bold": True},
+    {"type": "paragraph"},
+    {"type": "paragraph", "text": "会议主题", "style": "Heading 1"},
+    {"type": "paragraph", "text": "{meeting_topic}"},
+    {"type": "paragraph"},
+    {"type": "paragraph", "text": "主持人", "style": "Heading 1"},
+    {"type": "paragraph", "text": "{host}"},
+    {"type": "paragraph"},
+    {"type": "paragraph", "text": "会议地点", "style": "Heading 1"},
+    {"type": "paragraph", "text": "{meeting_location}"},
+    {"type": "paragraph"},
+    {"type": "paragraph", "text": "参会人员", "style": "Heading 1"},
+    {"type": "paragraph", "text": "{participants}"},
+    {"type": "paragraph"},
+    {"type": "paragraph", "text": "会议时长", "style": "Heading 1"},
+    {"type": "paragraph", "text": "{meeting_duration}"},
+    {"type": "paragraph"},
+    {"type": "paragraph", "text": "会议内容记录", "style": "Heading 1"},
+    {"type": "paragraph"},
+    {"type": "topics", "title": "议题{index}：{title}",
+     "lines": ("负责人：{leader}", "会前准备：{preparation}", "参与人员：{participants}")},
+    {"type": "paragraph", "runs": (("会前准备事项：", True), (" {pre_meeting_preparations}", False)),
+     "when": "pre_meeting_preparations"},
+)
+
+LAYOUTS = {
+    "table": TABLE_LAYOUT,
+    "headings": HEADINGS_LAYOUT,
+}
+
+_ALIGNMENTS = {"center": WD_ALIGN_PARAGRAPH.CENTER}
+_FLOW_PARAGRAPH_KEYS = {"type", "text", "bold", "runs", "when"}
+
+# 与python-docx一致：制表符写成<w:tab/>，换行和回车写成<w:br/>
+_RUN_SPLIT_RE = re.compile(r"(\t|[\r\n])")
+
+# 逐段生成的段落：((文字, 是否加粗), ...)，空行为None
+FlowParagraph = Optional[Tuple[Tuple[str, bool], ...]]
+# 渲染的输入：MeetingRecord，或者先规范化为MeetingRecord的字典
+MeetingData = Union[MeetingRecord, Dict[str, Any]]
+
+
+class _TopicFields:
+    """议题模板取值：议题字段和序号"""
+
+    __slots__ = ("topic", "index")
+
+    def __init__(self, topic: Topic, index: int):
+        self.topic = topic
+        self.index = index
+
+    def __getitem__(self, key):
+        return self.index if key == "index" else self.topic[key]
+
+
+def _template_fields(template: str) -> List[str]:
+    return [field for _, field, _, _ in string.Formatter().parse(template) if field is not None]
+
+
+def _run_xml(text: str) -> str:
+    """把一段文字转换为w:r内部的元素，与python-docx的Run.text写法一致"""
+    if INVALID_XML_CHARS_RE.search(text):
+        raise ValueError("All strings must be XML compatible: Unicode or ASCII, no NULL bytes or control characters")
+    parts = []
+    for piece in _RUN_SPLIT_RE.split(text):
+        if not piece:
+            continue
+        if piece == "\t":
+            parts.append("<w:tab/>")
+        elif piece in "\r\n":
+            parts.append("<w:br/>")
+        elif len(piece.strip()) < len(piece):
+            parts.append(f'<w:t xml:space="preserve">{escape(piece)}</w:t>')
+        else:
+            parts.append(f"<w:t>{escape(piece)}</w:t>")
+    return "".join(parts)
+
+
+def paragraph_xml(paragraph: FlowParagraph) -> str:
+    """生成逐段输出部分一个段落的XML，与python-docx逐个添加段落和片段的结果相同"""
+    if paragraph is None:
+        return "<w:p/>"
+    runs = []
+    for text, bold in paragraph:
+        content = _run_xml(text)
+        rpr = "<w:rPr><w:b/></w:rPr>" if bold else ""
+        runs.append(f"<w:r>{rpr}{content}</w:r>" if content or rpr else "<w:r/>")
+    return f"<w:p>{''.join(runs)}</w:p>"
+
+
+def _node_runs(node: Dict[str, Any]) -> Tuple[Tuple[str, bool], ...]:
+    if "runs" in node:
+        return tuple((text, bool(bold)) for text, bold in node["runs"])
+    if node.get("text"):
+        return ((node["text"], bool(node.get("bold"))),)
+    return ()
+
+
+class RenderPlan:
+    """编译后的版式
+
+    skeleton_ops在空白文档上构建骨架，fill_ops向骨架副本填入会议信息，
+    flow_ops生成骨架之后逐段输出的段落。
+    """
+
+    def __init__(self, name: str, skeleton_ops: List[Callable], fill_ops: List[Callable],
+                 flow_ops: List[Callable]):
+        self.name = name
+        self.skeleton_ops = skeleton_ops
+        self.fill_ops = fill_ops
+        self.flow_ops = flow_ops
+        self._skeleton = None
+        self._skeleton_lock = threading.Lock()
+
+    def build(self, document):
+        """在空白文档上构建与会议内容无关的骨架"""
+        for op in self.skeleton_ops:
+            op(document)
+        return document
+
+    def skeleton(self):
+        """获取进程内共享的文档骨架，返回(文档, 复制时共享的部件)"""
+        if self._skeleton is None:
+            with self._skeleton_lock:
+                if self._skeleton is None:
+                    document = self.build(Document())
+                    # 除正文外的部件（样式、主题、字体表等）构建完成后不再修改，复制时直接共享
+                    shared = {id(part): part for part in document.part.package.iter_parts()
+                              if part is not document.part}
+                    self._skeleton = (document, shared)
+        return self._skeleton
+
+    def new_document(self):
+        """复制文档骨架，只深拷贝正文部件"""
+        document, shared = self.skeleton()
+        # deepcopy会把新对象记入memo，每次使用共享表的副本
+        part = copy.deepcopy(document.part, dict(shared))
+        return part.document
+
+    def fill(self, document, meeting: MeetingData):
+        """在骨架副本中填入会议信息"""
+        if not self.fill_ops:
+            return
+        record = as_record(meeting)
+        paragraphs = document.paragraphs
+        tables = document.tables
+        for op in self.fill_ops:
+            op(paragraphs, tables, record)
+
+    def iter_flow(self, meeting: MeetingData) -> Iterator[FlowParagraph]:
+        """按顺序生成骨架之后的段落"""
+        record = as_record(meeting)
+        for op in self.flow_ops:
+            yield from op(record)
+
+    def append_flow(self, document, meeting: MeetingData):
+        """把逐段输出的部分一次解析后追加到正文末尾（sectPr之前）"""
+        xml = "".join(paragraph_xml(paragraph) for paragraph in self.iter_flow(meeting))
+        if not xml:
+            return
+        body = document.element.body
+        fragment = parse_xml(f"<w:body {nsdecls('w')}>{xml}</w:body>")
+        sect_pr = body.sectPr
+        for element in list(fragment):
+            if sect_pr is not None:
+                sect_pr.addprevious(element)
+            else:
+                body.append(element)
+
+    def render(self, document, meeting: MeetingData):
+        """在骨架副本上渲染一份会议记录"""
+        record = as_record(meeting)
+        self.fill(document, record)
+        self.append_flow(document, record)
+        return document
+
+
+def _compile_style(node):
+    style_name = node.get("name", "Normal")
+    font, size, east_asia = node.get("font"), node.get("size"), node.get("east_asia")
+
+    def op(document):
+        style = document.styles[style_name]
+        if font:
+            style.font.name = font
+            if east_asia:
+                style._element.rPr.rFonts.set(qn('w:eastAsia'), font)
+        if size:
+            style.font.size = Pt(size)
+    return op
+
+
+def _format_run(run, size, bold):
+    if size:
+        run.font.size = Pt(size)
+    if bold:
+        run.bold = True
+
+
+def _compile_fixed_paragraph(node, index, fill_ops):
+    runs = _node_runs(node)
+    style, size = node.get("style"), node.get("size")
+    alignment = _ALIGNMENTS[node["align"]] if node.get("align") else None
+    dynamic = any(_template_fields(text) for text, _ in runs)
+
+    def op(document):
+        paragraph = document.add_paragraph(style=style)
+        if not dynamic:
+            for text, bold in runs:
+                _format_run(paragraph.add_run(text), size, bold)
+        if alignment is not None:
+            paragraph.alignment = alignment
+
+    if dynamic:
+        def fill(paragraphs, tables, record):
+            paragraph = paragraphs[index]
+            for text, bold in runs:
+                text = text.format_map(record)
+                # 与add_paragraph(text)一致：文字为空时不添加片段
+                if text:
+                    _format_run(paragraph.add_run(text), size, bold)
+        fill_ops.append(fill)
+    return op
+
+
+def _compile_table(node, index, fill_ops):
+    rows, cols = node["rows"], node["cols"]
+    table_style, compact = node.get("style"), node.get("compact")
+    row_height = Inches(node["row_height"]) if node.get("row_height") else None
+    labels, templates = [], []
+    for r, row in enumerate(rows):
+        if len(row) not in (1, cols):
+            raise ValueError(f"表格第{r + 1}行应有1个或{cols}个单元格")
+        for c, text in enumerate(row):
+            (templates if _template_fields(text) else labels).append((r, c, text))
+
+    def op(document):
+        table = document.add_table(rows=len(rows), cols=cols)
+        if table_style:
+            table.style = table_style
+        if row_height is not None:
+            for row in table.rows:
+                row.height = row_height
+        # 只有一个单元格的行合并整行
+        for r, row in enumerate(rows):
+            if len(row) == 1:
+                cells = table.rows[r].cells
+                cells[0].merge(cells[cols - 1])
+        for r, c, text in labels:
+            if text:
+                table.rows[r].cells[c].text = text
+        if compact:
+            for row in table.rows:
+                for cell in row.cells:
+                    for paragraph in cell.paragraphs:
+                        paragraph.paragraph_format.space_after = Pt(0)
+                        paragraph.paragraph_format.space_before = Pt(0)
+
+    if templates:
+        def fill(paragraphs, tables, record):
+            table_rows = tables[index].rows
+            # 直接在已设置好段落格式的空段落中追加文字（cell.text会清掉段落格式）
+            for r, c, text in templates:
+                table_rows[r].cells[c].paragraphs[0].add_run(text.format_map(record))
+        fill_ops.append(fill)
+    return op
+
+
+def _compile_flow_paragraph(node):
+    unsupported = set(node) - _FLOW_PARAGRAPH_KEYS
+    if unsupported:
+        raise ValueError(f"逐段输出的段落不支持{', '.join(sorted(unsupported))}，请放在骨架部分")
+    runs = _node_runs(node)
+    when = node.get("when")
+
+    def op(record):
+        if when and not record[when]:
+            return
+        if not runs:
+            yield None
+            return
+        yield tuple((text.format_map(record), bold) for text, bold in runs)
+    return op
+
+
+def _compile_topics(node):
+    title = node["title"]
+    lines = []
+    for line in node.get("lines", ()):
+        fields = _template_fields(line)
+        if len(fields) != 1:
+            raise ValueError(f"议题行只能引用一个字段: {line}")
+        lines.append((line, fields[0]))
+
+    def op(record):
+        for i, topic in enumerate(record.topics, 1):
+            topic_fields = _TopicFields(topic, i)
+            yield (title.format_map(topic_fields), True),
+            for line, field in lines:
+                if topic[field]:
+                    yield (line.format_map(topic_fields), False),
+            yield None  # 空行
+    return op
+
+
+def compile_layout(name: str, spec: Sequence[Dict[str, Any]]) -> RenderPlan:
+    """把版式说明编译为渲染计划"""
+    skeleton_ops, fill_ops, flow_ops = [], [], []
+    paragraph_count = table_count = 0
+    in_flow = False
+    for node in spec:
+        kind = node["type"]
+        in_flow = in_flow or kind == "topics" or bool(node.get("when"))
+        if kind == "style":
+            if in_flow:
+                raise ValueError("style只能出现在骨架部分")
+            skeleton_ops.append(_compile_style(node))
+        elif kind == "paragraph":
+            if in_flow:
+                flow_ops.append(_compile_flow_paragraph(node))
+            else:
+                skeleton_ops.append(_compile_fixed_paragraph(node, paragraph_count, fill_ops))
+                paragraph_count += 1
+        elif kind == "table":
+            if in_flow:
+                raise ValueError("table只能出现在骨架部分")
+            skeleton_ops.append(_compile_table(node, table_count, fill_ops))
+            table_count += 1
+        elif kind == "topics":
+            flow_ops.append(_compile_topics(node))
+        else:
+            raise ValueError(f"未知的版式节点: {kind}")
+    return RenderPlan(name, skeleton_ops, fill_ops, flow_ops)
+
+
+_plans: Dict[str, RenderPlan] = {}
+_plans_lock = threading.Lock()
+
+
+def get_layout(name: str = "table") -> RenderPlan:
+    """获取编译好的版式（每种版式进程内只编译一次）"""
+    plan = _plans.get(name)
+    if plan is None:
+        with _plans_lock:
+            plan = _plans.get(name)
+            if plan is None:
+                if name not in LAYOUTS:
+                    raise ValueError(f"未知的版式: {name}")
+                plan = _plans[name] = compile_layout(name, LAYOUTS[name])
+    return plan
@@ -0,0 +1,181 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+# 磁盘层每写入这么多次清理一次过期和超出上限的条目
+PRUNE_INTERVAL = 64
+
+
+def normalize_text(text: str) -> str:
+    """规范化会议文本：统一Unicode形式和换行符，去掉行尾与首尾空白"""
+    text = unicodedata.normalize("NFC", text).replace("\r\n", "\n").replace("\r", "\n")
+    return "\n".join(line.rstrip() for line in text.split("\n")).strip()
+
+
+def make_cache_key(text: str, model_name: str, prompt_version: str) -> str:
+    """根据规范化文本、模型名称和提示词版本生成缓存键"""
+    digest = hashlib.sha256()
+    for part in (prompt_version, model_name, normalize_text(text)):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class LLMResponseCache:
+    """大模型解析结果缓存
+
+    内存中是有容量上限的LRU，可选的SQLite磁盘层在进程重启后依然有效。
+    条目以JSON字符串保存，每次命中都返回新的字典，调用方可以放心修改。
+    磁盘层定期删除过期的条目，条目超过max_disk_entries时删除最早写入的。
+    """
+
+    def __init__(self, max_entries: int = 256, ttl: float = 3600, db_path: Optional[str] = None,
+                 max_disk_entries: int = 10000):
+        self.max_entries = max_entries
+        self.ttl = ttl  # 秒，小于等于0表示永不过期
+        self.max_disk_entries = max_disk_entries  # 小于等于0表示不限制
+        self._entries = OrderedDict()  # key -> (过期时间, JSON字符串)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.evictions = 0
+        self._db = None
+        self._disk_writes = 0
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS llm_cache_expires ON llm_cache (expires_at)")
+            self._db.commit()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """读取缓存，未命中或已过期时返回None"""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at and expires_at < now:
+                    del self._entries[key]
+                else:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return json.loads(value)
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT value, expires_at FROM llm_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    value, expires_at = row
+                    if expires_at and expires_at < now:
+                        self._db.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                        self._db.commit()
+                    else:
+                        # 磁盘命中后提升到内存层
+                        self._store_in_memory(key, value, expires_at)
+                        self.hits += 1
+                        self.disk_hits += 1
+                        return json.loads(value)
+
+            self.misses += 1
+            return None
+
+    def set(self, key: str, value: Dict[str, Any]):
+        """写入缓存"""
+        serialized = json.dumps(value, ensure_ascii=False)
+        expires_at = time.time() + self.ttl if self.ttl > 0 else 0
+        with self._lock:
+            self._store_in_memory(key, serialized, expires_at)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO llm_cache (key, value, expires_at) VALUES (?, ?, ?)",
+                    (key, serialized, expires_at)
+                )
+                if self._disk_writes % PRUNE_INTERVAL == 0:
+                    self._prune_disk()
+                self._disk_writes += 1
+                self._db.commit()
+
+    def _prune_disk(self):
+        """删除磁盘层中过期的条目，并按写入顺序只保留最近的max_disk_entries条（调用方需持有锁）"""
+        self._db.execute("DELETE FROM llm_cache WHERE expires_at > 0 AND expires_at < ?", (time.time(),))
+        if self.max_disk_entries > 0:
+            # INSERT OR REPLACE会分配新的rowid，rowid越大写入越晚
+            self._db.execute(
+                "DELETE FROM llm_cache WHERE rowid <= "
+                "(SELECT rowid FROM llm_cache ORDER BY rowid DESC LIMIT 1 OFFSET ?)", (self.max_disk_entries,)
+            )
+
+    def _store_in_memory(self, key: str, value: str, expires_at: float):
+        """写入内存层并按LRU淘汰（调用方需持有锁）"""
+        if self.max_entries <= 0:
+            return
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        """清空内存层和磁盘层"""
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM llm_cache")
+                self._db.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """命中/未命中计数"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "disk_hits": self.disk_hits,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+                "max_entries": self.max_entries
+            }
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+_shared_cache: Optional[LLMResponseCache] = None
+_shared_lock = threading.Lock()
+
+
+def get_response_cache() -> LLMResponseCache:
+    """获取进程内共享的解析结果缓存（首次调用时按环境变量创建）"""
+    global _shared_cache
+    if _shared_cache is None:
+        with _shared_lock:
+            if _shared_cache is None:
+                _shared_cache = LLMResponseCache(
+                    max_entries=int(os.environ.get("LLM_CACHE_SIZE", 256)),
+                    ttl=float(os.environ.get("LLM_CACHE_TTL", 3600)),
+                    db_path=os.environ.get("LLM_CACHE_PATH") or None,
+                    max_disk_entries=int(os.environ.get("LLM_CACHE_DISK_SIZE", 10000))
+                )
+    return _shared_cache
+
+
+def reset_response_cache():
+    """关闭并丢弃共享的解析结果缓存，下次获取时按环境变量重新创建"""
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is not None:
+            _shared_cache.close()
+        _shared_cache = None
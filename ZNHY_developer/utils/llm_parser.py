@@ -1,36 +1,32 @@
+import copy
 import json
-import requests
+import logging
 import os
-from typing import Dict, Any
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Dict, Any, Callable, List, Optional
 
-class MeetingParser:
-    def __init__(self):
-        # 配置Ollama API端点
-        self.ollama_url = "http://localhost:11434/api/generate"
-        self.model_name = "qwen:1.8b"  # 使用中文支持更好的qwen模型
-        
-    def parse_meeting_text(self, text: str) -> Dict[str, Any]:
-        """使用大模型解析会议文本"""
-        
-        # 构建提示词
-        prompt = self._build_prompt(text)
-        
-        try:
-            # 尝试连接Ollama
-            response = self._call_ollama(prompt)
-            return self._parse_response(response, text)
-        except Exception as e:
-            print(f"Ollama调用失败: {e}, 使用模拟数据")
-            return self._get_mock_data(text)
-    
-    def _build_prompt(self, text: str) -> str:
-        """构建解析提示词"""
-        return f"""
-你是一个会议信息提取专家，请严格从以下会议内容中提取所有相关信息：
+from utils.circuit_breaker import CircuitBreaker, CircuitOpenError, get_circuit_breaker
+from utils.heuristic_extractor import extract_meeting_fields
+from utils.json_repair import repair_json
+from utils.json_stream import IncrementalJSONScanner
+from utils.llm_cache import LLMResponseCache, get_response_cache, make_cache_key
+from utils.meeting_model import MeetingRecord
+from utils.metrics import COALESCED_TOTAL, FALLBACK_TOTAL, LLM_RESPONSES_TOTAL, span
+from utils.ollama_client import OllamaClient, get_ollama_client
+from utils.roster import Roster, get_roster
+from utils.single_flight import SingleFlight, get_single_flight
+from utils.transcript_chunker import merge_partial_results, split_transcript
 
-会议内容："{text}"
+logger = logging.getLogger(__name__)
 
-请从提供的会议内容中提取所有相关信息，并严格按照JSON格式输出。
+# 提示词版本号，修改SYSTEM_PROMPT或_build_prompt时需要同步递增，使旧的缓存结果失效
+PROMPT_VERSION = "3"
+
+# 固定的提取说明和输出示例，作为system提示词发送。
+# 每次请求的开头都相同，Ollama可以复用已经计算过的前缀，只需处理会议内容部分
+SYSTEM_PROMPT = """你是一个会议信息提取专家，请严格从用户提供的会议内容中提取所有相关信息，并严格按照JSON格式输出。
 
 特别注意：必须准确提取参会人员信息：
 - 参会人员包括主持人和所有列出的参会者
@@ -40,7 +36,7 @@ class MeetingParser:
 
 输出格式示例（仅用于说明结构，请勿直接使用示例内容）：
 ```json
-{{
+{
   "meeting_topic": "下季度产品推广方案",
   "meeting_time": "2023年10月15日下午3点",
   "meeting_location": "公司三楼大会议室",
@@ -49,23 +45,23 @@ class MeetingParser:
   "participant_count": 4,
   "meeting_duration": "约两小时",
   "topics": [
-    {{
+    {
       "title": "下季度产品推广方案（线上广告投放预算分配）",
       "leader": "李明",
       "preparation": "准备相关数据"
-    }},
-    {{
+    },
+    {
       "title": "新版APP研发进度",
       "leader": "王磊"
-    }},
-    {{
+    },
+    {
       "title": "下月底团建活动安排（备选地点：近郊民宿、爬山）",
       "leader": "张娜",
       "participants": "全体参会者（赵晓雨参与讨论）"
-    }}
+    }
   ],
   "pre_meeting_preparations": "提前将会议资料发到群里"
-}}
+}
 ```
 
 注意事项：
@@ -74,269 +70,471 @@ class MeetingParser:
 3. 所有字段的值必须来自输入的会议内容，不得使用任何示例内容或外部信息
 4. 输出仅为JSON格式，不得包含任何解释性文字或标记（如```json```等）
 """
+
+# 约束大模型输出的JSON结构（Ollama的format参数），字段与SYSTEM_PROMPT中的示例一致
+MEETING_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "meeting_topic": {"type": "string"},
+        "meeting_time": {"type": "string"},
+        "meeting_location": {"type": "string"},
+        "host": {"type": "string"},
+        "participants": {"type": "array", "items": {"type": "string"}},
+        "participant_count": {"type": "integer"},
+        "meeting_duration": {"type": "string"},
+        "topics": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "title": {"type": "string"},
+                    "leader": {"type": "string"},
+                    "preparation": {"type": "string"},
+                    "participants": {"type": "string"}
+                },
+                "required": ["title"]
+            }
+        },
+        "pre_meeting_preparations": {"type": "string"}
+    },
+    "required": ["meeting_topic", "meeting_time", "meeting_location", "host", "participants",
+                 "participant_count", "meeting_duration", "topics", "pre_meeting_preparations"]
+}
+
+# 长会议记录分片解析使用的线程池，进程内共享
+_chunk_pool = None
+_chunk_pool_lock = threading.Lock()
+
+
+def get_chunk_pool() -> ThreadPoolExecutor:
+    """获取分片并发调用大模型的线程池"""
+    global _chunk_pool
+    if _chunk_pool is None:
+        with _chunk_pool_lock:
+            if _chunk_pool is None:
+                _chunk_pool = ThreadPoolExecutor(
+                    max_workers=int(os.environ.get("LLM_CHUNK_CONCURRENCY", 4)),
+                    thread_name_prefix="llm-chunk"
+                )
+    return _chunk_pool
+
+
+class BoundedExecutor:
+    """带排队上限的线程池：执行中和排队的调用合计超过max_workers + max_pending时拒绝提交
+
+    ThreadPoolExecutor的队列没有上限，超时返回后仍在排队的调用会越积越多，
+    排队的时间也会占用之后请求的截止时间。
+    """
+
+    def __init__(self, max_workers: int, max_pending: int, thread_name_prefix: str = ""):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=thread_name_prefix)
+        self._slots = threading.BoundedSemaphore(max_workers + max_pending)
+
+    def try_submit(self, fn: Callable[[], Any]) -> Optional[Future]:
+        """提交调用，已满时返回None；调用结束或被取消后释放名额"""
+        if not self._slots.acquire(blocking=False):
+            return None
+        try:
+            future = self._executor.submit(fn)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait)
+
+
+# 设置了截止时间的解析在该线程池中调用大模型，超时后已开始的调用在后台继续完成
+_deadline_pool = None
+_deadline_pool_lock = threading.Lock()
+
+
+def get_deadline_pool() -> BoundedExecutor:
+    """获取带截止时间的解析在后台调用大模型的线程池"""
+    global _deadline_pool
+    if _deadline_pool is None:
+        with _deadline_pool_lock:
+            if _deadline_pool is None:
+                _deadline_pool = BoundedExecutor(
+                    max_workers=int(os.environ.get("LLM_DEADLINE_WORKERS", 8)),
+                    max_pending=int(os.environ.get("LLM_DEADLINE_PENDING", 8)),
+                    thread_name_prefix="llm-deadline"
+                )
+    return _deadline_pool
+
+class MeetingParser:
+    def __init__(self, client: Optional[OllamaClient] = None, cache: Optional[LLMResponseCache] = None,
+                 stream: Optional[bool] = None, chunk_chars: Optional[int] = None,
+                 breaker: Optional[CircuitBreaker] = None, single_flight: Optional[SingleFlight] = None,
+                 roster: Optional[Roster] = None):
+        # 配置Ollama API端点
+        self.ollama_url = os.environ.get("OLLAMA_URL", "http://localhost:11434/api/generate")
+        self.model_name = "qwen:1.8b"  # 使用中文支持更好的qwen模型
+        # 流式模式：边生成边扫描JSON，对象闭合后立即中止，避免小模型在JSON之后继续输出
+        if stream is None:
+            stream = os.environ.get("OLLAMA_STREAM", "0") == "1"
+        self.stream = stream
+        # 分片长度：会议记录超过该字数时切片并发解析再合并，0表示不分片
+        if chunk_chars is None:
+            chunk_chars = int(os.environ.get("LLM_CHUNK_CHARS", 0))
+        self.chunk_chars = chunk_chars
+        # 模型在Ollama中保持加载的时长，避免空闲后下一个请求重新加载模型
+        self.keep_alive = os.environ.get("OLLAMA_KEEP_ALIVE", "30m")
+        # 输出格式约束：schema按MEETING_SCHEMA约束结构，json只保证是合法JSON，留空不约束
+        output_format = os.environ.get("OLLAMA_FORMAT", "schema")
+        self.output_format = MEETING_SCHEMA if output_format == "schema" else output_format or None
+        # 默认使用进程内共享的客户端，跨请求复用到Ollama的长连接
+        self.client = client or get_ollama_client()
+        # 解析结果缓存，重复提交同一份会议内容时不再调用大模型
+        self.cache = cache or get_response_cache()
+        # 断路器，未指定时使用ollama_url对应的共享断路器
+        self._breaker = breaker
+        # 相同内容的并发解析只调用一次大模型，LLM_SINGLE_FLIGHT=0时关闭
+        if single_flight is None and os.environ.get("LLM_SINGLE_FLIGHT", "1") == "1":
+            single_flight = get_single_flight()
+        self.single_flight = single_flight
+        # 花名册索引（ROSTER_PATH），用于识别参会人员和过滤非人名
+        self.roster = roster if roster is not None else get_roster()
+        # 等待大模型的最长秒数，超过后先返回启发式提取的临时结果，0表示一直等待
+        self.deadline = float(os.environ.get("LLM_DEADLINE", 0))
+        # 最近一次解析是否退回到了模拟数据
+        self.used_fallback = False
+        # 最近一次解析是否因为超过截止时间返回了临时结果（大模型仍在后台解析）
+        self.provisional = False
+        # 最近一次启发式提取的(文本, 结果)
+        self._mock_memo = None
+
+    @property
+    def breaker(self) -> CircuitBreaker:
+        return self._breaker or get_circuit_breaker(self.ollama_url)
+
+    def parse_meeting_text(self, text: str, deadline: Optional[float] = None) -> Dict[str, Any]:
+        """使用大模型解析会议文本，返回会议信息字典；deadline的含义见parse_record"""
+        return self._parse_within(text, deadline).to_dict()
+
+    def parse_record(self, text: str, deadline: Optional[float] = None) -> MeetingRecord:
+        """使用大模型解析会议文本，返回MeetingRecord
+
+        deadline为等待大模型的最长秒数，未指定时使用LLM_DEADLINE，0表示一直等待。超时后返回
+        启发式提取的结果并将provisional置为真；大模型在后台继续解析，结果写入缓存，
+        之后再解析同一份会议内容（或调用cached_record）即可得到完整的结果。
+        """
+        # 结果可能同时被多个请求使用，每个请求（包括第一个）都拿独立的副本
+        return self._parse_within(text, deadline).copy()
+
+    def cached_record(self, text: str) -> Optional[MeetingRecord]:
+        """缓存中大模型对该会议内容的解析结果，没有时返回None，不调用大模型"""
+        cached = self.cache.get(self.result_key(text))
+        return MeetingRecord.from_dict(cached) if cached is not None else None
+
+    def _parse_within(self, text: str, deadline: Optional[float]) -> MeetingRecord:
+        """在截止时间内解析会议文本，超时返回启发式提取的临时结果"""
+        if deadline is None:
+            deadline = self.deadline
+        self.provisional = False
+        if deadline <= 0:
+            return self._parse_shared(text)
+
+        start = time.monotonic()
+        cached = self.cached_record(text)
+        if cached is not None:
+            self.used_fallback = False
+            return cached
+        # 在解析器的副本上调用大模型，超时返回后后台的解析不会再改动本解析器的状态
+        worker = copy.copy(self)
+        future = get_deadline_pool().try_submit(lambda: (worker._parse_shared(text), worker.used_fallback))
+        # 等待大模型的同时准备启发式提取的结果，后台解析整理大模型输出时直接复用
+        fallback = self._get_mock_record(text)
+        worker._mock_memo = self._mock_memo
+        if future is None:
+            # 后台调用已满：不再排队，直接返回临时结果，之后再次提交时重试
+            logger.warning("截止时间解析的线程池已满，直接返回启发式提取的结果")
+            FALLBACK_TOTAL.inc(reason="deadline_pool_full")
+        else:
+            try:
+                result, self.used_fallback = future.result(timeout=max(0.0, deadline - (time.monotonic() - start)))
+                return result
+            except FutureTimeoutError:
+                # 还在排队的调用直接丢弃，已经开始的在后台完成并写入缓存
+                future.cancel()
+                logger.info("大模型未在%.1f秒内完成解析，先返回启发式提取的结果", deadline)
+                FALLBACK_TOTAL.inc(reason="deadline")
+        self.used_fallback = True
+        self.provisional = True
+        return fallback
+
+    def _parse_shared(self, text: str) -> MeetingRecord:
+        """解析会议文本；返回的记录可能与合并的其他请求共用，调用方不能修改"""
+        chunks = split_transcript(text, self.chunk_chars)
+        cache_key = self.result_key(text, chunks)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            self.used_fallback = False
+            return MeetingRecord.from_dict(cached)
+
+        if self.single_flight is None:
+            return self._parse_uncached(text, chunks, cache_key)
+        # 多人同时提交同一份会议记录时，后到的请求等待第一个请求的结果
+        (result, used_fallback), shared = self.single_flight.do(
+            cache_key, lambda: (self._parse_uncached(text, chunks, cache_key), self.used_fallback)
+        )
+        if shared:
+            COALESCED_TOTAL.inc()
+            self.used_fallback = used_fallback
+        return result
+
+    def result_key(self, text: str, chunks: Optional[List[str]] = None) -> str:
+        """解析结果的缓存键：会议内容、模型、提示词版本和分片方式相同时相同"""
+        if chunks is None:
+            chunks = split_transcript(text, self.chunk_chars)
+        # 分片解析的结果与整体解析不同，使用不同的缓存键
+        version = PROMPT_VERSION if len(chunks) == 1 else f"{PROMPT_VERSION}-chunk{self.chunk_chars}"
+        # 花名册影响参会人员的整理结果，换了花名册后旧结果失效
+        if self.roster:
+            version = f"{version}-roster{self.roster.fingerprint[:16]}"
+        return make_cache_key(text, self.model_name, version)
+
+    def _parse_uncached(self, text: str, chunks: List[str], cache_key: str) -> MeetingRecord:
+        """缓存未命中时调用大模型解析，失败时退回模拟数据"""
+        if len(chunks) > 1:
+            return self._parse_chunked(text, chunks, cache_key)
+
+        # 构建提示词
+        with span("prompt_build"):
+            prompt = self._build_prompt(text)
+
+        try:
+            # 尝试连接Ollama
+            with span("llm_call"):
+                response = self._call_ollama(prompt)
+            self.used_fallback = False
+            with span("json_extract"):
+                result = self._parse_response(response, text)
+        except CircuitOpenError as e:
+            # Ollama不可用期间直接使用启发式提取，不再等待超时
+            logger.debug("%s", e)
+            FALLBACK_TOTAL.inc(reason="circuit_open")
+            self.used_fallback = True
+            with span("fallback"):
+                return self._get_mock_record(text)
+        except Exception as e:
+            logger.warning("Ollama调用失败，使用模拟数据: %s", e)
+            FALLBACK_TOTAL.inc(reason="llm_error")
+            self.used_fallback = True
+            with span("fallback"):
+                return self._get_mock_record(text)
+
+        # 只缓存大模型成功解析的结果，退回模拟数据时下次仍会重试大模型
+        if not self.used_fallback:
+            self.cache.set(cache_key, result.to_dict())
+        return result
+    
+    def _parse_chunked(self, text: str, chunks: List[str], cache_key: str) -> MeetingRecord:
+        """并发解析各个片段，合并为一份会议信息；耗时取决于最长的片段而不是总长度"""
+        futures = [get_chunk_pool().submit(self._parse_chunk, chunk) for chunk in chunks]
+        partials = []
+        rejected = 0
+        for index, future in enumerate(futures, 1):
+            try:
+                partial = future.result()
+            except CircuitOpenError:
+                rejected += 1
+                continue
+            except Exception as e:
+                logger.warning("第%d/%d个片段解析失败: %s", index, len(chunks), e)
+                continue
+            if partial is not None:
+                partials.append(partial)
+
+        if not partials:
+            logger.warning("所有片段都解析失败，使用模拟数据")
+            FALLBACK_TOTAL.inc(reason="circuit_open" if rejected == len(chunks) else "llm_error")
+            self.used_fallback = True
+            with span("fallback"):
+                return self._get_mock_record(text)
+
+        self.used_fallback = False
+        with span("chunk_merge"):
+            result = self._complete_result(merge_partial_results(partials), text)
+            # 同一个人可能在不同片段中以不同形式出现，整理姓名后再去重一次
+            result.participants = list(dict.fromkeys(result.participants))
+
+        # 部分片段失败时结果不完整，不缓存，下次重试
+        if len(partials) == len(chunks):
+            self.cache.set(cache_key, result.to_dict())
+        return result
+
+    def _parse_chunk(self, chunk: str) -> Optional[Dict[str, Any]]:
+        """解析一个片段，返回大模型给出的原始字段"""
+        with span("prompt_build"):
+            prompt = self._build_prompt(chunk)
+        with span("llm_call"):
+            response = self._call_ollama(prompt)
+        with span("json_extract"):
+            partial = self._extract_json(response)
+        return partial if isinstance(partial, dict) else None
+
+    def warmup(self) -> bool:
+        """预热：加载模型并计算system提示词，之后的请求可以直接复用这部分前缀"""
+        payload = {
+            "model": self.model_name,
+            "system": SYSTEM_PROMPT,
+            "prompt": self._build_prompt(""),
+            "stream": False,
+            "keep_alive": self.keep_alive,
+            # 只需要处理提示词，不需要真正生成内容
+            "options": {"num_predict": 1}
+        }
+        if self.output_format:
+            # 与正式请求使用相同的参数
+            payload["format"] = self.output_format
+        try:
+            with span("warmup"):
+                self.client.post(self.ollama_url, payload).raise_for_status()
+        except Exception as e:
+            logger.warning("Ollama预热失败: %s", e)
+            return False
+        logger.info("Ollama预热完成")
+        return True
+
+    def _build_prompt(self, text: str) -> str:
+        """构建解析提示词：固定的说明放在SYSTEM_PROMPT中，这里只包含本次的会议内容"""
+        return f'会议内容："{text}"\n\n请从以上会议内容中提取所有相关信息，严格按照JSON格式输出。'
     
     def _call_ollama(self, prompt: str) -> str:
         """调用Ollama API"""
         payload = {
             "model": self.model_name,
+            "system": SYSTEM_PROMPT,
             "prompt": prompt,
-            "stream": False
+            "stream": self.stream,
+            "keep_alive": self.keep_alive
         }
-        print(f"Ollama请求参数: {json.dumps(payload, ensure_ascii=False)}")
-        
-        response = requests.post(self.ollama_url, json=payload, timeout=30)
-        print(f"Ollama响应状态码: {response.status_code}")
-        print(f"Ollama响应头: {dict(response.headers)}")
-        print(f"Ollama响应内容: {response.text}")
-        response.raise_for_status()
-        
-        result = response.json()
-        print(f"Ollama响应JSON: {json.dumps(result, ensure_ascii=False)}")
-        return result.get('response', '')
+        if self.output_format:
+            payload["format"] = self.output_format
+        # 完整的请求和响应内容只在DEBUG级别输出，避免每个请求都序列化大段文本
+        debug = logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            logger.debug("Ollama请求参数: %s", json.dumps(payload, ensure_ascii=False))
+
+        # 连续失败后断路器打开，之后的调用直接抛出CircuitOpenError
+        with self.breaker.guard():
+            if self.stream:
+                return self._call_ollama_stream(payload)
+
+            response = self.client.post(self.ollama_url, payload)
+            logger.debug("Ollama响应状态码: %s", response.status_code)
+            if debug:
+                logger.debug("Ollama响应头: %s", dict(response.headers))
+                logger.debug("Ollama响应内容: %s", response.text)
+            response.raise_for_status()
+
+            result = response.json()
+            return result.get('response', '')
+
+    def _call_ollama_stream(self, payload: Dict[str, Any]) -> str:
+        """以流式方式调用Ollama API，顶层JSON对象闭合后立即中止生成"""
+        scanner = IncrementalJSONScanner()
+        pieces = []
+        response = self.client.post(self.ollama_url, payload, stream=True)
+        try:
+            logger.debug("Ollama响应状态码: %s", response.status_code)
+            response.raise_for_status()
+            # Ollama按行返回NDJSON，每行携带一小段生成内容
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                chunk = json.loads(line)
+                token = chunk.get('response', '')
+                pieces.append(token)
+                if scanner.feed(token):
+                    logger.debug("JSON对象已闭合，提前结束生成（共接收%d个片段）", len(pieces))
+                    return scanner.text
+                if chunk.get('done'):
+                    break
+        finally:
+            # 提前关闭连接，Ollama检测到断开后会停止继续生成
+            response.close()
+        return "".join(pieces)
     
-    def _parse_response(self, response: str, text: str) -> Dict[str, Any]:
+    def _parse_response(self, response: str, text: str) -> MeetingRecord:
         """解析大模型的响应并格式化输出"""
-        import json
-        print(f"大模型原始响应: {response}")
+        result = self._extract_json(response)
+        if result is None:
+            # 如果两次解析都失败，返回模拟数据
+            FALLBACK_TOTAL.inc(reason="parse_error")
+            self.used_fallback = True
+            with span("fallback"):
+                return self._get_mock_record(text)
+        return self._complete_result(result, text)
+
+    def _extract_json(self, response: str) -> Optional[Any]:
+        """从大模型的响应中取出JSON对象，解析失败时返回None"""
+        logger.debug("大模型原始响应: %s", response)
         
-        # 预处理响应：移除markdown的JSON语法糖
-        if "```json" in response:
-            response = response.split("```json")[1]
-        if "```" in response:
-            response = response.split("```")[0]
-        # 去除首尾空白
-        response = response.strip()
-        # 将Python None转换为JSON null
-        response = response.replace("None", "null")
         try:
-            # 直接解析整个响应（如果响应本身是纯JSON）
-            result = json.loads(response.strip())
-            print(f"成功解析响应: {result}")
-        except Exception as e:
-            print(f"直接解析响应失败: {e}")
-            # 尝试从响应中提取JSON块
-            try:
-                # 尝试从响应中提取JSON块（支持多行JSON）
-                response_str = response.strip()
-                # 找到JSON对象的起始位置（第一个'{'）
-                start_idx = response_str.find('{')
-                if start_idx != -1:
-                    # 计算括号深度，找到对应的闭合'}'
-                    depth = 1
-                    end_idx = start_idx + 1
-                    for char in response_str[start_idx+1:]:
-                        if char == '{':
-                            depth += 1
-                        elif char == '}':
-                            depth -= 1
-                            if depth == 0:
-                                break
-                        end_idx += 1
-                    # 提取完整的JSON块
-                    json_block = response_str[start_idx:end_idx+1]
-                    # 解析JSON块
-                    result = json.loads(json_block)
-                    print(f"成功从响应中提取JSON块: {result}")
-                else:
-                    # 如果没有找到JSON对象，抛出异常
-                    raise Exception("未找到JSON结构")
-            except Exception as e2:
-                print(f"提取JSON块失败: {e2}")
-                # 如果两次解析都失败，返回模拟数据
-                print("两次解析都失败，返回模拟数据")
-                return self._get_mock_data(text)
-        # 确保所有必需的字段都存在，缺少的字段使用模拟数据填充
-        mock_data = self._get_mock_data(text)
-        # 创建一个新的结果字典，优先使用大模型的响应，缺少的字段使用模拟数据
-        complete_result = mock_data.copy()
-        complete_result.update(result)
-        
-        participants = complete_result.get("participants", [])
+            # 约束输出格式后，响应通常本身就是合法的JSON
+            result = json.loads(response)
+            if isinstance(result, dict):
+                LLM_RESPONSES_TOTAL.inc(result="parsed")
+                return result
+        except ValueError as e:
+            logger.debug("直接解析响应失败: %s", e)
+        try:
+            # 去掉前后的说明文字，修复常见的格式错误
+            result = repair_json(response)
+        except ValueError as e:
+            logger.warning("无法从响应中解析出JSON: %s", e)
+            LLM_RESPONSES_TOTAL.inc(result="discarded")
+            return None
+        logger.debug("修复后解析成功: %s", result)
+        LLM_RESPONSES_TOTAL.inc(result="repaired")
+        return result
+
+    def _complete_result(self, result: Any, text: str) -> MeetingRecord:
+        """校验并规范化大模型结果，缺少的字段使用启发式提取的结果，并整理参会人员"""
+        mock_record = self._get_mock_record(text)
+        if not isinstance(result, dict):
+            raise ValueError("大模型返回的不是JSON对象")
+        # 一次完成：优先使用大模型的字段，缺少的字段取模拟数据，参会人员统一为姓名
+        record = MeetingRecord.from_dict(result, defaults=mock_record)
+
         fixed_participants = []
-        for p in participants:
-            name = None
-            if isinstance(p, dict):
-                # 处理对象数组
-                if "participant_name" in p:
-                    name = p["participant_name"].strip()
-                elif "name" in p:
-                    name = p["name"].strip()
-                elif "person" in p:
-                    name = p["person"].strip()
-                # 处理格式问题，如name字段值包含冒号的情况
-                if name and name.startswith(":"):
-                    name = name[1:].strip()
-            elif isinstance(p, str):
-                # 处理字符串数组
-                name = p.strip()
-                # 处理字符串中包含字典结构的情况
-                if name.startswith("{") and name.endswith("}"):
-                    try:
-                        p_dict = json.loads(name)
-                        if "participant_name" in p_dict:
-                            name = p_dict["participant_name"].strip()
-                        elif "name" in p_dict:
-                            name = p_dict["name"].strip()
-                        elif "person" in p_dict:
-                            name = p_dict["person"].strip()
-                        # 处理格式问题，如name字段值包含冒号的情况
-                        if name and name.startswith(":"):
-                            name = name[1:].strip()
-                    except:
-                        pass  # 解析失败则保留原始字符串
-            # 过滤掉明显不是人名的字符串
-            if name:
-                # 排除包含时间、地点、主题等关键词的字符串
-                invalid_keywords = ["讨论", "今天", "下午", "上午", "时间", "地点", "会议室", "项目", "进度", "主题", "议程", "参与人员", "参会人员", "主持人"]
-                if not any(keyword in name for keyword in invalid_keywords):
-                    fixed_participants.append(name)
+        for name in record.participants:
+            # 过滤掉明显不是人名的字符串。一次扫描：候选中有花名册里的员工时换成员工姓名
+            # （如"市场部李明"），否则排除包含时间、地点、主题等关键词的字符串
+            roster_names, has_stop_keyword = self.roster.scan(name)
+            if roster_names:
+                fixed_participants.extend(n for n in roster_names if n not in fixed_participants)
+            elif not has_stop_keyword:
+                fixed_participants.append(name)
         # 确保主持人也在参与者列表中
-        host = complete_result.get("host", "")
-        if host and host not in fixed_participants:
-            fixed_participants.append(host)
+        if record.host and record.host not in fixed_participants:
+            fixed_participants.append(record.host)
         
         # 如果过滤后没有参与者，使用模拟数据填充
         if not fixed_participants:
-            fixed_participants = self._get_mock_data(text).get("participants", [])
+            fixed_participants = list(mock_record.participants)
+        record.participants = fixed_participants
         
-        complete_result["participants"] = fixed_participants
-        complete_result["participant_count"] = len(fixed_participants)
-        
-        print(f"完整的解析结果: {complete_result}")
-        return complete_result
+        logger.debug("完整的解析结果: %s", record)
+        return record
     
     def _get_mock_data(self, text: str) -> Dict[str, Any]:
         """获取模拟数据（用于演示）"""
-        # 根据输入文本生成个性化的模拟数据
-        import re
-        
-        # 从输入文本中提取可能的会议主题
-        theme_match = re.search(r'主题[:：]?\s*([^\n]+)', text) or re.search(r'会议[:：]?\s*([^\n]+)', text)
-        meeting_theme = theme_match.group(1).strip() if theme_match else "会议讨论"
-        
-        # 从输入文本中提取可能的时间
-        time_match = re.search(r'时间[:：]?\s*([^\n]+)', text) or re.search(r'(\d{4}-\d{2}-\d{2}.*?)|(\d{1,2}月\d{1,2}日.*?)|(下[周月]\w+.*?)', text)
-        if time_match:
-            # 如果有捕获组内容（比如"时间：今天下午3点"中的"今天下午3点"）
-            if time_match.group(1):
-                meeting_time = time_match.group(1).strip()
-            elif time_match.group(2):
-                meeting_time = time_match.group(2).strip()
-            elif time_match.group(3):
-                meeting_time = time_match.group(3).strip()
-            else:
-                # 否则直接使用匹配的整个内容
-                meeting_time = time_match.group(0).strip()
-        else:
-            meeting_time = "待定"
-        
-        # 从输入文本中提取可能的地点
-        location_match = re.search(r'地点[:：]?\s*([^\n]+)', text) or re.search(r'(会议室\d+|办公室|线上会议)', text)
-        if location_match:
-            # 如果有捕获组内容（比如"地点：会议室A"中的"会议室A"）
-            if location_match.group(1):
-                meeting_location = location_match.group(1).strip()
-            else:
-                # 否则直接使用匹配的整个内容
-                meeting_location = location_match.group(0).strip()
-        else:
-            meeting_location = "公司会议室"
-        
-        # 从输入文本中提取可能的参会人员
-        participants_match = re.search(r'参会人员[:：]?\s*([^\n]+)', text)
-        participants = []
-        if participants_match:
-            participants_str = participants_match.group(1).strip()
-            # 移除前缀常见词如"包括"、"有"、"为"、"以及"
-            participants_str = re.sub(r'^(包括|有|为|以及)\s*', '', participants_str)
-            # 支持顿号、逗号、中文逗号、"和"、"以及"分隔，并且去掉可能的空格
-            participants_str = participants_str.replace('，', '、').replace(',', '、').replace('和', '、').replace('以及', '、')
-            participants = [p.strip() for p in participants_str.split('、') if p.strip()]
-        
-        # 如果没有提取到参会人员，尝试匹配所有可能的人名
-        if not participants:
-            # 改进的人名匹配正则表达式，支持更多分隔符
-            name_pattern = r'[\u4e00-\u9fa5]{2,4}(?:[、,，和以及][\u4e00-\u9fa5]{2,4})*'
-            name_matches = re.findall(name_pattern, text)
-            if name_matches:
-                # 合并所有匹配到的人名并处理多种分隔符
-                all_names = []
-                for match in name_matches:
-                    # 处理多种分隔符
-                    separated_names = re.split(r'[、,，和以及]', match)
-                    all_names.extend([p.strip() for p in separated_names if p.strip()])
-                # 去重
-                participants = list(set(all_names))
-        
-        # 如果还是没有提取到，使用默认值
-        if not participants:
-            participants = ["参会人员1", "参会人员2"]
-        
-        # 从输入文本中提取可能的议程
-        agenda_items = []
-        agenda_matches = re.findall(r'议[题程][:：]?\s*([^\n]+)', text)
-        if agenda_matches:
-            for topic in agenda_matches:
-                agenda_items.append({
-                    "topic": topic.strip(),
-                    "responsible_person": participants[0] if participants else "负责人",
-                    "preparation": "准备相关资料",
-                    "notes": ""
-                })
-        
-        # 如果没有提取到议程，使用默认值
-        if not agenda_items:
-            agenda_match = re.search(r'(讨论|议题|事项)[:：]?\s*([^\n]+)', text)
-            agenda_topic = agenda_match.group(0).strip() if agenda_match else "会议议程"
-            agenda_items.append({
-                "topic": agenda_topic,
-                "responsible_person": participants[0] if participants else "负责人",
-                "preparation": "准备相关资料",
-                "notes": ""
-            })
-        
-        # 提取会议内容
-        content_pattern = r'会议内容[:：]?\s*([\s\S]*)'
-        content_match = re.search(content_pattern, text)
-        if content_match:
-            meeting_content = content_match.group(1).strip()
-        else:
-            # 如果没有明确的内容部分，使用整个文本
-            meeting_content = text.strip()
-        
-        # 将 agenda_items 转换为符合模板要求的 topics 格式
-        topics = []
-        for item in agenda_items:
-            topic_dict = {
-                "title": item["topic"],
-                "leader": item["responsible_person"],
-                "preparation": item["preparation"]
-            }
-            topics.append(topic_dict)
-
-        # 尝试提取会前准备事项
-        pre_meeting_preparations = ""
-        pre_match = re.search(r'会前准备事项[:：]?\s*([^\n]+)', text)
-        if pre_match:
-            pre_meeting_preparations = pre_match.group(1).strip()
-        elif "提前准备" in text:
-            pre_meeting_preparations = "提前准备相关资料"
-
-        # 计算会议时长
-        duration = "约1小时"
-        duration_match = re.search(r'时长[:：]?\s*([^\n]+)', text) or re.search(r'约(\d+小时)', text)
-        if duration_match:
-            duration = duration_match.group(1).strip() if duration_match.group(1) else duration_match.group(0).strip()
-
-        mock_data = {
-            "meeting_topic": meeting_theme,
-            "meeting_time": meeting_time,
-            "meeting_location": meeting_location,
-            "host": participants[0] if participants else "主持人",
-            "participants": participants,
-            "participant_count": len(participants),
-            "meeting_duration": duration,
-            "topics": topics,
-            "pre_meeting_preparations": pre_meeting_preparations
-        }
-        return mock_data
\ No newline at end of file
+        return self._mock(text)[1]
+
+    def _get_mock_record(self, text: str) -> MeetingRecord:
+        """模拟数据的MeetingRecord，用于退回和补全缺少的字段"""
+        return self._mock(text)[2]
+
+    def _mock(self, text: str):
+        # 根据输入文本生成个性化的模拟数据；同一请求内只计算一次
+        if self._mock_memo is None or self._mock_memo[0] is not text:
+            data = extract_meeting_fields(text, self.roster)
+            self._mock_memo = (text, data, MeetingRecord.from_dict(data))
+        return self._mock_memo
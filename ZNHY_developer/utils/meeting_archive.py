@@ -0,0 +1,280 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from utils.llm_cache import normalize_text
+from utils.meeting_model import MeetingRecord
+
+logger = logging.getLogger(__name__)
+
+# 中文按相邻两字切分，字母数字按词切分，其余字符作为分隔
+_TOKEN_PATTERN = re.compile(r"[\u3400-\u9fff\uf900-\ufaff]+|[0-9A-Za-z]+")
+_CJK_PATTERN = re.compile(r"[\u3400-\u9fff\uf900-\ufaff]")
+
+# 检索时命中数最多统计到的条数，常见词命中几十万条时不必逐条计数
+COUNT_LIMIT = 10000
+
+
+def segment(text: str) -> str:
+    """把文字切分为以空格分隔的索引词
+
+    FTS5自带的分词器把连续的汉字当作一个词，无法按姓名或词语查找。这里把每段连续的汉字切成
+    相邻两字（"张三丰"→"张三 三丰"），最后一个字再单独作为一个词，这样任意长度的查询词都能
+    转换为相邻两字组成的短语（一个字时按前缀匹配）。
+    """
+    tokens = []
+    for match in _TOKEN_PATTERN.finditer(text):
+        run = match.group()
+        if not _CJK_PATTERN.match(run):
+            tokens.append(run.lower())
+            continue
+        tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+        tokens.append(run[-1])
+    return " ".join(tokens)
+
+
+def build_match_query(query: str) -> Optional[str]:
+    """把用户输入的查询（空格分隔的多个词，要求同时出现）转换为FTS5的MATCH表达式，没有可查的词时返回None"""
+    phrases = []
+    for match in _TOKEN_PATTERN.finditer(query):
+        run = match.group()
+        if not _CJK_PATTERN.match(run):
+            phrases.append(f'"{run.lower()}"')
+        elif len(run) == 1:
+            # 单字是所有以该字开头的两字词或单独的末字的前缀
+            phrases.append(f'"{run}" *')
+        else:
+            phrases.append('"' + " ".join(run[i:i + 2] for i in range(len(run) - 1)) + '"')
+    return " AND ".join(phrases) if phrases else None
+
+
+def _index_values(record: MeetingRecord, transcript: str) -> List[str]:
+    topics = "\n".join(" ".join(filter(None, (topic.title, topic.leader, topic.preparation, topic.participants)))
+                       for topic in record.topics)
+    return [segment(record.meeting_topic), segment(" ".join(record.participants)), segment(topics),
+            segment(transcript)]
+
+
+class MeetingArchive:
+    """会议归档：保存每次生成的会议信息、会议记录原文和docx，支持全文检索
+
+    同一份会议记录（规范化后相同）只保留一条，重新生成时更新。docx单独存放在meeting_documents表中，
+    检索和查看会议信息都不会读取文档内容。会议主题、参会人员、议题和原文切分后写入
+    无内容的FTS5全文索引，索引中不重复保存文字。
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            if db_path != ":memory:":
+                # 本进程内的访问共用一个连接，在锁内依次执行；WAL模式只是让其他进程（如备份、
+                # 离线查询）的读取不被写入阻塞，并且每次保存不必等待完整的fsync
+                self._db.execute("PRAGMA journal_mode=WAL")
+                self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.executescript("""
+                CREATE TABLE IF NOT EXISTS meetings (
+                    id INTEGER PRIMARY KEY,
+                    text_hash TEXT NOT NULL UNIQUE,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL,
+                    meeting_topic TEXT NOT NULL,
+                    meeting_time TEXT NOT NULL,
+                    host TEXT NOT NULL,
+                    participants TEXT NOT NULL,
+                    meeting_json TEXT NOT NULL,
+                    transcript TEXT NOT NULL,
+                    used_fallback INTEGER NOT NULL DEFAULT 0,
+                    provisional INTEGER NOT NULL DEFAULT 0
+                );
+                CREATE TABLE IF NOT EXISTS meeting_documents (
+                    meeting_id INTEGER PRIMARY KEY REFERENCES meetings(id),
+                    docx BLOB NOT NULL
+                );
+                CREATE VIRTUAL TABLE IF NOT EXISTS meetings_fts USING fts5(
+                    meeting_topic, participants, topics, transcript, content=''
+                );
+            """)
+            self._db.commit()
+
+    def save(self, transcript: str, record: MeetingRecord, docx: bytes, used_fallback: bool = False,
+             provisional: bool = False) -> int:
+        """保存一次生成的结果，返回归档ID；同一份会议记录再次保存时更新原来的条目
+
+        命中解析和文档缓存的重复生成，会议信息和原文都与已归档的相同，只更新时间、标记和文档，
+        不重新切分原文、重建全文索引。
+        """
+        text_hash = hashlib.sha256(normalize_text(transcript).encode("utf-8")).hexdigest()
+        meeting_json = json.dumps(record.to_dict(), ensure_ascii=False)
+        now = time.time()
+        with self._lock, self._db:
+            row = self._db.execute(
+                "SELECT id, meeting_json, transcript FROM meetings WHERE text_hash = ?", (text_hash,)
+            ).fetchone()
+            if row is None:
+                meeting_id = self._db.execute(
+                    "INSERT INTO meetings (text_hash, created_at, updated_at, meeting_topic, meeting_time, host, "
+                    "participants, meeting_json, transcript, used_fallback, provisional) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (text_hash, now, now, record.meeting_topic, record.meeting_time, record.host,
+                     record.participants_text, meeting_json, transcript, int(used_fallback), int(provisional))
+                ).lastrowid
+                self._index(meeting_id, record, transcript)
+            elif row[1] == meeting_json and row[2] == transcript:
+                meeting_id = row[0]
+                self._db.execute(
+                    "UPDATE meetings SET updated_at = ?, used_fallback = ?, provisional = ? WHERE id = ?",
+                    (now, int(used_fallback), int(provisional), meeting_id)
+                )
+            else:
+                meeting_id, old_json, old_transcript = row
+                # 无内容的FTS5表删除旧的索引词时需要提供当时写入的值
+                old_values = _index_values(MeetingRecord.from_dict(json.loads(old_json)), old_transcript)
+                self._db.execute(
+                    "INSERT INTO meetings_fts (meetings_fts, rowid, meeting_topic, participants, topics, transcript) "
+                    "VALUES ('delete', ?, ?, ?, ?, ?)", (meeting_id, *old_values)
+                )
+                self._db.execute(
+                    "UPDATE meetings SET updated_at = ?, meeting_topic = ?, meeting_time = ?, host = ?, "
+                    "participants = ?, meeting_json = ?, transcript = ?, used_fallback = ?, provisional = ? "
+                    "WHERE id = ?",
+                    (now, record.meeting_topic, record.meeting_time, record.host, record.participants_text,
+                     meeting_json, transcript, int(used_fallback), int(provisional), meeting_id)
+                )
+                self._index(meeting_id, record, transcript)
+            self._db.execute(
+                "INSERT OR REPLACE INTO meeting_documents (meeting_id, docx) VALUES (?, ?)", (meeting_id, docx)
+            )
+        return meeting_id
+
+    def _index(self, meeting_id: int, record: MeetingRecord, transcript: str):
+        """写入全文索引（调用方需持有锁并在事务中）"""
+        self._db.execute(
+            "INSERT INTO meetings_fts (rowid, meeting_topic, participants, topics, transcript) "
+            "VALUES (?, ?, ?, ?, ?)", (meeting_id, *_index_values(record, transcript))
+        )
+
+    def search(self, query: str = "", page: int = 1, per_page: int = 20, order: str = "recent") -> Dict[str, Any]:
+        """检索会议，分页返回摘要，不读取原文和文档
+
+        order为recent时按归档时间倒序，FTS5按rowid倒序遍历命中的条目，取到一页即可停止；
+        relevance时按相关度排序，需要对所有命中的条目打分，常见词的查询会慢很多。
+        命中数最多统计到COUNT_LIMIT条，超过时total_capped为真。
+        """
+        page = max(1, page)
+        per_page = max(1, per_page)
+        offset = (page - 1) * per_page
+        match = build_match_query(query or "")
+        columns = "m.id, m.created_at, m.updated_at, m.meeting_topic, m.meeting_time, m.host, m.participants, " \
+                  "m.used_fallback, m.provisional"
+        with self._lock:
+            if match is None:
+                total = self._db.execute(
+                    "SELECT COUNT(*) FROM (SELECT 1 FROM meetings LIMIT ?)", (COUNT_LIMIT + 1,)
+                ).fetchone()[0]
+                rows = self._db.execute(
+                    f"SELECT {columns} FROM meetings m ORDER BY m.id DESC LIMIT ? OFFSET ?", (per_page, offset)
+                ).fetchall()
+            else:
+                total = self._db.execute(
+                    "SELECT COUNT(*) FROM (SELECT rowid FROM meetings_fts WHERE meetings_fts MATCH ? LIMIT ?)",
+                    (match, COUNT_LIMIT + 1)
+                ).fetchone()[0]
+                if order == "relevance":
+                    # 会议主题和参会人员中的命中比原文中的命中更相关
+                    ranked = "SELECT rowid, bm25(meetings_fts, 10.0, 5.0, 2.0, 1.0) AS score FROM meetings_fts " \
+                             "WHERE meetings_fts MATCH ? ORDER BY score, rowid DESC LIMIT ? OFFSET ?"
+                    order_by = "f.score, m.id DESC"
+                else:
+                    ranked = "SELECT rowid FROM meetings_fts WHERE meetings_fts MATCH ? " \
+                             "ORDER BY rowid DESC LIMIT ? OFFSET ?"
+                    order_by = "m.id DESC"
+                rows = self._db.execute(
+                    f"SELECT {columns} FROM ({ranked}) f JOIN meetings m ON m.id = f.rowid ORDER BY {order_by}",
+                    (match, per_page, offset)
+                ).fetchall()
+        items = [{
+            "id": row[0],
+            "created_at": row[1],
+            "updated_at": row[2],
+            "meeting_topic": row[3],
+            "meeting_time": row[4],
+            "host": row[5],
+            "participants": row[6],
+            "used_fallback": bool(row[7]),
+            "provisional": bool(row[8])
+        } for row in rows]
+        return {"query": query, "page": page, "per_page": per_page, "total": min(total, COUNT_LIMIT),
+                "total_capped": total > COUNT_LIMIT, "items": items}
+
+    def get(self, meeting_id: int, with_transcript: bool = False) -> Optional[Dict[str, Any]]:
+        """读取一条归档的会议信息，不存在时返回None"""
+        column = ", transcript" if with_transcript else ""
+        with self._lock:
+            row = self._db.execute(
+                f"SELECT id, created_at, updated_at, meeting_json, used_fallback, provisional{column} "
+                "FROM meetings WHERE id = ?", (meeting_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        data = {
+            "id": row[0],
+            "created_at": row[1],
+            "updated_at": row[2],
+            "meeting": json.loads(row[3]),
+            "used_fallback": bool(row[4]),
+            "provisional": bool(row[5])
+        }
+        if with_transcript:
+            data["transcript"] = row[6]
+        return data
+
+    def get_document(self, meeting_id: int) -> Optional[bytes]:
+        """读取归档的docx，不存在时返回None"""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT docx FROM meeting_documents WHERE meeting_id = ?", (meeting_id,)
+            ).fetchone()
+        return bytes(row[0]) if row is not None else None
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM meetings").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+_shared_archive: Optional[MeetingArchive] = None
+_shared_lock = threading.Lock()
+
+
+def get_meeting_archive() -> Optional[MeetingArchive]:
+    """获取进程内共享的会议归档，未设置ARCHIVE_PATH时返回None"""
+    global _shared_archive
+    if _shared_archive is None:
+        path = os.environ.get("ARCHIVE_PATH")
+        if not path:
+            return None
+        with _shared_lock:
+            if _shared_archive is None:
+                _shared_archive = MeetingArchive(path)
+                logger.info("已打开会议归档%s，共%d条", path, len(_shared_archive))
+    return _shared_archive
+
+
+def reset_meeting_archive():
+    """关闭共享的会议归档，下次使用时按环境变量重新打开"""
+    global _shared_archive
+    with _shared_lock:
+        if _shared_archive is not None:
+            _shared_archive.close()
+        _shared_archive = None
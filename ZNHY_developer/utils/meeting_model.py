@@ -0,0 +1,244 @@
+import json
+import re
+from typing import Any, Dict, List, Optional, Union
+
+# 会议信息中的文字字段
+TEXT_FIELDS = ("meeting_topic", "meeting_time", "meeting_location", "host", "meeting_duration",
+               "pre_meeting_preparations")
+# 参会人员对象中可能存放姓名的键
+_NAME_KEYS = ("participant_name", "name", "person")
+# 旧格式agenda_items中的字段对应的议题字段
+LEGACY_TOPIC_FIELDS = {"topic": "title", "responsible_person": "leader", "preparation": "preparation"}
+# lxml拒绝写入的字符：除\t\n\r外的控制字符、代理区字符以及U+FFFE/U+FFFF
+INVALID_XML_CHARS_RE = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ud800-\udfff\ufffe\uffff]")
+
+
+def _text(value: Any) -> str:
+    """把大模型给出的任意取值转换为文字"""
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, list):
+        return "、".join(_text(item) for item in value)
+    return str(value)
+
+
+def _strict_text(field: str, value: Any) -> str:
+    """校验外部提交的文字字段：必须是字符串，且不含无法写入文档的字符"""
+    if not isinstance(value, str):
+        raise ValueError(f"{field}应为字符串")
+    if INVALID_XML_CHARS_RE.search(value):
+        raise ValueError(f"{field}含有无法写入文档的控制字符")
+    return value
+
+
+def _name_from_dict(data: Dict[str, Any]) -> Optional[str]:
+    for key in _NAME_KEYS:
+        if key in data:
+            name = _text(data[key]).strip()
+            # 处理格式问题，如name字段值包含冒号的情况
+            if name.startswith(":"):
+                name = name[1:].strip()
+            return name
+    return None
+
+
+def participant_name(participant: Any) -> str:
+    """从参会人员条目（姓名字符串、对象或对象的JSON字符串）中取出姓名，取不到时返回空字符串"""
+    if isinstance(participant, dict):
+        return _name_from_dict(participant) or ""
+    if not isinstance(participant, str):
+        return ""
+    name = participant.strip()
+    # 处理字符串中包含字典结构的情况
+    if name.startswith("{") and name.endswith("}"):
+        try:
+            data = json.loads(name)
+        except ValueError:
+            return name  # 解析失败则保留原始字符串
+        if isinstance(data, dict):
+            return _name_from_dict(data) or name
+    return name
+
+
+class Topic:
+    """一个议题"""
+
+    __slots__ = ("title", "leader", "preparation", "participants")
+
+    def __init__(self, title: str = "", leader: str = "", preparation: str = "", participants: str = ""):
+        self.title = title
+        self.leader = leader
+        self.preparation = preparation
+        self.participants = participants
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], strict: bool = False) -> "Topic":
+        if strict:
+            return cls(*(_strict_text(f"topics.{field}", data.get(field, "")) for field in Topic.__slots__))
+        return cls(_text(data.get("title")), _text(data.get("leader")), _text(data.get("preparation")),
+                   _text(data.get("participants")))
+
+    def __getitem__(self, key: str) -> str:
+        """按字段名取值，供版式模板使用；未知字段为空字符串"""
+        return getattr(self, key) if key in Topic.__slots__ else ""
+
+    def to_dict(self) -> Dict[str, str]:
+        """只输出非空的字段"""
+        data = {"title": self.title}
+        if self.leader:
+            data["leader"] = self.leader
+        if self.preparation:
+            data["preparation"] = self.preparation
+        if self.participants:
+            data["participants"] = self.participants
+        return data
+
+    def __eq__(self, other):
+        if not isinstance(other, Topic):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in Topic.__slots__)
+
+    def __repr__(self):
+        return f"Topic({self.title!r}, leader={self.leader!r})"
+
+
+class MeetingRecord:
+    """一份会议信息
+
+    在解析器边界由from_dict一次完成校验和规范化：文字字段都是字符串，参会人员是姓名列表，
+    议题是Topic列表（旧格式的agenda_items也转换为议题）。两种渲染方式和HTML预览直接使用，
+    需要JSON时用to_dict。
+    """
+
+    __slots__ = TEXT_FIELDS + ("participants", "topics")
+
+    def __init__(self, meeting_topic: str = "", meeting_time: str = "", meeting_location: str = "",
+                 host: str = "", meeting_duration: str = "", pre_meeting_preparations: str = "",
+                 participants: Optional[List[str]] = None, topics: Optional[List[Topic]] = None):
+        self.meeting_topic = meeting_topic
+        self.meeting_time = meeting_time
+        self.meeting_location = meeting_location
+        self.host = host
+        self.meeting_duration = meeting_duration
+        self.pre_meeting_preparations = pre_meeting_preparations
+        self.participants = participants if participants is not None else []
+        self.topics = topics if topics is not None else []
+
+    @classmethod
+    def from_dict(cls, data: Any, defaults: Optional["MeetingRecord"] = None,
+                  strict: bool = False) -> "MeetingRecord":
+        """校验并规范化会议信息字典
+
+        data中没有的字段取defaults的值（列表会复制，议题对象共享）。strict为真时用于外部提交的数据，
+        类型不对直接抛出ValueError；否则尽量转换大模型给出的取值。
+        """
+        if not isinstance(data, dict):
+            raise ValueError("请提交会议信息对象")
+        record = cls.__new__(cls)
+        for field in TEXT_FIELDS:
+            if field in data:
+                value = data[field]
+                setattr(record, field, _strict_text(field, value) if strict else _text(value))
+            else:
+                setattr(record, field, getattr(defaults, field) if defaults is not None else "")
+
+        if "participants" in data:
+            record.participants = cls._parse_participants(data["participants"], strict)
+        else:
+            record.participants = list(defaults.participants) if defaults is not None else []
+
+        topics = data.get("topics")
+        if topics or ("agenda_items" not in data and "topics" in data):
+            record.topics = cls._parse_topics(topics, strict)
+        elif "agenda_items" in data:
+            record.topics = cls._parse_topics([
+                {new: item[old] for old, new in LEGACY_TOPIC_FIELDS.items() if old in item}
+                for item in data["agenda_items"] or () if isinstance(item, dict)
+            ], strict)
+        else:
+            record.topics = list(defaults.topics) if defaults is not None else []
+        return record
+
+    @staticmethod
+    def _parse_participants(participants: Any, strict: bool) -> List[str]:
+        if isinstance(participants, str) and not strict:
+            # 旧模板的参会人员是顿号分隔的字符串
+            participants = participants.split("、")
+        if not isinstance(participants, list):
+            if strict:
+                raise ValueError("participants应为姓名列表")
+            participants = [participants] if participants else []
+        if strict and not (all(isinstance(p, str) for p in participants) or
+                           all(isinstance(p, dict) for p in participants)):
+            raise ValueError("participants应为姓名列表")
+        names = []
+        for participant in participants:
+            name = participant_name(participant)
+            if name:
+                names.append(_strict_text("participants", name) if strict else name)
+        return names
+
+    @staticmethod
+    def _parse_topics(topics: Any, strict: bool) -> List[Topic]:
+        if topics is None:
+            return []
+        if not isinstance(topics, list) or (strict and not all(isinstance(topic, dict) for topic in topics)):
+            if strict:
+                raise ValueError("topics应为议题对象列表")
+            topics = [topics]
+        return [Topic.from_dict(topic, strict) if isinstance(topic, dict) else Topic(_text(topic)) for topic in topics]
+
+    @property
+    def participant_count(self) -> int:
+        return len(self.participants)
+
+    @property
+    def participants_text(self) -> str:
+        """参会人员姓名，以顿号分隔"""
+        return "、".join(self.participants)
+
+    def __getitem__(self, key: str) -> str:
+        """按字段名取文档中显示的文字，供版式模板使用；未知字段为空字符串"""
+        if key == "participants":
+            return self.participants_text
+        return getattr(self, key) if key in TEXT_FIELDS else ""
+
+    def copy(self) -> "MeetingRecord":
+        """复制一份可以独立修改参会人员和议题列表的记录（议题对象共享）"""
+        record = MeetingRecord.__new__(MeetingRecord)
+        for field in TEXT_FIELDS:
+            setattr(record, field, getattr(self, field))
+        record.participants = list(self.participants)
+        record.topics = list(self.topics)
+        return record
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为与大模型输出结构相同的字典，可以直接JSON序列化"""
+        return {
+            "meeting_topic": self.meeting_topic,
+            "meeting_time": self.meeting_time,
+            "meeting_location": self.meeting_location,
+            "host": self.host,
+            "participants": list(self.participants),
+            "participant_count": len(self.participants),
+            "meeting_duration": self.meeting_duration,
+            "topics": [topic.to_dict() for topic in self.topics],
+            "pre_meeting_preparations": self.pre_meeting_preparations
+        }
+
+    def __eq__(self, other):
+        if not isinstance(other, MeetingRecord):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in MeetingRecord.__slots__)
+
+    def __repr__(self):
+        return f"MeetingRecord({self.meeting_topic!r}, participants={self.participants!r}, topics={len(self.topics)})"
+
+
+def as_record(meeting: Union[MeetingRecord, Dict[str, Any]]) -> MeetingRecord:
+    """渲染入口：已经是MeetingRecord时直接使用，字典先规范化"""
+    if isinstance(meeting, MeetingRecord):
+        return meeting
+    return MeetingRecord.from_dict(meeting)
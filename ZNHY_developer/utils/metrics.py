@@ -0,0 +1,149 @@
+import logging
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 默认分桶（秒），覆盖从毫秒级的JSON提取到数十秒的大模型调用
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(pairs: Sequence[Tuple[str, str]]) -> str:
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape_label(str(value))}"' for name, value in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class Counter:
+    """只增不减的计数器"""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            return self._values.get(key, 0)
+
+    def collect(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.append(f"{self.name}{_format_labels(list(zip(self.labelnames, key)))} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    """按固定分桶累计观测值的直方图"""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # 每组标签：[落在各分桶内的次数..., 超出最大分桶的次数, 总和, 总数]，导出时再累加
+        self._values: Dict[Tuple[str, ...], List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [0] * (len(self.buckets) + 3)
+            state[bisect_left(self.buckets, value)] += 1
+            state[-2] += value
+            state[-1] += 1
+
+    def count(self, **labels) -> int:
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            state = self._values.get(key)
+            return int(state[-1]) if state else 0
+
+    def collect(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted((key, list(state)) for key, state in self._values.items())
+        for key, state in items:
+            pairs = list(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, state):
+                cumulative += bucket_count
+                lines.append(f"{self.name}_bucket{_format_labels(pairs + [('le', repr(bound))])} {int(cumulative)}")
+            lines.append(f"{self.name}_bucket{_format_labels(pairs + [('le', '+Inf')])} {int(state[-1])}")
+            lines.append(f"{self.name}_sum{_format_labels(pairs)} {_format_value(state[-2])}")
+            lines.append(f"{self.name}_count{_format_labels(pairs)} {int(state[-1])}")
+        return lines
+
+
+# 生成流程各阶段的耗时和退回模拟数据的次数，由/metrics以Prometheus文本格式导出
+STAGE_SECONDS = Histogram(
+    "meeting_stage_seconds",
+    "Duration of each meeting minutes generation stage in seconds.",
+    labelnames=("stage",)
+)
+FALLBACK_TOTAL = Counter(
+    "meeting_fallback_total",
+    "Number of parses that fell back to heuristic mock data.",
+    labelnames=("reason",)
+)
+# 大模型响应的处理结果：parsed直接解析，repaired修复后解析，discarded无法解析而被丢弃
+LLM_RESPONSES_TOTAL = Counter(
+    "meeting_llm_responses_total",
+    "LLM responses by JSON extraction result (parsed, repaired, discarded).",
+    labelnames=("result",)
+)
+BREAKER_TRANSITIONS_TOTAL = Counter(
+    "meeting_circuit_breaker_transitions_total",
+    "Number of Ollama circuit breaker transitions by target state.",
+    labelnames=("state",)
+)
+# 等待相同内容的在途解析并共享结果的请求数，即节省的大模型调用次数
+COALESCED_TOTAL = Counter(
+    "meeting_coalesced_parses_total",
+    "Parses that shared the result of an identical in-flight parse instead of calling the LLM."
+)
+_METRICS = [STAGE_SECONDS, FALLBACK_TOTAL, LLM_RESPONSES_TOTAL, BREAKER_TRANSITIONS_TOTAL, COALESCED_TOTAL]
+
+
+@contextmanager
+def span(stage: str) -> Iterator[None]:
+    """记录一个阶段的耗时，出现异常时同样计入"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        STAGE_SECONDS.observe(elapsed, stage=stage)
+        logger.debug("stage=%s duration_ms=%.2f", stage, elapsed * 1000)
+
+
+def render_metrics() -> str:
+    """导出所有指标的Prometheus文本格式"""
+    lines = []
+    for metric in _METRICS:
+        lines.extend(metric.collect())
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,102 @@
+import os
+import threading
+from typing import Any, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+def _env_int(name: str, default: int) -> int:
+    """读取整数环境变量，缺失或非法时使用默认值"""
+    try:
+        return int(os.environ.get(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    """读取浮点数环境变量，缺失或非法时使用默认值"""
+    try:
+        return float(os.environ.get(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+class OllamaClient:
+    """进程内共享的Ollama HTTP客户端
+
+    所有请求复用同一个requests.Session，由urllib3连接池维持到Ollama的长连接，
+    避免每次生成会议记录都重新建立TCP连接。连接池本身是线程安全的，
+    可以在多个Flask工作线程之间共享。
+    """
+
+    def __init__(self,
+                 pool_connections: Optional[int] = None,
+                 pool_maxsize: Optional[int] = None,
+                 connect_timeout: Optional[float] = None,
+                 read_timeout: Optional[float] = None,
+                 pool_block: Optional[bool] = None):
+        # 连接池配置，未显式指定时从环境变量读取
+        self.pool_connections = pool_connections or _env_int("OLLAMA_POOL_CONNECTIONS", 4)
+        self.pool_maxsize = pool_maxsize or _env_int("OLLAMA_POOL_MAXSIZE", 16)
+        if pool_block is None:
+            pool_block = os.environ.get("OLLAMA_POOL_BLOCK", "0") == "1"
+        self.pool_block = pool_block
+        # 连接超时与读取超时分开配置：连接失败要快速返回，生成过程则允许较长时间
+        self.connect_timeout = connect_timeout or _env_float("OLLAMA_CONNECT_TIMEOUT", 3.0)
+        self.read_timeout = read_timeout or _env_float("OLLAMA_READ_TIMEOUT", 30.0)
+        self.session = self._create_session()
+
+    def _create_session(self) -> requests.Session:
+        """创建带连接池的Session"""
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            pool_block=self.pool_block,
+            max_retries=0
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.headers["Connection"] = "keep-alive"
+        return session
+
+    @property
+    def timeout(self):
+        """requests使用的(连接超时, 读取超时)元组"""
+        return (self.connect_timeout, self.read_timeout)
+
+    def post(self, url: str, payload: Dict[str, Any], stream: bool = False) -> requests.Response:
+        """发送JSON POST请求，复用连接池中的长连接"""
+        return self.session.post(url, json=payload, timeout=self.timeout, stream=stream)
+
+    def get(self, url: str) -> requests.Response:
+        """发送GET请求（健康探测），读取超时与连接超时相同"""
+        return self.session.get(url, timeout=(self.connect_timeout, self.connect_timeout))
+
+    def close(self):
+        """关闭连接池"""
+        self.session.close()
+
+
+_shared_client: Optional[OllamaClient] = None
+_shared_lock = threading.Lock()
+
+
+def get_ollama_client() -> OllamaClient:
+    """获取进程内共享的Ollama客户端（首次调用时创建）"""
+    global _shared_client
+    if _shared_client is None:
+        with _shared_lock:
+            if _shared_client is None:
+                _shared_client = OllamaClient()
+    return _shared_client
+
+
+def reset_ollama_client():
+    """关闭并丢弃共享客户端，下次获取时按当前配置重新创建"""
+    global _shared_client
+    with _shared_lock:
+        if _shared_client is not None:
+            _shared_client.close()
+        _shared_client = None
@@ -0,0 +1,99 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+
+def make_render_key(meeting_data: Dict[str, Any], template_version: str) -> str:
+    """根据会议信息的规范JSON（键排序）和版式版本号生成缓存键"""
+    canonical = json.dumps(meeting_data, ensure_ascii=False, sort_keys=True, separators=(",", ":"), default=str)
+    digest = hashlib.sha256()
+    for part in (template_version, canonical):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class RenderCache:
+    """渲染好的docx字节缓存
+
+    按LRU淘汰，同时限制条目数和总字节数；单个文档超过总字节上限时不缓存。
+    """
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024, max_entries: int = 256):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            data = self._entries.get(key)
+            if data is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return data
+
+    def set(self, key: str, data: bytes):
+        if self.max_entries <= 0 or len(data) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= len(old)
+            self._entries[key] = data
+            self._size += len(data)
+            while len(self._entries) > self.max_entries or self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """命中/未命中计数和占用的字节数"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+                "bytes": self._size,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes
+            }
+
+
+_shared_cache: Optional[RenderCache] = None
+_shared_lock = threading.Lock()
+
+
+def get_render_cache() -> RenderCache:
+    """获取进程内共享的文档缓存（首次调用时按环境变量创建）"""
+    global _shared_cache
+    if _shared_cache is None:
+        with _shared_lock:
+            if _shared_cache is None:
+                _shared_cache = RenderCache(
+                    max_bytes=int(os.environ.get("RENDER_CACHE_BYTES", 32 * 1024 * 1024)),
+                    max_entries=int(os.environ.get("RENDER_CACHE_SIZE", 256))
+                )
+    return _shared_cache
+
+
+def reset_render_cache():
+    """丢弃共享的文档缓存，下次获取时按环境变量重新创建"""
+    global _shared_cache
+    with _shared_lock:
+        _shared_cache = None
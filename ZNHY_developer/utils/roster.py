@@ -0,0 +1,211 @@
+import csv
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import deque
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 出现在候选姓名中就说明不是人名的关键词（时间、地点、主题等）
+STOP_KEYWORDS = ("讨论", "今天", "下午", "上午", "时间", "地点", "会议室", "项目", "进度", "主题", "议程",
+                 "参与人员", "参会人员", "主持人")
+
+# 花名册CSV中姓名和别名所在的列；别名之间用|或、分隔
+_NAME_COLUMNS = ("name", "姓名")
+_ALIAS_COLUMNS = ("aliases", "别名")
+
+
+class AhoCorasick:
+    """多模式匹配自动机：一次扫描文本找出所有模式的出现位置
+
+    每个模式对应一个值，构建时计算失败指针和输出链，扫描时间与文本长度和匹配数成正比，
+    与模式数量无关。
+    """
+
+    def __init__(self, patterns: Iterable[Tuple[str, Any]]):
+        self._goto: List[Dict[str, int]] = [{}]
+        # 以该状态结尾的模式长度和值，没有模式在此结束时长度为0
+        self._length = [0]
+        self._value: List[Any] = [None]
+        self._fail = [0]
+        # 沿失败指针找到的下一个有输出的状态
+        self._output = [0]
+        for pattern, value in patterns:
+            if pattern:
+                self._add(pattern, value)
+        self._build()
+
+    def __len__(self):
+        return sum(1 for length in self._length if length)
+
+    def _add(self, pattern: str, value: Any):
+        state = 0
+        for ch in pattern:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._length.append(0)
+                self._value.append(None)
+                self._fail.append(0)
+                self._output.append(0)
+            state = nxt
+        # 同一模式重复出现时保留第一个值
+        if not self._length[state]:
+            self._length[state] = len(pattern)
+            self._value[state] = value
+
+    def _build(self):
+        goto, fail, output, length = self._goto, self._fail, self._output, self._length
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                target = goto[f].get(ch, 0)
+                fail[nxt] = target if target != nxt else 0
+                output[nxt] = fail[nxt] if length[fail[nxt]] else output[fail[nxt]]
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int, Any]]:
+        """按结束位置顺序产生所有匹配：(起始位置, 结束位置, 值)"""
+        goto, fail, output, length, value = self._goto, self._fail, self._output, self._length, self._value
+        state = 0
+        for end, ch in enumerate(text, 1):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            node = state if length[state] else output[state]
+            while node:
+                yield end - length[node], end, value[node]
+                node = output[node]
+
+
+class Roster:
+    """公司花名册索引
+
+    员工姓名、别名和STOP_KEYWORDS放在同一个自动机里，一次扫描就能同时得到文本中出现的员工
+    （按出现顺序，重叠时取最左最长的匹配）和是否含有非人名关键词。没有员工时只做关键词判断。
+    """
+
+    _STOP = object()
+
+    def __init__(self, entries: Iterable[Tuple[str, Iterable[str]]] = ()):
+        patterns = []
+        names = []
+        for name, aliases in entries:
+            name = name.strip()
+            if not name:
+                continue
+            names.append(name)
+            patterns.append((name, name))
+            patterns.extend((alias.strip(), name) for alias in aliases if alias.strip())
+        self.names = list(dict.fromkeys(names))
+        # 姓名优先于同名的关键词
+        patterns.extend((keyword, self._STOP) for keyword in STOP_KEYWORDS)
+        self._automaton = AhoCorasick(patterns)
+        digest = hashlib.sha256()
+        for pattern, value in sorted((p, v) for p, v in patterns if v is not self._STOP):
+            digest.update(f"{pattern}\0{value}\0".encode("utf-8"))
+        self.fingerprint = digest.hexdigest() if self.names else ""
+
+    def __len__(self):
+        return len(self.names)
+
+    def scan(self, text: str) -> Tuple[List[str], bool]:
+        """扫描一次文本，返回(按出现顺序去重的员工姓名, 是否含有非人名关键词)"""
+        found = []
+        has_stop = False
+        for start, end, value in self._automaton.iter_matches(text):
+            if value is self._STOP:
+                has_stop = True
+            else:
+                found.append((start, -end, value))
+        if not found:
+            return [], has_stop
+        # 最左最长、互不重叠：例如同时有"张三"和"张三丰"时只取"张三丰"
+        names = {}
+        covered = 0
+        for start, neg_end, name in sorted(found):
+            if start >= covered:
+                names.setdefault(name, None)
+                covered = -neg_end
+        return list(names), has_stop
+
+    def find_names(self, text: str) -> List[str]:
+        """文本中出现的员工姓名，按第一次出现的顺序"""
+        return self.scan(text)[0]
+
+
+def _split_aliases(value: Any) -> List[str]:
+    if not value:
+        return []
+    if isinstance(value, str):
+        return value.replace("、", "|").split("|")
+    if not isinstance(value, list):
+        raise ValueError(f"别名应为字符串或列表: {value!r}")
+    return [str(alias) for alias in value]
+
+
+def load_roster(path: str) -> Roster:
+    """读取花名册：CSV需要表头（name/姓名，可选aliases/别名列），
+    JSON为姓名列表或{"name": ..., "aliases": [...]}对象列表"""
+    if path.lower().endswith(".json"):
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        if not isinstance(data, list):
+            raise ValueError(f"JSON花名册应为列表: {path}")
+        entries = []
+        for index, item in enumerate(data):
+            if isinstance(item, str):
+                entries.append((item, []))
+            elif isinstance(item, dict):
+                entries.append((str(item.get("name", "")), _split_aliases(item.get("aliases"))))
+            else:
+                raise ValueError(f"花名册第{index + 1}项应为姓名或对象: {item!r}")
+        return Roster(entries)
+
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        reader = csv.DictReader(f)
+        fields = reader.fieldnames or []
+        name_column = next((c for c in _NAME_COLUMNS if c in fields), None)
+        if name_column is None:
+            raise ValueError(f"花名册缺少姓名列（{'/'.join(_NAME_COLUMNS)}）: {path}")
+        alias_column = next((c for c in _ALIAS_COLUMNS if c in fields), None)
+        return Roster([(row[name_column] or "", _split_aliases(row.get(alias_column) if alias_column else None))
+                       for row in reader])
+
+
+_shared_roster: Optional[Roster] = None
+_shared_lock = threading.Lock()
+
+
+def get_roster() -> Roster:
+    """获取进程内共享的花名册（ROSTER_PATH未设置或读取失败时只含非人名关键词）"""
+    global _shared_roster
+    if _shared_roster is None:
+        with _shared_lock:
+            if _shared_roster is None:
+                path = os.environ.get("ROSTER_PATH")
+                roster = None
+                if path:
+                    try:
+                        roster = load_roster(path)
+                        logger.info("已加载花名册%s，共%d人", path, len(roster))
+                    except (OSError, ValueError) as e:
+                        logger.warning("花名册加载失败，不使用花名册: %s", e)
+                _shared_roster = roster or Roster()
+    return _shared_roster
+
+
+def reset_roster():
+    """丢弃共享的花名册，下次使用时重新读取"""
+    global _shared_roster
+    with _shared_lock:
+        _shared_roster = None
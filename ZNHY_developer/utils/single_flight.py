@@ -0,0 +1,66 @@
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+class _Call:
+    """一次正在执行的调用"""
+
+    def __init__(self):
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.done = threading.Event()
+
+
+class SingleFlight:
+    """合并相同键的并发调用
+
+    同一个键同时只执行一次fn，期间到达的其他调用方等待并共享它的返回值或异常。
+    调用结束后立即移除，之后的调用重新执行（结果的复用交给缓存）。
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """执行或等待fn，返回(结果, 是否共享了其他调用方的结果)"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
+
+    def in_flight(self) -> int:
+        """正在执行的调用数"""
+        with self._lock:
+            return len(self._calls)
+
+
+_shared_flight: Optional[SingleFlight] = None
+_shared_lock = threading.Lock()
+
+
+def get_single_flight() -> SingleFlight:
+    """获取进程内共享的SingleFlight（首次调用时创建）"""
+    global _shared_flight
+    if _shared_flight is None:
+        with _shared_lock:
+            if _shared_flight is None:
+                _shared_flight = SingleFlight()
+    return _shared_flight
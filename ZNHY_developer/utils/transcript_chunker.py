@@ -0,0 +1,128 @@
+import json
+import re
+from typing import Any, Dict, List
+
+# 句末标点（保留在句子末尾）
+_SENTENCE_END_RE = re.compile(r'(?<=[。！？；!?;])')
+
+
+def _split_long_line(line: str, max_chars: int) -> List[str]:
+    """超长的一行先按句子拆分，单句仍然超长时按长度硬切"""
+    pieces = []
+    for sentence in _SENTENCE_END_RE.split(line):
+        while len(sentence) > max_chars:
+            pieces.append(sentence[:max_chars])
+            sentence = sentence[max_chars:]
+        if sentence:
+            pieces.append(sentence)
+    return pieces
+
+
+def split_transcript(text: str, max_chars: int) -> List[str]:
+    """把会议记录切成不超过max_chars的片段
+
+    优先在换行处切分（通常是发言人或字段的边界），单行过长时再按句子切分；
+    相邻的小段会合并到同一个片段中，尽量减少大模型调用次数。
+    """
+    if max_chars <= 0 or len(text) <= max_chars:
+        return [text]
+
+    units = []
+    for line in text.splitlines(keepends=True):
+        if len(line) <= max_chars:
+            units.append(line)
+        else:
+            units.extend(_split_long_line(line, max_chars))
+
+    chunks = []
+    current = ""
+    for unit in units:
+        if current and len(current) + len(unit) > max_chars:
+            chunks.append(current)
+            current = ""
+        current += unit
+    if current:
+        chunks.append(current)
+    # 只含空白的片段没有信息，不必调用大模型
+    return [chunk for chunk in chunks if chunk.strip()] or [text]
+
+
+# 各片段结果中取第一个非空值的字段
+_FIRST_VALUE_FIELDS = ("meeting_topic", "meeting_time", "meeting_location", "host", "meeting_duration")
+# 单独合并或重新计算的字段
+_MERGED_FIELDS = ("participants", "participant_count", "topics", "pre_meeting_preparations")
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def _is_empty(value: Any) -> bool:
+    if isinstance(value, str):
+        return not value.strip()
+    return value is None or value == [] or value == {}
+
+
+def _participant_key(participant: Any) -> str:
+    """参会人员去重用的键：对象取姓名字段，字符串去掉首尾空白"""
+    if isinstance(participant, dict):
+        name = participant.get("participant_name") or participant.get("name") or participant.get("person")
+        participant = name if name else json.dumps(participant, sort_keys=True, ensure_ascii=False)
+    return str(participant).strip()
+
+
+def _topic_key(topic: Any) -> str:
+    """议题去重用的键：标题去掉所有空白"""
+    title = topic.get("title", "") if isinstance(topic, dict) else topic
+    return _WHITESPACE_RE.sub("", str(title))
+
+
+def merge_partial_results(partials: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """合并各片段的解析结果
+
+    主题、时间、地点、主持人、时长按片段顺序取第一个非空值；
+    参会人员和议题去重后按首次出现的顺序合并，同名议题用后面片段补全缺少的字段；
+    会前准备事项去重后拼接。
+    """
+    merged: Dict[str, Any] = {}
+    for field in _FIRST_VALUE_FIELDS:
+        for partial in partials:
+            if not _is_empty(partial.get(field)):
+                merged[field] = partial[field]
+                break
+
+    participants = {}
+    topics = {}
+    preparations = []
+    for partial in partials:
+        items = partial.get("participants") or []
+        for participant in (items if isinstance(items, list) else [items]):
+            key = _participant_key(participant)
+            if key and key not in participants:
+                participants[key] = participant
+
+        items = partial.get("topics") or []
+        for topic in (items if isinstance(items, list) else [items]):
+            key = _topic_key(topic)
+            if not key:
+                continue
+            if key not in topics:
+                topics[key] = dict(topic) if isinstance(topic, dict) else topic
+            elif isinstance(topics[key], dict) and isinstance(topic, dict):
+                for name, value in topic.items():
+                    if _is_empty(topics[key].get(name)) and not _is_empty(value):
+                        topics[key][name] = value
+
+        preparation = partial.get("pre_meeting_preparations")
+        if isinstance(preparation, str) and preparation.strip() and preparation.strip() not in preparations:
+            preparations.append(preparation.strip())
+
+        # 其余字段保留第一次出现的值
+        for name, value in partial.items():
+            if name not in merged and name not in _MERGED_FIELDS and not _is_empty(value):
+                merged[name] = value
+
+    if participants:
+        merged["participants"] = list(participants.values())
+    if topics:
+        merged["topics"] = list(topics.values())
+    if preparations:
+        merged["pre_meeting_preparations"] = "；".join(preparations)
+    return merged
@@ -0,0 +1,115 @@
+import codecs
+import os
+import zipfile
+from typing import BinaryIO, Iterator, Optional
+from xml.etree import ElementTree
+
+# 每次从上传文件中读取的字节数
+CHUNK_SIZE = 64 * 1024
+# 文本文件依次尝试的编码：UTF-8（可带BOM），以及Windows中文环境下常见的GBK/GB18030
+TEXT_ENCODINGS = ("utf-8-sig", "gb18030")
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_W_BODY, _W_P, _W_T, _W_TAB, _W_BR, _W_CR = (_W + tag for tag in ("body", "p", "t", "tab", "br", "cr"))
+
+
+class UploadError(ValueError):
+    """上传的文件无法读取为会议内容"""
+
+
+class UploadTooLargeError(UploadError):
+    """上传的文件解压或读取出的内容超过上限"""
+
+
+def read_text(stream: BinaryIO, chunk_size: int = CHUNK_SIZE, max_chars: Optional[int] = None) -> str:
+    """分块读取文本文件并增量解码，不先把整个文件读成字节串；超过max_chars个字时抛出UploadTooLargeError"""
+    for encoding in TEXT_ENCODINGS:
+        decoder = codecs.getincrementaldecoder(encoding)()
+        parts = []
+        total = 0
+        try:
+            while True:
+                chunk = stream.read(chunk_size)
+                if not chunk:
+                    break
+                parts.append(decoder.decode(chunk))
+                total += len(parts[-1])
+                if max_chars is not None and total > max_chars:
+                    raise UploadTooLargeError(f"文本文件超过{max_chars}字的上限")
+            parts.append(decoder.decode(b"", final=True))
+            return "".join(parts)
+        except UnicodeDecodeError:
+            # 换下一种编码从头再读
+            stream.seek(0)
+    raise UploadError("无法识别文本文件的编码，请使用UTF-8或GBK")
+
+
+def _open_document(archive: zipfile.ZipFile, max_xml_bytes: Optional[int]) -> BinaryIO:
+    info = archive.getinfo("word/document.xml")
+    if max_xml_bytes is not None and info.file_size > max_xml_bytes:
+        raise UploadTooLargeError(f"docx文件解压后超过{max_xml_bytes / 1048576:g}MB的上限")
+    return archive.open(info)
+
+
+def iter_docx_paragraphs(stream: BinaryIO, max_xml_bytes: Optional[int] = None) -> Iterator[str]:
+    """逐段产生docx正文（包括表格中）的文字
+
+    直接流式解析ZIP中的word/document.xml，读完一段就丢弃对应的XML元素，
+    不像python-docx那样把整个文档树加载到内存中。stream需要支持seek。
+    上传大小只限制压缩后的字节数，document.xml解压后超过max_xml_bytes时抛出UploadTooLargeError；
+    zipfile最多解压出ZIP目录中记录的大小，实际内容与记录不符时按文件损坏处理。
+    """
+    try:
+        with zipfile.ZipFile(stream) as archive, _open_document(archive, max_xml_bytes) as xml:
+            body = None
+            depth = 0
+            runs = []
+            for event, element in ElementTree.iterparse(xml, events=("start", "end")):
+                if event == "start":
+                    depth += 1
+                    if element.tag == _W_BODY:
+                        body = element
+                    continue
+                depth -= 1
+                tag = element.tag
+                if tag == _W_T:
+                    runs.append(element.text or "")
+                elif tag == _W_TAB:
+                    runs.append("\t")
+                elif tag in (_W_BR, _W_CR):
+                    runs.append("\n")
+                elif tag == _W_P:
+                    yield "".join(runs)
+                    runs = []
+                    element.clear()
+                # 正文下的一段或一个表格读完后，从正文元素中移除已经处理过的子元素
+                if depth == 2 and body is not None:
+                    body.clear()
+    except (zipfile.BadZipFile, KeyError, ElementTree.ParseError) as e:
+        raise UploadError("无法读取docx文件") from e
+
+
+def _join_limited(paragraphs: Iterator[str], max_chars: Optional[int]) -> str:
+    """按行拼接段落，超过max_chars个字时立即停止读取并抛出UploadTooLargeError"""
+    parts = []
+    total = -1
+    for paragraph in paragraphs:
+        total += len(paragraph) + 1
+        if max_chars is not None and total > max_chars:
+            raise UploadTooLargeError(f"docx文件的文字超过{max_chars}字的上限")
+        parts.append(paragraph)
+    return "\n".join(parts)
+
+
+def read_upload(stream: BinaryIO, filename: Optional[str], max_chars: Optional[int] = None,
+                max_xml_bytes: Optional[int] = None) -> str:
+    """按扩展名读取上传的.txt或.docx会议记录，返回会议内容
+
+    会议内容超过max_chars个字、docx的document.xml解压后超过max_xml_bytes时抛出UploadTooLargeError。
+    """
+    extension = os.path.splitext(filename or "")[1].lower()
+    if extension == ".txt":
+        return read_text(stream, max_chars=max_chars)
+    if extension == ".docx":
+        return _join_limited(iter_docx_paragraphs(stream, max_xml_bytes), max_chars)
+    raise UploadError("只支持上传.txt或.docx文件")
@@ -0,0 +1,52 @@
+import io
+import zipfile
+from typing import IO
+
+
+class _StreamSink(io.RawIOBase):
+    """只追加、不可回退的输出缓冲，zipfile写入的数据暂存在这里等待取走"""
+
+    def __init__(self):
+        self._chunks = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b) -> int:
+        self._chunks.append(bytes(b))
+        return len(b)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+class ZipStream:
+    """边写边输出的ZIP归档
+
+    底层流不可回退，zipfile会改用数据描述符记录大小和CRC，
+    因此每写完一个条目就可以把对应字节交给HTTP响应，无需在内存中保留整个归档。
+    """
+
+    def __init__(self, compression: int = zipfile.ZIP_DEFLATED):
+        self._sink = _StreamSink()
+        self._zip = zipfile.ZipFile(self._sink, mode="w", compression=compression)
+
+    def add(self, name: str, data: bytes) -> bytes:
+        """写入一个完整条目，返回新产生的归档字节"""
+        self._zip.writestr(name, data)
+        return self._sink.drain()
+
+    def open(self, name: str) -> IO[bytes]:
+        """打开一个条目用于增量写入，配合drain()分段取出数据"""
+        return self._zip.open(name, mode="w", force_zip64=True)
+
+    def drain(self) -> bytes:
+        """取出目前已经产生的归档字节"""
+        return self._sink.drain()
+
+    def close(self) -> bytes:
+        """写入中央目录并返回剩余字节"""
+        self._zip.close()
+        return self._sink.drain()
@@ -0,0 +1,13 @@
+"""
+生产环境WSGI入口
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+gunicorn.conf.py开启preload_app：主进程导入本模块、完成预热后再fork工作进程，
+各工作进程共享已导入的模块和文档骨架，启动后即可处理请求。
+"""
+
+from app import create_app
+from config import ProductionConfig
+
+app = create_app(ProductionConfig())